@@ -114,13 +114,10 @@ async def get_actors_graph() -> Dict[str, Any]:
             links.append(link)
         
         # Get cross-layer mentions (news ↔ actors)
-        mentions = []
-        for source, target, data in graph_manager.mentions_graph.edges(data=True):
-            mention = {
-                "news_id": data.get("news_id"),
-                "actor_id": data.get("actor_id")
-            }
-            mentions.append(mention)
+        mentions = [
+            {"news_id": news_id, "actor_id": actor_id}
+            for news_id, actor_id in graph_manager.iter_mentions()
+        ]
         
         return {
             "nodes": nodes,
@@ -88,13 +88,7 @@ def load_data():
                 is_pinned=news.is_pinned,
                 domains=news.domains
             )
-            for actor_id in news.mentioned_actors:
-                graph_manager.mentions_graph.add_edge(
-                    f"news_{news.id}",
-                    f"actor_{actor_id}",
-                    news_id=news.id,
-                    actor_id=actor_id
-                )
+            graph_manager.index_mentions(news.id, news.mentioned_actors)
         
         for actor in all_actors:
             graph_manager.actors_graph.add_node(
@@ -115,6 +109,7 @@ def load_data():
                         weight=row[3],
                         is_editorial=row[4]
                     )
+        graph_manager.rebuild_component_index()
         
         print(f"Loaded {len(all_news)} news, {len(all_actors)} actors, {len(all_stories)} stories from database")
         return
@@ -126,48 +121,51 @@ def load_data():
     if os.path.exists(f"{data_dir}/actors.json"):
         with open(f"{data_dir}/actors.json", 'r') as f:
             actors_data = json.load(f)
-            for item in actors_data:
-                actor = Actor(**item)
-                graph_manager.add_actor(actor)
+            with db_manager.transaction():
+                for item in actors_data:
+                    actor = Actor(**item)
+                    graph_manager.add_actor(actor)
             print(f"Loaded {len(actors_data)} actors")
 
     # Load news
     if os.path.exists(f"{data_dir}/news.json"):
         with open(f"{data_dir}/news.json", 'r') as f:
             news_data = json.load(f)
-            for item in news_data:
-                # Convert date string back to datetime
-                if 'published_at' in item and item['published_at']:
-                    item['published_at'] = datetime.fromisoformat(item['published_at'])
-                news = News(**item)
-                # Generate embedding if missing
-                if not news.embedding:
-                    # encode returns numpy array (n, dim), take first item and convert to list
-                    news.embedding = embedding_service.encode(news.full_text or news.summary)[0].tolist()
-                graph_manager.add_news(news)
+            with db_manager.transaction():
+                for item in news_data:
+                    # Convert date string back to datetime
+                    if 'published_at' in item and item['published_at']:
+                        item['published_at'] = datetime.fromisoformat(item['published_at'])
+                    news = News(**item)
+                    # Generate embedding if missing
+                    if not news.embedding:
+                        # encode returns numpy array (n, dim), take first item and convert to list
+                        news.embedding = embedding_service.encode(news.full_text or news.summary)[0].tolist()
+                    graph_manager.add_news(news)
             print(f"Loaded {len(news_data)} news items")
 
     # Load stories
     if os.path.exists(f"{data_dir}/stories.json"):
         with open(f"{data_dir}/stories.json", 'r') as f:
             stories_data = json.load(f)
-            for item in stories_data:
-                # Convert dates
-                if 'first_seen' in item and item['first_seen']:
-                    item['first_seen'] = datetime.fromisoformat(item['first_seen'])
-                if 'last_activity' in item and item['last_activity']:
-                    item['last_activity'] = datetime.fromisoformat(item['last_activity'])
-                # Mock/stub fill for missing generated fields
-                if not item.get('summary'):
-                    item['summary'] = f"Auto summary for {item.get('title', 'Story')}"
-                if not item.get('bullets'):
-                    item['bullets'] = [f"Key point for {item.get('title', 'story')}"]
-                if not item.get('domains'):
-                    item['domains'] = []
-                if not item.get('top_actors'):
-                    item['top_actors'] = []
-                story = Story(**item)
-                graph_manager.add_story(story)
+            with db_manager.transaction():
+                for item in stories_data:
+                    # Convert dates
+                    if 'first_seen' in item and item['first_seen']:
+                        item['first_seen'] = datetime.fromisoformat(item['first_seen'])
+                    if 'last_activity' in item and item['last_activity']:
+                        item['last_activity'] = datetime.fromisoformat(item['last_activity'])
+                    # Mock/stub fill for missing generated fields
+                    if not item.get('summary'):
+                        item['summary'] = f"Auto summary for {item.get('title', 'Story')}"
+                    if not item.get('bullets'):
+                        item['bullets'] = [f"Key point for {item.get('title', 'story')}"]
+                    if not item.get('domains'):
+                        item['domains'] = []
+                    if not item.get('top_actors'):
+                        item['top_actors'] = []
+                    story = Story(**item)
+                    graph_manager.add_story(story)
             print(f"Loaded {len(stories_data)} stories")
             
     # Compute similarities
@@ -300,7 +298,7 @@ async def llm_services():
             }
             for s in services
         ],
-        "profiles": [p.__dict__ for p in profiles],
+        "profiles": [p.to_dict() for p in profiles],
     }
 
 
@@ -375,7 +373,10 @@ async def llm_service_invoke(service_id: str, req: LLMInvokeRequest):
         profile_id = req.profile_id or service_cfg.default_profile_id
         llm = llm_registry.build_llm(profile_id, use_mock=True)
         service = llm_registry.instantiate_service(service_id)
-        result = service.run(llm, req.payload)
+        if hasattr(service, "run_async"):
+            result = await service.run_async(llm, req.payload)
+        else:
+            result = service.run(llm, req.payload)
         return {"service_id": service_id, "profile_id": profile_id, "result": result}
     except HTTPException:
         raise
@@ -504,18 +505,19 @@ async def refresh_news_actors(news_id: str, payload: LLMActorsRequest):
 
     # Update graph: add/merge actors and mentions
     updated_ids = []
+    confidences = []
     for actor_data in actors:
         name = actor_data.get("name")
         if not name:
             continue
         actor_id = graph_manager.ensure_actor(name=name, actor_type=actor_data.get("type"), confidence=actor_data.get("confidence"))
-        graph_manager.add_mention(news_id=news.id, actor_id=actor_id, confidence=actor_data.get("confidence", 0.5))
         updated_ids.append(actor_id)
+        confidences.append(actor_data.get("confidence", 0.5))
+    graph_manager.add_mentions_bulk(news_id=news.id, actor_ids=updated_ids, confidences=confidences)
 
     # Keep only actor_* ids, replace old entries
     unique_ids = list({aid for aid in updated_ids if isinstance(aid, str) and aid.startswith("actor_")})
     news.mentioned_actors = unique_ids
-    graph_manager.news[news.id].mentioned_actors = unique_ids
     # update story top actors
     if news.story_id:
         graph_manager.update_story_top_actors(news.story_id)
@@ -880,15 +882,10 @@ async def get_actors_graph():
     ]
 
     # Get mentions (news <-> actor)
-    mentions = []
-    for u, v, data in graph_manager.mentions_graph.edges(data=True):
-        # Mentions graph uses prefixed IDs e.g. "news_123", "actor_456"
-        # We need to extract the raw IDs stored in edge data
-        if 'news_id' in data and 'actor_id' in data:
-            mentions.append({
-                "news_id": data['news_id'],
-                "actor_id": data['actor_id']
-            })
+    mentions = [
+        {"news_id": news_id, "actor_id": actor_id}
+        for news_id, actor_id in graph_manager.iter_mentions()
+    ]
 
     return {"nodes": nodes, "edges": edges, "mentions": mentions}
 
@@ -0,0 +1,4 @@
+-- Migration 002: Case-insensitive actor name lookup
+-- Serves DatabaseManager.find_actor_by_name_ci (lower(canonical_name) = lower(%s))
+
+CREATE INDEX IF NOT EXISTS actors_cname_lower ON actors(lower(canonical_name));
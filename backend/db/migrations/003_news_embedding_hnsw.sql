@@ -0,0 +1,22 @@
+-- Migration 003: HNSW inner-product index for k-NN news similarity
+-- Requires pgvector >= 0.7 (halfvec, l2_normalize); docker-compose pins 0.7.4.
+-- Stored embeddings are left as they are: vectors are normalized only inside
+-- the index expression, so -(a <#> b) over it equals cosine similarity.
+-- halfvec(384) must match news.embedding vector(384) and
+-- DatabaseManager.EMBEDDING_DIM; both checks below fail early otherwise.
+
+DO $$
+BEGIN
+    IF (SELECT string_to_array(extversion, '.')::int[] FROM pg_extension
+        WHERE extname = 'vector') < ARRAY[0, 7] THEN
+        RAISE EXCEPTION 'Migration 003 requires pgvector >= 0.7';
+    END IF;
+    IF (SELECT atttypmod FROM pg_attribute
+        WHERE attrelid = 'news'::regclass AND attname = 'embedding') <> 384 THEN
+        RAISE EXCEPTION 'Migration 003 expects news.embedding to be vector(384)';
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS news_embedding_hnsw ON news
+    USING hnsw ((l2_normalize(embedding)::halfvec(384)) halfvec_ip_ops)
+    WITH (m = 16, ef_construction = 64);
@@ -182,6 +182,13 @@ CREATE INDEX news_embedding_idx ON news
     USING ivfflat (embedding vector_cosine_ops)
     WITH (lists = 100);
 
+-- HNSW inner-product index for k-NN news similarity (pgvector >= 0.7). The
+-- expression L2-normalizes, so -(a <#> b) over it is cosine similarity while
+-- stored embeddings stay untouched; halfvec halves the index size
+CREATE INDEX news_embedding_hnsw ON news
+    USING hnsw ((l2_normalize(embedding)::halfvec(384)) halfvec_ip_ops)
+    WITH (m = 16, ef_construction = 64);
+
 -- News indexes
 CREATE INDEX news_story_id_idx ON news(story_id);
 CREATE INDEX news_published_at_idx ON news(published_at);
@@ -189,6 +196,7 @@ CREATE INDEX news_source_idx ON news(source);
 
 -- Actor indexes
 CREATE INDEX actors_canonical_name_idx ON actors(canonical_name);
+CREATE INDEX actors_cname_lower ON actors(lower(canonical_name));
 CREATE INDEX actors_wikidata_qid_idx ON actors(wikidata_qid);
 CREATE INDEX actors_actor_type_idx ON actors(actor_type);
 
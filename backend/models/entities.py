@@ -2,9 +2,9 @@
 Data models for SDASystem_v3
 """
 from datetime import datetime
-from typing import List, Dict, Optional, Literal
+from typing import List, Dict, Optional, Literal, Set, Tuple
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class ActorType(str, Enum):
@@ -82,9 +82,38 @@ class Actor(BaseModel):
     # - description: Optional[str] - описание из Wikidata
     # - original_language: str - язык оригинального имени
 
+    # Lowercased/stripped names for gazetteer lookups (not serialized);
+    # None until first use and after canonical_name/aliases are assigned
+    _normalized_names: Optional[Tuple[str, List[str]]] = PrivateAttr(default=None)
+
     class Config:
         use_enum_values = True
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in ("canonical_name", "aliases"):
+            self._normalized_names = None
+
+    @property
+    def normalized_names(self) -> Tuple[str, List[str]]:
+        """
+        (canonical name, alias names) lowercased and stripped, one entry per alias.
+        Computed on first use and dropped when canonical_name or aliases is
+        assigned; add aliases through add_alias to keep it current.
+        """
+        if self._normalized_names is None:
+            self._normalized_names = (
+                self.canonical_name.lower().strip(),
+                [alias_entry.get("name", "").lower().strip() for alias_entry in self.aliases],
+            )
+        return self._normalized_names
+
+    def add_alias(self, alias_entry: Dict[str, str]) -> None:
+        """Append an alias entry ({"name": ..., "type": ...}) and its normalized name"""
+        self.aliases.append(alias_entry)
+        if self._normalized_names is not None:
+            self._normalized_names[1].append(alias_entry.get("name", "").lower().strip())
+
 
 class ActorRelation(BaseModel):
     """Relationship between two actors"""
@@ -133,9 +162,43 @@ class News(BaseModel):
     is_pinned: bool = Field(default=False, description="Pinned as story core")
     editorial_notes: str = Field(default="")
 
+    # Set mirror of mentioned_actors for O(1) membership (not serialized);
+    # None until first use and after mentioned_actors is assigned
+    _mentioned_actors_set: Optional[Set[str]] = PrivateAttr(default=None)
+    # len(mentioned_actors) the set was built for
+    _mentioned_actors_len: int = PrivateAttr(default=0)
+
     class Config:
         use_enum_values = True
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name == "mentioned_actors":
+            self._mentioned_actors_set = None
+
+    @property
+    def mentioned_actors_set(self) -> Set[str]:
+        """
+        Set view of mentioned_actors, rebuilt when the list is assigned.
+        Direct appends/removals are caught by a length check; replacing an
+        item in place is not, so assign a new list or use add_mentioned_actor.
+        """
+        if (self._mentioned_actors_set is None
+                or self._mentioned_actors_len != len(self.mentioned_actors)):
+            self._mentioned_actors_set = set(self.mentioned_actors)
+            self._mentioned_actors_len = len(self.mentioned_actors)
+        return self._mentioned_actors_set
+
+    def add_mentioned_actor(self, actor_id: str) -> bool:
+        """Append actor_id to mentioned_actors if missing; returns True if added"""
+        mentioned = self.mentioned_actors_set
+        if actor_id in mentioned:
+            return False
+        mentioned.add(actor_id)
+        self.mentioned_actors.append(actor_id)
+        self._mentioned_actors_len += 1
+        return True
+
 
 class NewsRelation(BaseModel):
     """Relationship between news items"""
@@ -8,9 +8,13 @@
 from typing import List, Dict, Optional
 import logging
 import os
-import re
 
-from backend.services.ner_spacy_service import detect_language, get_model_for_language, check_model_available
+from backend.services.ner_spacy_service import (
+    check_model_available,
+    detect_language,
+    get_model_for_language,
+    has_cyrillic,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -231,7 +235,7 @@ class ActorCanonicalizationService:
             # латиница/цифры/пробел/пунктуация, без кириллицы
             if not s:
                 return False
-            return not bool(re.search(r"[\u0400-\u04FF]", s))
+            return not has_cyrillic(s)
 
         def _wikidata_search_with_fallback(name: str, primary_lang: str) -> Optional[Dict]:
             """
@@ -12,7 +12,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from backend.models.entities import Actor, ActorType, News
-from backend.services.ner_spacy_service import detect_language
+from backend.services.ner_spacy_service import detect_language, has_cyrillic
 from backend.services.google_ner_service import GoogleNERService
 from backend.services.graph_manager import GraphManager
 from backend.services.llm_service import LLMService
@@ -114,6 +114,10 @@ class ActorsExtractionService:
             shutil.copy2(self.actors_file, self.backup_file)
 
     def _clear_llm_cache(self) -> None:
+        cache_clear = getattr(self.llm_service, "cache_clear", None)
+        if callable(cache_clear):
+            cache_clear()
+            return
         cache_dir = getattr(self.llm_service, "cache_dir", None)
         if cache_dir and Path(cache_dir).exists():
             for path in Path(cache_dir).glob("*.json"):
@@ -124,19 +128,10 @@ class ActorsExtractionService:
 
     def _reset_news_mentions(self, news_id: str) -> None:
         """Удалить существующие связи news<->actors для новости."""
-        news_node = f"news_{news_id}"
-        if news_node in self.graph_manager.mentions_graph:
-            neighbors = list(self.graph_manager.mentions_graph.neighbors(news_node))
-            for nb in neighbors:
-                if self.graph_manager.mentions_graph.has_edge(news_node, nb):
-                    self.graph_manager.mentions_graph.remove_edge(news_node, nb)
+        self.graph_manager.unindex_news_mentions(news_id)
 
     def _add_mentions_edges(self, news_id: str, actor_ids: List[str]) -> None:
-        news_node = f"news_{news_id}"
-        for actor_id in actor_ids:
-            self.graph_manager.mentions_graph.add_edge(
-                news_node, f"actor_{actor_id}", news_id=news_id, actor_id=actor_id
-            )
+        self.graph_manager.index_mentions(news_id, actor_ids)
 
     def _news_text(self, news: News) -> str:
         return f"{news.title}\n{news.summary or ''}\n{news.full_text or ''}"
@@ -152,10 +147,7 @@ class ActorsExtractionService:
         return n
 
     def _has_cyrillic(self, s: str) -> bool:
-        if not s:
-            return False
-        import re
-        return bool(re.search(r"[\u0400-\u04FF]", s))
+        return has_cyrillic(s)
 
     def _pick_best_latin_alias(self, actor: Actor) -> Optional[str]:
         """
@@ -305,14 +297,14 @@ class ActorsExtractionService:
         for alias_entry in new_aliases:
             alias_name = alias_entry.get("name", "")
             if alias_name and alias_name.lower() not in existing_aliases:
-                actor.aliases.append(alias_entry)
+                actor.add_alias(alias_entry)
                 existing_aliases.add(alias_name.lower())
     
     def _add_alias_if_not_exists(self, actor: Actor, alias_name: str, alias_type: str = "alias"):
         """Добавить алиас если его еще нет"""
         existing_aliases = {a.get("name", "").lower() for a in actor.aliases}
         if alias_name.lower() not in existing_aliases:
-            actor.aliases.append({
+            actor.add_alias({
                 "name": alias_name,
                 "type": alias_type
             })
@@ -482,8 +474,7 @@ class ActorsExtractionService:
         # Акторы остаются в БД, но ссылки обновляются
         for actor_id in to_delete:
             # Удаляем из кэша и графа
-            if actor_id in self.graph_manager._actors_cache:
-                del self.graph_manager._actors_cache[actor_id]
+            self.graph_manager.evict_actor(actor_id)
             if actor_id in self.graph_manager.actors_graph:
                 self.graph_manager.actors_graph.remove_node(actor_id)
 
@@ -513,14 +504,13 @@ class ActorsExtractionService:
                 # Сохраняем обновленную новость в БД
                 self.graph_manager.add_news(news)
 
-        # Перестроить mentions_graph (чистый способ)
-        self.graph_manager.mentions_graph.clear()
+        # Перестроить индекс упоминаний (чистый способ)
+        self.graph_manager.clear_mentions()
+        actors = self.graph_manager.actors
         for news in self.graph_manager.news.values():
-            for aid in news.mentioned_actors:
-                if aid in self.graph_manager.actors:
-                    self.graph_manager.mentions_graph.add_edge(
-                        f"news_{news.id}", f"actor_{aid}", news_id=news.id, actor_id=aid
-                    )
+            self.graph_manager.index_mentions(
+                news.id, [aid for aid in news.mentioned_actors if aid in actors]
+            )
 
         # Обновить top_actors в историях
         for story in self.graph_manager.stories.values():
@@ -549,7 +539,7 @@ class ActorsExtractionService:
         self._backup_actors_file()
         self.graph_manager.actors.clear()
         self.graph_manager.actors_graph.clear()
-        self.graph_manager.mentions_graph.clear()
+        self.graph_manager.clear_mentions()
 
         if self.actors_file.exists():
             try:
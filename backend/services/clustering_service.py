@@ -4,7 +4,6 @@ Story clustering service using graph-based and HDBSCAN approaches
 import uuid
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-import numpy as np
 from sklearn.cluster import DBSCAN
 import networkx as nx
 
@@ -72,7 +71,7 @@ class ClusteringService:
             return []
 
         # Create embedding matrix
-        embeddings = np.array([n.embedding for n in news_items])
+        embeddings = self.graph.get_embedding_matrix(news_items)
 
         # DBSCAN clustering
         clustering = DBSCAN(eps=eps, min_samples=min_size, metric='cosine')
@@ -275,8 +274,7 @@ class ClusteringService:
 
         # Remove old stories (stories are managed by database, just remove from cache)
         for sid in story_ids:
-            if sid in self.graph._stories_cache:
-                del self.graph._stories_cache[sid]
+            self.graph.evict_story(sid)
             # Note: Stories are not deleted from DB, they should be marked as inactive
             # or deleted through proper API endpoints
 
@@ -298,8 +296,7 @@ class ClusteringService:
                 self.graph.add_story(story)
 
         # Remove original story from cache (DB deletion should be handled separately)
-        if story_id in self.graph._stories_cache:
-            del self.graph._stories_cache[story_id]
+        self.graph.evict_story(story_id)
 
         return new_stories
 
@@ -310,4 +307,5 @@ class ClusteringService:
             self._calculate_story_metrics(story)
             # Save updated story to database
             self.graph.db.save_story(story)
+            self.graph.invalidate_snapshots()
             self.graph._stories_cache[story_id] = story
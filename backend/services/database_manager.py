@@ -3,11 +3,16 @@ Database manager for PostgreSQL + pgvector
 Handles all database operations for SDASystem v3
 """
 import os
+import io
+import csv
 import json
+import struct
+import threading
+import weakref
 from typing import List, Dict, Optional, Tuple, Any
 from datetime import datetime
 import psycopg2
-from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.extras import RealDictCursor, execute_values, register_default_jsonb
 from psycopg2.extensions import register_adapter, AsIs
 from psycopg2.pool import SimpleConnectionPool
 from contextlib import contextmanager
@@ -16,6 +21,42 @@ import numpy as np
 from backend.models.entities import (
     News, Actor, Story, Event, ActorRelation, NewsRelation, Domain
 )
+from backend.utils.similarity import similar_pairs
+
+# Must match news.embedding vector(N) and the halfvec HNSW index in schema.sql
+EMBEDDING_DIM = 384
+
+# Hot single-row statements, PREPAREd once per pooled connection and then
+# run with EXECUTE so Postgres skips parse/plan on every call
+PREPARED_STATEMENTS: Dict[str, Tuple[int, str]] = {
+    "upsert_actor_relation": (11, """
+        INSERT INTO actor_relations (id, source_actor_id, target_actor_id, relation_type,
+                                     weight, confidence, is_ephemeral, ttl_days, expires_at,
+                                     source, created_at)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+        ON CONFLICT (source_actor_id, target_actor_id, relation_type) DO UPDATE SET
+            weight = EXCLUDED.weight,
+            confidence = EXCLUDED.confidence
+    """),
+    "update_editorial_relation": (3, """
+        UPDATE news_relations
+        SET weight = $1, is_editorial = TRUE
+        WHERE source_news_id = $2 AND target_news_id = $3
+    """),
+    "upsert_news_relation": (6, """
+        INSERT INTO news_relations (source_news_id, target_news_id, similarity, weight, is_editorial, created_at)
+        VALUES ($1, $2, $3, $4, $5, $6)
+        ON CONFLICT (source_news_id, target_news_id) DO UPDATE SET
+            weight = EXCLUDED.weight,
+            is_editorial = EXCLUDED.is_editorial
+    """),
+}
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 class DatabaseManager:
@@ -47,6 +88,12 @@ class DatabaseManager:
         self.host = host or os.getenv("POSTGRES_HOST", "localhost")
         self.port = port or int(os.getenv("POSTGRES_PORT", "5432"))
         
+        # Connection held by an open transaction() in the current thread
+        self._local = threading.local()
+        
+        # Names of statements already PREPAREd on each pooled connection
+        self._prepared = weakref.WeakKeyDictionary()
+        
         # Connection pool
         self.pool: Optional[SimpleConnectionPool] = None
         self._init_pool(min_conn, max_conn)
@@ -69,16 +116,60 @@ class DatabaseManager:
     @contextmanager
     def get_connection(self):
         """Get connection from pool (context manager)"""
+        active = getattr(self._local, 'conn', None)
+        if active is not None:
+            # Inside transaction(): reuse its connection, commit happens there
+            yield active
+            return
         conn = self.pool.getconn()
         try:
             yield conn
             conn.commit()
         except Exception as e:
             conn.rollback()
+            self._forget_prepared(conn)
             raise
         finally:
             self.pool.putconn(conn)
     
+    def _execute_prepared(self, cur, name: str, params: Tuple) -> None:
+        """Run one of PREPARED_STATEMENTS, preparing it on this connection first if needed"""
+        num_params, sql = PREPARED_STATEMENTS[name]
+        prepared = self._prepared.setdefault(cur.connection, set())
+        if name not in prepared:
+            cur.execute(f"PREPARE {name} AS {sql}")
+            prepared.add(name)
+        cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * num_params)})", params)
+    
+    def _forget_prepared(self, conn) -> None:
+        """Drop prepared statements after a rollback (one may have been prepared in it)"""
+        if self._prepared.pop(conn, None):
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("DEALLOCATE ALL")
+                conn.commit()
+            except Exception:
+                pass
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Run several operations on one pooled connection and commit once
+        
+        Every DatabaseManager call made in this thread inside the block
+        (directly or through GraphManager) joins the transaction; any
+        exception rolls all of it back. Nested blocks join the outer one.
+        """
+        if getattr(self._local, 'conn', None) is not None:
+            yield self._local.conn
+            return
+        with self.get_connection() as conn:
+            self._local.conn = conn
+            try:
+                yield conn
+            finally:
+                self._local.conn = None
+    
     # --- News operations ---
     
     def save_news(self, news: News) -> None:
@@ -86,7 +177,7 @@ class DatabaseManager:
         with self.get_connection() as conn:
             with conn.cursor() as cur:
                 embedding_str = None
-                if news.embedding:
+                if news.embedding is not None and len(news.embedding):
                     embedding_str = '[' + ','.join(map(str, news.embedding)) + ']'
                 
                 cur.execute("""
@@ -119,12 +210,11 @@ class DatabaseManager:
                 # Update news_actors
                 if news.mentioned_actors:
                     cur.execute("DELETE FROM news_actors WHERE news_id = %s", (news.id,))
-                    for actor_id in news.mentioned_actors:
-                        cur.execute("""
-                            INSERT INTO news_actors (news_id, actor_id, confidence)
-                            VALUES (%s, %s, %s)
-                            ON CONFLICT (news_id, actor_id) DO NOTHING
-                        """, (news.id, actor_id, 0.5))
+                    execute_values(cur, """
+                        INSERT INTO news_actors (news_id, actor_id, confidence)
+                        VALUES %s
+                        ON CONFLICT (news_id, actor_id) DO NOTHING
+                    """, [(news.id, actor_id, 0.5) for actor_id in news.mentioned_actors])
     
     def get_news(self, news_id: str) -> Optional[News]:
         """Get news by ID"""
@@ -146,13 +236,32 @@ class DatabaseManager:
                 cur.execute(query)
                 return [self._row_to_news(row) for row in cur.fetchall()]
     
-    def _row_to_news(self, row: Dict) -> News:
-        """Convert database row to News object"""
-        # Get mentioned_actors
+    def get_news_bulk(self, news_ids: List[str]) -> Dict[str, News]:
+        """Get several news items by ID (two queries instead of 2 per item)"""
+        if not news_ids:
+            return {}
+        ids = list(news_ids)
         with self.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT actor_id FROM news_actors WHERE news_id = %s", (row['id'],))
-                mentioned_actors = [r[0] for r in cur.fetchall()]
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("SELECT * FROM news WHERE id = ANY(%s)", (ids,))
+                rows = cur.fetchall()
+                cur.execute("SELECT news_id, actor_id FROM news_actors WHERE news_id = ANY(%s)", (ids,))
+                mentions: Dict[str, List[str]] = {}
+                for r in cur.fetchall():
+                    mentions.setdefault(r['news_id'], []).append(r['actor_id'])
+        return {
+            row['id']: self._row_to_news(row, mentioned_actors=mentions.get(row['id'], []))
+            for row in rows
+        }
+    
+    def _row_to_news(self, row: Dict, mentioned_actors: Optional[List[str]] = None) -> News:
+        """Convert database row to News object"""
+        # Get mentioned_actors (unless already fetched by the caller)
+        if mentioned_actors is None:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT actor_id FROM news_actors WHERE news_id = %s", (row['id'],))
+                    mentioned_actors = [r[0] for r in cur.fetchall()]
         
         # Handle embedding - pgvector returns it as a special type or list
         embedding = None
@@ -244,6 +353,17 @@ class DatabaseManager:
                 cur.execute("SELECT * FROM actors ORDER BY canonical_name")
                 return [self._row_to_actor(row) for row in cur.fetchall()]
     
+    def find_actor_by_name_ci(self, name: str) -> Optional[str]:
+        """Find actor ID by canonical name, case-insensitive (uses actors_cname_lower)"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT id FROM actors WHERE lower(canonical_name) = lower(%s) LIMIT 1",
+                    (name,)
+                )
+                row = cur.fetchone()
+                return row[0] if row else None
+    
     def _row_to_actor(self, row: Dict) -> Actor:
         """Convert database row to Actor object"""
         # Get aliases
@@ -494,12 +614,33 @@ class DatabaseManager:
                 """, (story_id,))
                 return [self._row_to_event(row) for row in cur.fetchall()]
     
-    def _row_to_event(self, row: Dict) -> Event:
-        """Convert database row to Event object"""
+    def get_all_events(self) -> List[Event]:
+        """Get all events (aggregated server-side into one JSON array with their actors)"""
         with self.get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT actor_id FROM event_actors WHERE event_id = %s", (row['id'],))
-                actors = [r[0] for r in cur.fetchall()]
+                if ORJSON_AVAILABLE:
+                    register_default_jsonb(cur, loads=orjson.loads)
+                cur.execute("""
+                    SELECT COALESCE(jsonb_agg(
+                        to_jsonb(e) || jsonb_build_object('actors', COALESCE(ea.actors, '[]'::jsonb))
+                    ), '[]'::jsonb)
+                    FROM events e
+                    LEFT JOIN (
+                        SELECT event_id, jsonb_agg(actor_id) AS actors
+                        FROM event_actors GROUP BY event_id
+                    ) ea ON ea.event_id = e.id
+                """)
+                rows = cur.fetchone()[0]
+        return [self._row_to_event(row, actors=row['actors']) for row in rows]
+    
+    def _row_to_event(self, row: Dict, actors: Optional[List[str]] = None) -> Event:
+        """Convert database row to Event object"""
+        # Get actors (unless already fetched by the caller)
+        if actors is None:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT actor_id FROM event_actors WHERE event_id = %s", (row['id'],))
+                    actors = [r[0] for r in cur.fetchall()]
         
         from backend.models.entities import EventType
         return Event(
@@ -550,75 +691,217 @@ class DatabaseManager:
                 
                 return [(row[0], float(row[1])) for row in cur.fetchall()]
     
-    def compute_news_similarities(self, threshold: float = 0.6) -> List[NewsRelation]:
+    def compute_news_similarities(self, threshold: float = 0.6, k: Optional[int] = None) -> List[NewsRelation]:
         """
-        Compute similarities between all news items using pgvector
-        More efficient than sklearn for large datasets
+        Compute similarities between all news items
+
+        Exact by default: embeddings are exported once (binary COPY) and
+        compared in memory with a tiled matmul (see backend.utils.similarity).
+        With k, each news is matched only against its k nearest neighbours
+        via the HNSW inner-product index (approximate, for large corpora).
+        Relations are written back with a single batched upsert.
         """
         relations = []
         
+        if k is None:
+            ids, embeddings = self.export_embeddings_binary()
+            if len(ids) < 2:
+                return relations
+            rows_i, rows_j, sims = similar_pairs(embeddings, threshold)
+            pairs = ((ids[i], ids[j], sim)
+                     for i, j, sim in zip(rows_i.tolist(), rows_j.tolist(), sims.tolist()))
+        else:
+            pairs = self._knn_similar_pairs(threshold, k)
+        
+        now = datetime.utcnow()
+        for id_a, id_b, similarity in pairs:
+            # Store one direction only, ordered by id
+            source_id, target_id = sorted((id_a, id_b))
+            relations.append(NewsRelation(
+                source_news_id=source_id,
+                target_news_id=target_id,
+                similarity=similarity,
+                weight=similarity,
+                is_editorial=False,
+                created_at=now
+            ))
+        
+        if relations:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    execute_values(cur, """
+                        INSERT INTO news_relations (source_news_id, target_news_id, similarity, weight, is_editorial, created_at)
+                        VALUES %s
+                        ON CONFLICT (source_news_id, target_news_id) DO UPDATE SET
+                            similarity = EXCLUDED.similarity,
+                            weight = EXCLUDED.weight
+                    """, [
+                        (r.source_news_id, r.target_news_id, r.similarity, r.weight,
+                         r.is_editorial, r.created_at)
+                        for r in relations
+                    ], page_size=1000)
+        
+        return relations
+    
+    def _knn_similar_pairs(self, threshold: float, k: int) -> List[Tuple[str, str, float]]:
+        """
+        (id_a, id_b, similarity) for each news and its k nearest neighbours above threshold
+
+        Uses the news_embedding_hnsw index: negative inner product (<#>) over
+        halfvec casts of the L2-normalized embeddings, i.e. cosine similarity.
+        The ORDER BY expression must match the index expression exactly.
+        Each unordered pair is returned once, with its highest similarity.
+        """
+        halfvec = f"halfvec({EMBEDDING_DIM})"
+        n_vec = f"(l2_normalize(n.embedding)::{halfvec})"
+        a_vec = f"(l2_normalize(a.embedding)::{halfvec})"
         with self.get_connection() as conn:
             with conn.cursor() as cur:
-                # Get all news with embeddings
-                cur.execute("SELECT id, embedding FROM news WHERE embedding IS NOT NULL")
-                news_with_embeddings = cur.fetchall()
-                
-                if len(news_with_embeddings) < 2:
-                    return relations
-                
-                # For each news, find similar ones
-                for news_id, embedding in news_with_embeddings:
-                    if embedding is None:
-                        continue
-                    
-                    # Convert embedding to list if it's numpy array
-                    if isinstance(embedding, np.ndarray):
-                        embedding_list = embedding.tolist()
-                    elif isinstance(embedding, (list, tuple)):
-                        embedding_list = list(embedding)
-                    else:
-                        continue
-                    
-                    # Format as PostgreSQL array string for vector type
-                    embedding_str = '[' + ','.join(map(str, embedding_list)) + ']'
-                    
-                    # Find similar news (excluding self)
-                    cur.execute("""
-                        SELECT id, 1 - (embedding <=> %s::vector) as similarity
-                        FROM news
-                        WHERE id != %s
-                          AND embedding IS NOT NULL
-                          AND 1 - (embedding <=> %s::vector) >= %s
-                        ORDER BY embedding <=> %s::vector
-                    """, (embedding_str, news_id, embedding_str, threshold, embedding_str))
-                    
-                    for similar_id, similarity in cur.fetchall():
-                        # Avoid duplicates (only store one direction)
-                        if news_id < similar_id:
-                            relation = NewsRelation(
-                                source_news_id=news_id,
-                                target_news_id=similar_id,
-                                similarity=float(similarity),
-                                weight=float(similarity),
-                                is_editorial=False,
-                                created_at=datetime.utcnow()
-                            )
-                            relations.append(relation)
-                            
-                            # Save to database
-                            cur.execute("""
-                                INSERT INTO news_relations (source_news_id, target_news_id, similarity, weight, is_editorial, created_at)
-                                VALUES (%s, %s, %s, %s, %s, %s)
-                                ON CONFLICT (source_news_id, target_news_id) DO UPDATE SET
-                                    similarity = EXCLUDED.similarity,
-                                    weight = EXCLUDED.weight
-                            """, (
-                                relation.source_news_id, relation.target_news_id,
-                                relation.similarity, relation.weight,
-                                relation.is_editorial, relation.created_at
-                            ))
+                cur.execute(f"""
+                    SELECT DISTINCT ON (LEAST(a.id, b.id), GREATEST(a.id, b.id))
+                           LEAST(a.id, b.id), GREATEST(a.id, b.id), b.similarity
+                    FROM news a
+                    CROSS JOIN LATERAL (
+                        SELECT n.id,
+                               -({n_vec} <#> {a_vec}) AS similarity
+                        FROM news n
+                        WHERE n.embedding IS NOT NULL AND n.id <> a.id
+                        ORDER BY {n_vec} <#> {a_vec}
+                        LIMIT %s
+                    ) b
+                    WHERE a.embedding IS NOT NULL AND b.similarity >= %s
+                    ORDER BY LEAST(a.id, b.id), GREATEST(a.id, b.id), b.similarity DESC
+                """, (k, threshold))
+                return [(r[0], r[1], min(float(r[2]), 1.0)) for r in cur.fetchall()]
+    
+    def export_embeddings_binary(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Export all news embeddings with one binary COPY
         
-        return relations
+        Returns:
+            (news_ids, float32 matrix of shape (N, D))
+        """
+        buf = io.BytesIO()
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.copy_expert(
+                    "COPY (SELECT id, embedding FROM news WHERE embedding IS NOT NULL) "
+                    "TO STDOUT (FORMAT BINARY)",
+                    buf
+                )
+        return self._parse_embeddings_copy(buf.getvalue())
+    
+    @staticmethod
+    def _parse_embeddings_copy(data: bytes) -> Tuple[List[str], np.ndarray]:
+        """Decode COPY BINARY rows of (text id, pgvector embedding)"""
+        # Header: 11-byte signature, int32 flags, int32 extension length
+        offset = 11 + 4
+        (ext_len,) = struct.unpack_from('>i', data, offset)
+        offset += 4 + ext_len
+        
+        ids: List[str] = []
+        vectors: List[np.ndarray] = []
+        while True:
+            (field_count,) = struct.unpack_from('>h', data, offset)
+            offset += 2
+            if field_count == -1:  # trailer
+                break
+            (id_len,) = struct.unpack_from('>i', data, offset)
+            offset += 4
+            news_id = data[offset:offset + id_len].decode('utf-8')
+            offset += id_len
+            (vec_len,) = struct.unpack_from('>i', data, offset)
+            offset += 4
+            # pgvector send format: uint16 dim, uint16 unused, dim x float4 (big-endian)
+            (dim,) = struct.unpack_from('>H', data, offset)
+            vectors.append(np.frombuffer(data, dtype='>f4', count=dim, offset=offset + 4))
+            offset += vec_len
+            ids.append(news_id)
+        
+        if not vectors:
+            return ids, np.empty((0, 0), dtype=np.float32)
+        return ids, np.vstack(vectors).astype(np.float32)
+    
+    def update_news_relation_editorial(self, source_id: str, target_id: str, weight: float) -> None:
+        """Set weight of an existing relation and mark it editorial"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                self._execute_prepared(cur, "update_editorial_relation", (weight, source_id, target_id))
+    
+    def upsert_news_relation(self, relation: NewsRelation) -> None:
+        """Insert relation, or update weight/is_editorial of an existing one"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                self._execute_prepared(cur, "upsert_news_relation", (
+                    relation.source_news_id, relation.target_news_id, relation.similarity,
+                    relation.weight, relation.is_editorial, relation.created_at
+                ))
+    
+    def save_actor_relation(self, relation: ActorRelation) -> None:
+        """Insert actor relation, or update weight/confidence of an existing one"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                self._execute_prepared(cur, "upsert_actor_relation", (
+                    relation.id, relation.source_actor_id, relation.target_actor_id,
+                    relation.relation_type.value, relation.weight, relation.confidence,
+                    relation.is_ephemeral, relation.ttl_days, relation.expires_at,
+                    relation.source, relation.created_at
+                ))
+    
+    def upsert_news_relations_copy(self, relations: List[NewsRelation]) -> None:
+        """
+        Upsert many news relations: COPY into a temp table, then one INSERT ... SELECT
+        
+        Existing rows get the new weight and is_editorial flag; their
+        similarity and created_at are kept.
+        """
+        if not relations:
+            return
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for r in relations:
+            writer.writerow((
+                r.source_news_id, r.target_news_id, r.similarity, r.weight,
+                't' if r.is_editorial else 'f', r.created_at.isoformat()
+            ))
+        buf.seek(0)
+        
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE TEMP TABLE tmp_news_relations
+                    (LIKE news_relations INCLUDING DEFAULTS) ON COMMIT DROP
+                """)
+                cur.copy_expert("""
+                    COPY tmp_news_relations
+                    (source_news_id, target_news_id, similarity, weight, is_editorial, created_at)
+                    FROM STDIN WITH (FORMAT csv)
+                """, buf)
+                cur.execute("""
+                    INSERT INTO news_relations (source_news_id, target_news_id, similarity, weight, is_editorial, created_at)
+                    SELECT source_news_id, target_news_id, similarity, weight, is_editorial, created_at
+                    FROM tmp_news_relations
+                    ON CONFLICT (source_news_id, target_news_id) DO UPDATE SET
+                        weight = EXCLUDED.weight,
+                        is_editorial = EXCLUDED.is_editorial
+                """)
+                # ON COMMIT DROP alone is not enough inside transaction():
+                # a second call before the commit would hit "already exists"
+                cur.execute("DROP TABLE tmp_news_relations")
+    
+    def update_news_relation_weights(self, updates: List[Tuple[str, str, float]]) -> None:
+        """Bulk-update weights of news relations given (source_id, target_id, weight)"""
+        if not updates:
+            return
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, """
+                    UPDATE news_relations AS r
+                    SET weight = data.weight
+                    FROM (VALUES %s) AS data(source_news_id, target_news_id, weight)
+                    WHERE r.source_news_id = data.source_news_id
+                      AND r.target_news_id = data.target_news_id
+                """, updates, template="(%s, %s, %s::float8)", page_size=1000)
     
     # --- Helper methods ---
     
@@ -629,6 +912,45 @@ class DatabaseManager:
                 cur.execute("SELECT actor_id FROM news_actors WHERE news_id = %s", (news_id,))
                 return [r[0] for r in cur.fetchall()]
     
+    def insert_news_actors_bulk(self, pairs: List[Tuple[str, str, float]]) -> None:
+        """Insert (news_id, actor_id, confidence) mentions in one batch; existing pairs are kept"""
+        if not pairs:
+            return
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, """
+                    INSERT INTO news_actors (news_id, actor_id, confidence)
+                    VALUES %s
+                    ON CONFLICT (news_id, actor_id) DO NOTHING
+                """, pairs, page_size=1000)
+    
+    def get_news_actor_pairs(self, news_ids: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+        """Get (news_id, actor_id) mention pairs, optionally limited to given news"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                if news_ids is None:
+                    cur.execute("SELECT news_id, actor_id FROM news_actors")
+                else:
+                    cur.execute("SELECT news_id, actor_id FROM news_actors WHERE news_id = ANY(%s)",
+                                (list(news_ids),))
+                return cur.fetchall()
+    
+    def get_top_actors_for_news_ids(self, news_ids: List[str], top_n: int) -> List[str]:
+        """Most frequently mentioned actors across the given news, most frequent first"""
+        if not news_ids:
+            return []
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT actor_id, COUNT(*) AS mentions
+                    FROM news_actors
+                    WHERE news_id = ANY(%s)
+                    GROUP BY actor_id
+                    ORDER BY mentions DESC, actor_id
+                    LIMIT %s
+                """, (list(news_ids), top_n))
+                return [r[0] for r in cur.fetchall()]
+    
     def get_actor_news(self, actor_id: str) -> List[str]:
         """Get all news mentioning an actor"""
         with self.get_connection() as conn:
@@ -636,6 +958,26 @@ class DatabaseManager:
                 cur.execute("SELECT news_id FROM news_actors WHERE actor_id = %s", (actor_id,))
                 return [r[0] for r in cur.fetchall()]
     
+    def get_actor_mentions_count(self, actor_id: str) -> int:
+        """Count news mentioning an actor (uses news_actors_actor_idx)"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT count(*) FROM news_actors WHERE actor_id = %s", (actor_id,))
+                return cur.fetchone()[0]
+    
+    def get_entity_counts(self) -> Dict[str, int]:
+        """Row counts of news, actors, stories and events in one round-trip"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT (SELECT count(*) FROM news),
+                           (SELECT count(*) FROM actors),
+                           (SELECT count(*) FROM stories),
+                           (SELECT count(*) FROM events)
+                """)
+                news, actors, stories, events = cur.fetchone()
+                return {"news": news, "actors": actors, "stories": stories, "events": events}
+    
     def close(self):
         """Close connection pool"""
         if self.pool:
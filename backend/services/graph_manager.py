@@ -2,42 +2,156 @@
 Graph manager for two-layer graph: News and Actors
 Now uses PostgreSQL + pgvector for persistence
 """
+import os
+import bisect
+import functools
 import networkx as nx
-from typing import List, Dict, Tuple, Optional
+from collections.abc import MutableMapping
+from typing import List, Dict, Tuple, Optional, FrozenSet, Set, Iterable, Iterator
 from datetime import datetime
 import numpy as np
+from scipy.sparse import csr_matrix
 
 from backend.models.entities import (
     News, Actor, ActorRelation, NewsRelation, Story, Event
 )
 from backend.services.database_manager import DatabaseManager
+from backend.utils import graph_kernels
+from backend.utils.lru_cache import LRUCache
+
+# Actor types accepted by ensure_actor; anything else maps to "organization"
+_ALLOWED_ACTOR_TYPES = frozenset({
+    "person", "company", "country", "organization", "government", "structure", "event"
+})
+_ACTOR_TYPE_ALIASES = {"org": "organization", "other": "organization"}
+
+# Max memoized get_node_neighbors / calculate_cluster_cohesion results each
+TRAVERSAL_CACHE_SIZE = 4096
+
+# Shared-actor counts use packed per-news bitsets (popcount of AND) while the
+# actor vocabulary fits in dense rows; the sparse matrix is used above that
+MENTION_BITSET_MAX_ACTORS = 4096
+# Edges per chunk in the bitset path (bounds the edges x row-width temporary)
+BITSET_EDGE_CHUNK = 65536
+# Number of set bits for every byte value
+_POPCOUNT_U8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class _EntitySnapshot(MutableMapping):
+    """
+    {id: entity} view over a cached snapshot that hands out deep copies
+
+    Reads return a copy of the entity, so edits by callers never reach the
+    shared snapshot (they behaved the same on the fresh DB load this replaced).
+    Writes/deletes/clear() only change this view. Persist changes through
+    GraphManager methods.
+    """
+
+    def __init__(self, entities: Dict):
+        self._entities = dict(entities)
+
+    def __getitem__(self, key):
+        return self._entities[key].model_copy(deep=True)
+
+    def __setitem__(self, key, value) -> None:
+        self._entities[key] = value
+
+    def __delitem__(self, key) -> None:
+        del self._entities[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._entities
+
+    def __iter__(self):
+        return iter(self._entities)
+
+    def __len__(self) -> int:
+        return len(self._entities)
 
 
 class GraphManager:
     """Manages the two-layer graph structure with PostgreSQL backend"""
 
-    def __init__(self, db_manager: Optional[DatabaseManager] = None):
+    def __init__(self, db_manager: Optional[DatabaseManager] = None, cache_size: Optional[int] = None):
         """
         Initialize graph manager
         
         Args:
             db_manager: DatabaseManager instance (creates new if None)
+            cache_size: Max entries per news/actor/story cache
+                        (default: GRAPH_CACHE_SIZE env var, 50000)
         """
         self.db = db_manager or DatabaseManager()
         
         # Layer 1: News graph (kept for graph operations, synced with DB)
         self.news_graph = nx.Graph()
 
+        # Union-find over news_graph nodes: connected component count is
+        # maintained on insert so get_graph_stats needs no traversal.
+        # Nodes/edges are never removed from news_graph, so no invalidation.
+        self._uf_parent: Dict[str, str] = {}
+        self._num_components = 0
+
+        # CSR snapshot of news_graph for JIT traversal kernels:
+        # (indptr, indices, weights, news_id -> row, row -> news_id).
+        # Dropped on any node/edge/weight change and rebuilt on next use.
+        self._csr: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, int], List[str]]] = None
+
+        # Generation of news_graph, bumped by every mutator (_graph_changed).
+        # Traversal results are memoized per instance keyed by generation, so
+        # stale entries are never hit and simply age out of the LRU.
+        self._graph_gen = 0
+        self._neighbors_cached = functools.lru_cache(maxsize=TRAVERSAL_CACHE_SIZE)(
+            self._compute_node_neighbors
+        )
+        self._cohesion_cached = functools.lru_cache(maxsize=TRAVERSAL_CACHE_SIZE)(
+            self._compute_cluster_cohesion
+        )
+
         # Layer 2: Actors graph (kept for graph operations, synced with DB)
         self.actors_graph = nx.DiGraph()  # Directed for relationships
 
-        # Cross-layer: News ↔ Actors mentions (kept for graph operations)
-        self.mentions_graph = nx.Graph()  # Bipartite graph
+        # Cross-layer: News ↔ Actors mentions as two adjacency maps of raw IDs
+        # (mentions_graph builds a frozen nx.Graph view on demand)
+        self._news_to_actors: Dict[str, Set[str]] = {}
+        self._actor_to_news: Dict[str, Set[str]] = {}
+        self._mention_count = 0
+        self._mentions_graph: Optional[nx.Graph] = None
         
-        # Cache for frequently accessed items (optional optimization)
-        self._news_cache: Dict[str, News] = {}
-        self._actors_cache: Dict[str, Actor] = {}
-        self._stories_cache: Dict[str, Story] = {}
+        # Cache for frequently accessed items (optional optimization);
+        # LRU-bounded so long-running processes don't hold the whole corpus
+        if cache_size is None:
+            cache_size = int(os.getenv("GRAPH_CACHE_SIZE", "50000"))
+        self._news_cache: Dict[str, News] = LRUCache(cache_size)
+        self._actors_cache: Dict[str, Actor] = LRUCache(cache_size)
+        self._stories_cache: Dict[str, Story] = LRUCache(cache_size)
+
+        # Case-insensitive name/alias -> actor_id index for ensure_actor.
+        # Loaded lazily from DB on first lookup, then kept current by add_actor;
+        # misses fall back to an indexed DB query (actors added elsewhere).
+        # GraphManager is used from a single thread; no locking here.
+        self._actor_name_index: Dict[str, str] = {}
+        self._actor_name_index_loaded = False
+
+        # Mentions as news_id -> frozenset of interned actor ints, and the
+        # news x actors matrix built from them for shared-actor counts:
+        # (news_id -> row, CSR matrix, packed bitsets). Rebuilt lazily after
+        # mentions change; actor interning is kept across rebuilds.
+        self._actor_id_to_int: Dict[str, int] = {}
+        self._news_actor_sets: Optional[Dict[str, FrozenSet[int]]] = None
+        self._mention_matrix: Optional[Tuple[Dict[str, int], csr_matrix, Optional[np.ndarray]]] = None
+
+        # Snapshots behind the news/actors/stories/events properties:
+        # name -> (data generation, {id: entity}). _data_gen is bumped by every
+        # mutator that writes entities to the DB, so a snapshot is loaded at
+        # most once per change instead of on every property access.
+        self._data_gen = 0
+        self._snapshots: Dict[str, Tuple[int, Dict]] = {}
+
+        # Per-story timeline as (event_date, event_id) kept sorted on insert,
+        # seeded from DB on first read; events by ID for those lists
+        self._story_event_order: Dict[str, List[Tuple[datetime, str]]] = {}
+        self._events_cache: Dict[str, Event] = {}
 
     # --- News Layer ---
 
@@ -45,29 +159,48 @@ class GraphManager:
         """Add news item to graph and database"""
         # Save to database
         self.db.save_news(news)
+        self._data_changed()
         
         # Update cache
         self._news_cache[news.id] = news
         
-        # Update graph (for graph operations)
+        # Update graph (for graph operations); embedding is stored as a
+        # contiguous float32 array so matrices can be built with np.stack
         self.news_graph.add_node(
             news.id,
             title=news.title,
             published_at=news.published_at,
-            embedding=news.embedding,
+            embedding=self._as_embedding_array(news.embedding),
             story_id=news.story_id,
             is_pinned=news.is_pinned,
             domains=news.domains
         )
 
-        # Add mentions edges to actors
-        for actor_id in news.mentioned_actors:
-            self.mentions_graph.add_edge(
-                f"news_{news.id}",
-                f"actor_{actor_id}",
-                news_id=news.id,
-                actor_id=actor_id
-            )
+        self._uf_add(news.id)
+        self.invalidate_mention_matrix()
+        self._graph_changed()
+
+        # Add mentions to actors
+        self.index_mentions(news.id, news.mentioned_actors)
+
+    @staticmethod
+    def _as_embedding_array(embedding) -> Optional[np.ndarray]:
+        """Convert embedding to contiguous float32 array (no copy if already one)"""
+        if embedding is None:
+            return None
+        return np.ascontiguousarray(embedding, dtype=np.float32)
+
+    def get_embedding_matrix(self, news_items: List[News]) -> np.ndarray:
+        """Stack embeddings of news items into an (N, D) float32 matrix"""
+        rows = []
+        for news in news_items:
+            vec = None
+            if news.id in self.news_graph:
+                vec = self.news_graph.nodes[news.id].get('embedding')
+            if vec is None:
+                vec = self._as_embedding_array(news.embedding)
+            rows.append(vec)
+        return np.stack(rows)
 
     def add_news_relation(self, relation: NewsRelation) -> None:
         """Add relationship between news items"""
@@ -84,51 +217,175 @@ class GraphManager:
                 weight=relation.weight,
                 is_editorial=relation.is_editorial
             )
+            self._uf_union(relation.source_news_id, relation.target_news_id)
+            self._graph_changed()
+
+    def compute_news_similarities(self, threshold: float = 0.5, k: Optional[int] = None) -> List[NewsRelation]:
+        """
+        Compute cosine similarities between news items
 
-    def compute_news_similarities(self, threshold: float = 0.5) -> List[NewsRelation]:
-        """Compute cosine similarities between all news items using pgvector"""
-        # Use DatabaseManager's optimized pgvector implementation
-        relations = self.db.compute_news_similarities(threshold=threshold)
+        Exact all-pairs by default; with k, only each news' k nearest
+        neighbours are considered (HNSW index, see DatabaseManager).
+        """
+        relations = self.db.compute_news_similarities(threshold=threshold, k=k)
         
-        # Update graph with relations
+        # Update graph with relations (one bulk insertion)
+        self.news_graph.add_edges_from(
+            (r.source_news_id, r.target_news_id,
+             {'similarity': r.similarity, 'weight': r.weight, 'is_editorial': r.is_editorial})
+            for r in relations
+        )
         for relation in relations:
-            self.news_graph.add_edge(
-                relation.source_news_id,
-                relation.target_news_id,
-                similarity=relation.similarity,
-                weight=relation.weight,
-                is_editorial=relation.is_editorial
-            )
-        
+            self._uf_union(relation.source_news_id, relation.target_news_id)
+        if relations:
+            self._graph_changed()
+
         return relations
 
+    def rebuild_component_index(self) -> None:
+        """Recompute union-find state from news_graph (after direct bulk loads)"""
+        self._uf_parent = {}
+        self._num_components = 0
+        for node in self.news_graph.nodes:
+            self._uf_add(node)
+        for source_id, target_id in self.news_graph.edges:
+            self._uf_union(source_id, target_id)
+        self._graph_changed()
+
+    def _uf_add(self, node: str) -> None:
+        """Register a news node as its own component"""
+        if node not in self._uf_parent:
+            self._uf_parent[node] = node
+            self._num_components += 1
+
+    def _uf_find(self, node: str) -> str:
+        """Find component root with path compression"""
+        parent = self._uf_parent
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    def _uf_union(self, source_id: str, target_id: str) -> None:
+        """Merge components of an edge's endpoints"""
+        self._uf_add(source_id)
+        self._uf_add(target_id)
+        source_root = self._uf_find(source_id)
+        target_root = self._uf_find(target_id)
+        if source_root != target_root:
+            self._uf_parent[source_root] = target_root
+            self._num_components -= 1
+
     def boost_similarity_by_shared_actors(self, boost_factor: float = 0.1) -> None:
         """Boost edge weights for news sharing actors"""
-        for edge in self.news_graph.edges(data=True):
-            source_id, target_id, data = edge
-            source_news = self.get_news(source_id)
-            target_news = self.get_news(target_id)
-            
-            if not source_news or not target_news:
-                continue
-                
-            source_actors = set(source_news.mentioned_actors)
-            target_actors = set(target_news.mentioned_actors)
+        edges = list(self.news_graph.edges(data='weight', default=1.0))
+        if not edges:
+            return
 
-            shared = len(source_actors & target_actors)
+        row_of, matrix, bits = self._get_mention_matrix()
+        source_rows = np.fromiter((row_of[u] for u, _, _ in edges), dtype=np.int64, count=len(edges))
+        target_rows = np.fromiter((row_of[v] for _, v, _ in edges), dtype=np.int64, count=len(edges))
+        shared_counts = self._shared_actor_counts(matrix, bits, source_rows, target_rows)
+
+        updates = []
+        for (source_id, target_id, current_weight), shared in zip(edges, shared_counts.tolist()):
             if shared > 0:
-                current_weight = data.get('weight', 1.0)
                 new_weight = min(1.0, current_weight + (boost_factor * shared))
                 self.news_graph[source_id][target_id]['weight'] = new_weight
-                
-                # Update in database
-                with self.db.get_connection() as conn:
-                    with conn.cursor() as cur:
-                        cur.execute("""
-                            UPDATE news_relations
-                            SET weight = %s
-                            WHERE source_news_id = %s AND target_news_id = %s
-                        """, (new_weight, source_id, target_id))
+                updates.append((source_id, target_id, new_weight))
+        if updates:
+            self._graph_changed()
+
+        # Update in database (single batched statement)
+        self.db.update_news_relation_weights(updates)
+
+    @staticmethod
+    def _shared_actor_counts(
+        matrix: csr_matrix,
+        bits: Optional[np.ndarray],
+        source_rows: np.ndarray,
+        target_rows: np.ndarray
+    ) -> np.ndarray:
+        """Number of actors shared by each (source, target) row pair"""
+        if bits is None:
+            # Row-wise AND of the sparse mention vectors, summed
+            return np.asarray(matrix[source_rows].multiply(matrix[target_rows]).sum(axis=1)).ravel()
+
+        counts = np.empty(len(source_rows), dtype=np.int64)
+        for start in range(0, len(source_rows), BITSET_EDGE_CHUNK):
+            stop = start + BITSET_EDGE_CHUNK
+            common = bits[source_rows[start:stop]] & bits[target_rows[start:stop]]
+            counts[start:stop] = _POPCOUNT_U8[common].sum(axis=1, dtype=np.int64)
+        return counts
+
+    def _get_mention_matrix(self) -> Tuple[Dict[str, int], csr_matrix, Optional[np.ndarray]]:
+        """Build (or reuse) the news x actors mention matrix over news_graph nodes"""
+        # Nodes are only ever added, so a size change means new rows are needed
+        if (self._mention_matrix is None
+                or len(self._mention_matrix[0]) != self.news_graph.number_of_nodes()):
+            actor_sets = self._news_actor_sets
+            if actor_sets is None or len(actor_sets) != len(self.news_graph):
+                actor_sets = self._build_actor_sets()
+            row_of: Dict[str, int] = {}
+            rows, cols = [], []
+            for node in self.news_graph.nodes:
+                row = row_of[node] = len(row_of)
+                for actor_int in actor_sets[node]:
+                    rows.append(row)
+                    cols.append(actor_int)
+            num_actors = len(self._actor_id_to_int)
+            matrix = csr_matrix(
+                (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+                shape=(len(row_of), max(num_actors, 1))
+            )
+            bits = None
+            if num_actors <= MENTION_BITSET_MAX_ACTORS:
+                # One bit per actor, rows padded to whole 64-bit words
+                width = max((num_actors + 63) // 64, 1) * 8
+                bits = np.zeros((len(row_of), width), dtype=np.uint8)
+                row_idx = np.asarray(rows, dtype=np.int64)
+                col_idx = np.asarray(cols, dtype=np.int64)
+                np.bitwise_or.at(
+                    bits, (row_idx, col_idx >> 3),
+                    (1 << (7 - (col_idx & 7))).astype(np.uint8)
+                )
+            self._mention_matrix = (row_of, matrix, bits)
+        return self._mention_matrix
+
+    def _build_actor_sets(self) -> Dict[str, FrozenSet[int]]:
+        """Map every news_graph node to the frozenset of its interned actor ints"""
+        intern = self._actor_id_to_int
+
+        def to_ints(actor_ids) -> FrozenSet[int]:
+            return frozenset(intern.setdefault(aid, len(intern)) for aid in actor_ids)
+
+        actor_sets: Dict[str, FrozenSet[int]] = {}
+        missing = []
+        for node in self.news_graph.nodes:
+            news = self._news_cache.get(node)
+            if news:
+                actor_sets[node] = to_ints(news.mentioned_actors_set)
+            else:
+                missing.append(node)
+
+        # Uncached news: one query over news_actors instead of loading each news
+        if missing:
+            grouped: Dict[str, List[str]] = {}
+            for news_id, actor_id in self.db.get_news_actor_pairs(missing):
+                grouped.setdefault(news_id, []).append(actor_id)
+            for node in missing:
+                actor_sets[node] = to_ints(grouped.get(node, ()))
+
+        self._news_actor_sets = actor_sets
+        return actor_sets
+
+    def invalidate_mention_matrix(self) -> None:
+        """Drop cached mention sets/matrix (call after editing news mentions directly)"""
+        self._news_actor_sets = None
+        self._mention_matrix = None
+        self._mentions_graph = None
 
     # --- Actor Layer ---
 
@@ -136,6 +393,7 @@ class GraphManager:
         """Add actor to graph and database"""
         # Save to database
         self.db.save_actor(actor)
+        self._data_changed()
         
         # Update cache
         self._actors_cache[actor.id] = actor
@@ -148,16 +406,40 @@ class GraphManager:
             aliases=actor.aliases
         )
 
+        self._index_actor_names(actor)
+
+    def _index_actor_names(self, actor: Actor) -> None:
+        """Register canonical name and aliases (lowercased) in the name index"""
+        index = self._actor_name_index
+        for alias_data in actor.aliases:
+            alias = (alias_data.get('name') or '').lower()
+            if alias:
+                index.setdefault(alias, actor.id)
+        # Canonical name always wins over an alias of another actor
+        index[actor.canonical_name.lower()] = actor.id
+
+    def _find_actor_id_by_name(self, name: str) -> Optional[str]:
+        """Case-insensitive lookup of actor ID by canonical name or alias"""
+        if not self._actor_name_index_loaded:
+            for actor in self.db.get_all_actors():
+                self._index_actor_names(actor)
+            self._actor_name_index_loaded = True
+        key = name.lower()
+        actor_id = self._actor_name_index.get(key)
+        if actor_id is None:
+            actor_id = self.db.find_actor_by_name_ci(name)
+            if actor_id:
+                self._actor_name_index[key] = actor_id
+        return actor_id
+
     def ensure_actor(self, name: str, actor_type: str = "person", confidence: float = 0.5) -> str:
         """Find actor by name (case-insensitive) or create new one"""
         actor_type = self._normalize_actor_type(actor_type)
         
-        # Search in database
-        all_actors = self.db.get_all_actors()
-        for actor in all_actors:
-            if actor.canonical_name.lower() == name.lower():
-                return actor.id
-        
+        actor_id = self._find_actor_id_by_name(name)
+        if actor_id:
+            return actor_id
+
         # Create new actor
         import uuid
         actor_id = f"actor_{uuid.uuid4().hex[:12]}"
@@ -172,20 +454,83 @@ class GraphManager:
 
     def add_mention(self, news_id: str, actor_id: str, confidence: float = 0.5) -> None:
         """Link news to actor in mentions graph"""
-        news_node = f"news_{news_id}"
-        actor_node = f"actor_{actor_id}"
-        self.mentions_graph.add_node(news_node, type="news")
-        self.mentions_graph.add_node(actor_node, type="actor")
-        self.mentions_graph.add_edge(
-            news_node,
-            actor_node,
-            confidence=confidence
-        )
-        # Update news object (mention is saved via save_news when news is updated)
+        self.add_mentions_bulk(news_id, [actor_id], [confidence])
+
+    def add_mentions_bulk(
+        self,
+        news_id: str,
+        actor_ids: List[str],
+        confidences: Optional[List[float]] = None
+    ) -> None:
+        """Link news to several actors; new mentions are written in one batch"""
+        if confidences is None:
+            confidences = [0.5] * len(actor_ids)
+        self.index_mentions(news_id, actor_ids)
+        # Update news object and persist only mentions it did not have yet
         news = self.get_news(news_id)
-        if news and actor_id not in news.mentioned_actors:
-            news.mentioned_actors.append(actor_id)
-            self.db.save_news(news)
+        if not news:
+            return
+        new_pairs = [
+            (news_id, aid, conf)
+            for aid, conf in zip(actor_ids, confidences)
+            if news.add_mentioned_actor(aid)
+        ]
+        if new_pairs:
+            self.db.insert_news_actors_bulk(new_pairs)
+            self._data_changed()
+            self.invalidate_mention_matrix()
+
+    def index_mentions(self, news_id: str, actor_ids: Iterable[str]) -> None:
+        """Record news -> actor mentions in memory only (no DB write)"""
+        actors = self._news_to_actors.setdefault(news_id, set())
+        for actor_id in actor_ids:
+            if actor_id not in actors:
+                actors.add(actor_id)
+                self._actor_to_news.setdefault(actor_id, set()).add(news_id)
+                self._mention_count += 1
+        self.invalidate_mention_matrix()
+
+    def unindex_news_mentions(self, news_id: str) -> None:
+        """Forget in-memory mentions of a news item (no DB write)"""
+        for actor_id in self._news_to_actors.pop(news_id, ()):
+            news_ids = self._actor_to_news[actor_id]
+            news_ids.discard(news_id)
+            if not news_ids:
+                del self._actor_to_news[actor_id]
+            self._mention_count -= 1
+        self.invalidate_mention_matrix()
+
+    def clear_mentions(self) -> None:
+        """Forget all in-memory mentions (no DB write)"""
+        self._news_to_actors.clear()
+        self._actor_to_news.clear()
+        self._mention_count = 0
+        self.invalidate_mention_matrix()
+
+    def iter_mentions(self) -> Iterator[Tuple[str, str]]:
+        """Iterate (news_id, actor_id) mention pairs held in memory"""
+        for news_id, actor_ids in self._news_to_actors.items():
+            for actor_id in actor_ids:
+                yield news_id, actor_id
+
+    @property
+    def mentions_graph(self) -> nx.Graph:
+        """
+        Bipartite news ↔ actors graph built from the mention index
+
+        Nodes are "news_<id>" / "actor_<id>", edges carry news_id and
+        actor_id. Cached until mentions change and frozen, so mutating it
+        raises instead of being silently lost: use index_mentions and
+        friends to change mentions.
+        """
+        if self._mentions_graph is None:
+            graph = nx.Graph()
+            graph.add_edges_from(
+                (f"news_{news_id}", f"actor_{actor_id}", {'news_id': news_id, 'actor_id': actor_id})
+                for news_id, actor_id in self.iter_mentions()
+            )
+            self._mentions_graph = nx.freeze(graph)
+        return self._mentions_graph
 
     def update_story_top_actors(self, story_id: str, top_n: int = 5) -> None:
         """Recompute top actors for a story based on mentions in its news"""
@@ -193,32 +538,23 @@ class GraphManager:
         if not story:
             return
         
-        counts = {}
-        for news_id in story.news_ids:
-            news = self.get_news(news_id)
-            if news:
-                for aid in news.mentioned_actors:
-                    counts[aid] = counts.get(aid, 0) + 1
-        # sort by frequency desc
-        sorted_ids = [aid for aid, _ in sorted(counts.items(), key=lambda x: x[1], reverse=True)]
-        top_ids = sorted_ids[:top_n]
-        story.top_actors = top_ids
+        # Counted in Postgres: one GROUP BY over news_actors instead of a
+        # get_news per story item
+        story.top_actors = self.db.get_top_actors_for_news_ids(story.news_ids, top_n)
         
         # Save updated story
         self.db.save_story(story)
+        self._data_changed()
         self._stories_cache[story_id] = story
 
     def _normalize_actor_type(self, actor_type: str) -> str:
-        allowed = {"person", "company", "country", "organization", "government", "structure", "event"}
         if not actor_type:
             return "organization"
-        t = str(actor_type).lower()
-        if t in allowed:
+        t = actor_type.lower() if isinstance(actor_type, str) else str(actor_type).lower()
+        if t in _ALLOWED_ACTOR_TYPES:
             return t
         # map common synonyms
-        if t in {"org", "other"}:
-            return "organization"
-        return "organization"
+        return _ACTOR_TYPE_ALIASES.get(t, "organization")
 
     def add_actor_relation(self, relation: ActorRelation) -> None:
         """Add relationship between actors"""
@@ -227,22 +563,7 @@ class GraphManager:
         
         if source_actor and target_actor:
             # Save to database
-            with self.db.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        INSERT INTO actor_relations (id, source_actor_id, target_actor_id, relation_type,
-                                                     weight, confidence, is_ephemeral, ttl_days, expires_at,
-                                                     source, created_at)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (source_actor_id, target_actor_id, relation_type) DO UPDATE SET
-                            weight = EXCLUDED.weight,
-                            confidence = EXCLUDED.confidence
-                    """, (
-                        relation.id, relation.source_actor_id, relation.target_actor_id,
-                        relation.relation_type.value, relation.weight, relation.confidence,
-                        relation.is_ephemeral, relation.ttl_days, relation.expires_at,
-                        relation.source, relation.created_at
-                    ))
+            self.db.save_actor_relation(relation)
             
             # Update graph
             self.actors_graph.add_edge(
@@ -257,10 +578,10 @@ class GraphManager:
 
     def get_actor_mentions_count(self, actor_id: str) -> int:
         """Count how many news mention this actor"""
-        actor_node = actor_id if actor_id.startswith("actor_") else f"actor_{actor_id}"
-        if actor_node in self.mentions_graph:
-            return len([n for n in self.mentions_graph.neighbors(actor_node)])
-        return 0
+        if not self._news_to_actors:
+            # Mention index not populated yet: ask the DB
+            return self.db.get_actor_mentions_count(actor_id)
+        return len(self._actor_to_news.get(actor_id, ()))
 
     def get_news_actors(self, news_id: str) -> List[str]:
         """Get all actors mentioned in a news item"""
@@ -276,6 +597,7 @@ class GraphManager:
         """Add story to storage and database"""
         # Save to database
         self.db.save_story(story)
+        self._data_changed()
         
         # Update cache
         self._stories_cache[story.id] = story
@@ -289,12 +611,21 @@ class GraphManager:
                 self.news_graph.nodes[news_id]['story_id'] = story.id
 
     def get_story_subgraph(self, story_id: str) -> nx.Graph:
-        """Get subgraph of news in a story"""
+        """
+        Get read-only subgraph view of news in a story
+
+        The view shares storage with news_graph (no copy) and must not be
+        mutated; use get_story_subgraph_mutable for an independent graph.
+        """
         story = self.get_story(story_id)
         if not story:
             return nx.Graph()
 
-        return self.news_graph.subgraph(story.news_ids).copy()
+        return self.news_graph.subgraph(story.news_ids)
+
+    def get_story_subgraph_mutable(self, story_id: str) -> nx.Graph:
+        """Get independent copy of a story subgraph that can be modified"""
+        return self.get_story_subgraph(story_id).copy()
 
     # --- Events ---
 
@@ -302,6 +633,19 @@ class GraphManager:
         """Add timeline event to database"""
         # Save to database
         self.db.save_event(event)
+        self._data_changed()
+
+        # Keep cached story timelines sorted (drop the old position on re-save)
+        previous = self._events_cache.get(event.id)
+        if previous and previous.story_id in self._story_event_order:
+            order = self._story_event_order[previous.story_id]
+            key = (previous.event_date, previous.id)
+            idx = bisect.bisect_left(order, key)
+            if idx < len(order) and order[idx] == key:
+                del order[idx]
+        self._events_cache[event.id] = event
+        if event.story_id in self._story_event_order:
+            bisect.insort(self._story_event_order[event.story_id], (event.event_date, event.id))
 
         # Link to story
         if event.story_id:
@@ -313,7 +657,15 @@ class GraphManager:
 
     def get_story_events(self, story_id: str) -> List[Event]:
         """Get all events for a story, sorted by date"""
-        return self.db.get_story_events(story_id)
+        order = self._story_event_order.get(story_id)
+        if order is None:
+            # DB returns events ordered by event_date
+            events = self.db.get_story_events(story_id)
+            for event in events:
+                self._events_cache[event.id] = event
+            self._story_event_order[story_id] = [(e.event_date, e.id) for e in events]
+            return events
+        return [self._events_cache[event_id] for _, event_id in order]
 
     # --- Graph Analytics ---
 
@@ -322,13 +674,44 @@ class GraphManager:
         components = list(nx.connected_components(self.news_graph))
         return [list(comp) for comp in components if len(comp) >= min_size]
 
+    def _graph_changed(self) -> None:
+        """Mark news_graph as mutated: new generation, CSR snapshot dropped"""
+        self._graph_gen += 1
+        self._csr = None
+
+    def _data_changed(self) -> None:
+        """Mark entity tables as written: property snapshots reload on next access"""
+        self._data_gen += 1
+
+    def invalidate_snapshots(self) -> None:
+        """Drop news/actors/stories/events snapshots after writing via self.db directly"""
+        self._data_changed()
+
+    def evict_actor(self, actor_id: str) -> None:
+        """Forget a cached actor (per-id cache and snapshots); the DB row is kept"""
+        self._actors_cache.pop(actor_id, None)
+        self._data_changed()
+
+    def evict_story(self, story_id: str) -> None:
+        """Forget a cached story (per-id cache and snapshots); the DB row is kept"""
+        self._stories_cache.pop(story_id, None)
+        self._data_changed()
+
     def get_node_neighbors(self, news_id: str, depth: int = 1) -> List[str]:
         """Get neighbors of a news node up to depth"""
         if news_id not in self.news_graph:
             return []
+        return list(self._neighbors_cached(self._graph_gen, news_id, depth))
+
+    def _compute_node_neighbors(self, generation: int, news_id: str, depth: int) -> Tuple[str, ...]:
+        """Uncached neighbor lookup (generation is only part of the cache key)"""
+        if graph_kernels.NUMBA_AVAILABLE:
+            indptr, indices, _, row_of, node_of = self._get_csr()
+            rows = graph_kernels.bfs_within_depth(indptr, indices, row_of[news_id], depth)
+            return tuple(node_of[r] for r in rows.tolist())
 
         if depth == 1:
-            return list(self.news_graph.neighbors(news_id))
+            return tuple(self.news_graph.neighbors(news_id))
 
         # BFS for multiple depths
         visited = {news_id}
@@ -344,62 +727,79 @@ class GraphManager:
             current_level = next_level
 
         visited.remove(news_id)
-        return list(visited)
+        return tuple(visited)
 
     def calculate_cluster_cohesion(self, news_ids: List[str]) -> float:
         """Calculate cohesion score for a cluster of news"""
         if len(news_ids) < 2:
             return 1.0
+        return self._cohesion_cached(self._graph_gen, frozenset(news_ids))
+
+    def _compute_cluster_cohesion(self, generation: int, news_ids: FrozenSet[str]) -> float:
+        """Uncached cohesion (generation is only part of the cache key)"""
+        if graph_kernels.NUMBA_AVAILABLE:
+            indptr, indices, weights, row_of, _ = self._get_csr()
+            rows = np.unique(np.fromiter(
+                (row_of[nid] for nid in news_ids if nid in row_of), dtype=np.int32
+            ))
+            return float(graph_kernels.mean_internal_weight(indptr, indices, weights, rows))
 
         subgraph = self.news_graph.subgraph(news_ids)
-        edges = subgraph.edges(data=True)
+        num_edges = subgraph.number_of_edges()
 
-        if len(edges) == 0:
+        if num_edges == 0:
             return 0.0
 
         # Average edge weight
-        weights = [data.get('weight', 1.0) for _, _, data in edges]
-        return float(np.mean(weights))
+        weights = np.fromiter(
+            (w for _, _, w in subgraph.edges(data='weight', default=1.0)),
+            dtype=np.float64, count=num_edges
+        )
+        return float(weights.mean())
+
+    def _get_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, int], List[str]]:
+        """Build (or reuse) CSR arrays of news_graph for the traversal kernels"""
+        if self._csr is None:
+            node_of = list(self.news_graph.nodes)
+            row_of = {node: row for row, node in enumerate(node_of)}
+            adjacency = nx.to_scipy_sparse_array(
+                self.news_graph, nodelist=node_of, weight='weight', dtype=np.float64, format='csr'
+            )
+            self._csr = (
+                adjacency.indptr.astype(np.int32),
+                adjacency.indices.astype(np.int32),
+                adjacency.data,
+                row_of,
+                node_of
+            )
+        return self._csr
 
     # --- Utilities ---
 
     def get_graph_stats(self) -> Dict:
         """Get overall graph statistics"""
-        all_news = self.db.get_all_news()
-        all_actors = self.db.get_all_actors()
-        all_stories = self.db.get_all_stories(active_only=False)
-        
-        # Count events (approximate, could be optimized)
-        with self.db.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) FROM events")
-                events_count = cur.fetchone()[0]
+        counts = self.db.get_entity_counts()
         
         return {
-            "news_count": len(all_news),
-            "actors_count": len(all_actors),
-            "stories_count": len(all_stories),
-            "events_count": events_count,
+            "news_count": counts["news"],
+            "actors_count": counts["actors"],
+            "stories_count": counts["stories"],
+            "events_count": counts["events"],
             "news_edges": self.news_graph.number_of_edges(),
             "actor_edges": self.actors_graph.number_of_edges(),
-            "mention_edges": self.mentions_graph.number_of_edges(),
-            "news_components": nx.number_connected_components(self.news_graph)
+            "mention_edges": self._mention_count,
+            "news_components": self._num_components
         }
 
     def update_editorial_edge(self, source_id: str, target_id: str, weight: float) -> None:
         """Update edge weight (editorial action)"""
         if self.news_graph.has_edge(source_id, target_id):
             self.news_graph[source_id][target_id]['weight'] = weight
+            self._graph_changed()
             self.news_graph[source_id][target_id]['is_editorial'] = True
             
             # Update in database
-            with self.db.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        UPDATE news_relations
-                        SET weight = %s, is_editorial = TRUE
-                        WHERE source_news_id = %s AND target_news_id = %s
-                    """, (weight, source_id, target_id))
+            self.db.update_news_relation_editorial(source_id, target_id, weight)
         else:
             # Create new editorial edge
             relation = NewsRelation(
@@ -413,16 +813,45 @@ class GraphManager:
             self.add_news_relation(relation)
             
             # Save to database
-            with self.db.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        INSERT INTO news_relations (source_news_id, target_news_id, similarity, weight, is_editorial, created_at)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (source_news_id, target_news_id) DO UPDATE SET
-                            weight = EXCLUDED.weight,
-                            is_editorial = EXCLUDED.is_editorial
-                    """, (relation.source_news_id, relation.target_news_id, relation.similarity,
-                          relation.weight, relation.is_editorial, relation.created_at))
+            self.db.upsert_news_relation(relation)
+    
+    def bulk_update_editorial(self, edges: List[Tuple[str, str, float]]) -> None:
+        """
+        Apply many editorial weight changes (source_id, target_id, weight)
+        
+        Same effect as update_editorial_edge per edge, persisted with one
+        COPY-based upsert. Edges between unknown news are skipped.
+        """
+        known = self.get_news_bulk(list({nid for s, t, _ in edges for nid in (s, t)}))
+        now = datetime.utcnow()
+        # Keyed by row so a repeated edge keeps its last weight (one upsert per row)
+        relations: Dict[Tuple[str, str], NewsRelation] = {}
+        for source_id, target_id, weight in edges:
+            if source_id not in known or target_id not in known:
+                continue
+            if self.news_graph.has_edge(source_id, target_id):
+                data = self.news_graph[source_id][target_id]
+                data['weight'] = weight
+                data['is_editorial'] = True
+                similarity = data.get('similarity', weight)
+            else:
+                self.news_graph.add_edge(
+                    source_id, target_id, similarity=weight, weight=weight, is_editorial=True
+                )
+                self._uf_union(source_id, target_id)
+                similarity = weight
+            relations[(source_id, target_id)] = NewsRelation(
+                source_news_id=source_id,
+                target_news_id=target_id,
+                similarity=similarity,
+                weight=weight,
+                is_editorial=True,
+                created_at=now
+            )
+        
+        if relations:
+            self._graph_changed()
+            self.db.upsert_news_relations_copy(list(relations.values()))
     
     # --- Helper methods for getting entities ---
     
@@ -435,6 +864,22 @@ class GraphManager:
             self._news_cache[news_id] = news
         return news
     
+    def get_news_bulk(self, news_ids: List[str]) -> Dict[str, News]:
+        """Get several news by ID, loading cache misses in one DB call"""
+        found: Dict[str, News] = {}
+        missing = []
+        for nid in news_ids:
+            if nid in self._news_cache:
+                found[nid] = self._news_cache[nid]
+            else:
+                missing.append(nid)
+        if missing:
+            # Return what was fetched even if the LRU evicts part of it
+            loaded = self.db.get_news_bulk(missing)
+            self._news_cache.update(loaded)
+            found.update(loaded)
+        return {nid: found[nid] for nid in news_ids if nid in found}
+    
     def get_actor(self, actor_id: str) -> Optional[Actor]:
         """Get actor by ID (with cache)"""
         if actor_id in self._actors_cache:
@@ -453,35 +898,34 @@ class GraphManager:
             self._stories_cache[story_id] = story
         return story
     
+    def _snapshot(self, name: str, load) -> MutableMapping:
+        """Return a copying view of the cached {id: entity} map, reloading it if stale"""
+        cached = self._snapshots.get(name)
+        if cached is None or cached[0] != self._data_gen:
+            cached = (self._data_gen, load())
+            self._snapshots[name] = cached
+        # Callers may mutate the returned mapping (clear()) or the entities in
+        # it; neither must reach the shared snapshot
+        return _EntitySnapshot(cached[1])
+
     @property
-    def news(self) -> Dict[str, News]:
+    def news(self) -> MutableMapping[str, News]:
         """Get all news (for backward compatibility)"""
-        all_news = self.db.get_all_news()
-        return {n.id: n for n in all_news}
+        return self._snapshot("news", lambda: {n.id: n for n in self.db.get_all_news()})
     
     @property
-    def actors(self) -> Dict[str, Actor]:
+    def actors(self) -> MutableMapping[str, Actor]:
         """Get all actors (for backward compatibility)"""
-        all_actors = self.db.get_all_actors()
-        return {a.id: a for a in all_actors}
+        return self._snapshot("actors", lambda: {a.id: a for a in self.db.get_all_actors()})
     
     @property
-    def stories(self) -> Dict[str, Story]:
+    def stories(self) -> MutableMapping[str, Story]:
         """Get all stories (for backward compatibility)"""
-        all_stories = self.db.get_all_stories(active_only=False)
-        return {s.id: s for s in all_stories}
+        return self._snapshot(
+            "stories", lambda: {s.id: s for s in self.db.get_all_stories(active_only=False)}
+        )
     
     @property
-    def events(self) -> Dict[str, Event]:
+    def events(self) -> MutableMapping[str, Event]:
         """Get all events (for backward compatibility)"""
-        # This is less efficient, but needed for compatibility
-        # Could be optimized with a get_all_events method
-        from psycopg2.extras import RealDictCursor
-        result = {}
-        with self.db.get_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("SELECT * FROM events")
-                for row in cur.fetchall():
-                    event = self.db._row_to_event(row)
-                    result[event.id] = event
-        return result
+        return self._snapshot("events", lambda: {e.id: e for e in self.db.get_all_events()})
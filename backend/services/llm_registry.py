@@ -1,14 +1,21 @@
 import importlib
 import json
 import os
-from dataclasses import dataclass, asdict
+import time
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from backend.services.llm_service import LLMService
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class LLMProfile:
     id: str
     label: str
@@ -19,16 +26,26 @@ class LLMProfile:
     top_k: int = 40
     max_tokens: int = 1024
     timeout: int = 15
+    # LLMService kwargs, built once (profiles are immutable)
+    _params: Dict[str, Any] = field(init=False, repr=False, compare=False)
 
-    def to_params(self) -> Dict[str, Any]:
-        return {
+    def __post_init__(self):
+        object.__setattr__(self, "_params", {
             "model_name": self.model,
             "temperature": self.temperature,
             "top_p": self.top_p,
             "top_k": self.top_k,
             "max_tokens": self.max_tokens,
             "timeout": self.timeout,
-        }
+        })
+
+    def to_params(self) -> Dict[str, Any]:
+        """LLMService kwargs (shared dict, do not mutate)"""
+        return self._params
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Profile fields as in the JSON config"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
 
 
 @dataclass
@@ -44,15 +61,28 @@ class ServiceConfig:
 class ServiceRegistry:
     """
     Реестр LLM-сервисов, читаемый из JSON-конфига.
-    Поддерживает хот-релоад через проверку mtime.
+    Поддерживает хот-релоад через проверку (mtime, size) файла.
     """
 
-    def __init__(self, config_path: str = "config/llm_services.json", auto_reload: bool = True):
+    def __init__(
+        self,
+        config_path: str = "config/llm_services.json",
+        auto_reload: bool = True,
+        reload_check_interval: float = 0.5,
+    ):
+        """
+        Args:
+            config_path: Путь к JSON-конфигу
+            auto_reload: Перечитывать конфиг при изменении файла
+            reload_check_interval: Минимальный интервал (сек) между stat() файла
+        """
         self.config_path = Path(config_path)
         self.auto_reload = auto_reload
+        self._check_interval_ns = int(reload_check_interval * 1_000_000_000)
+        self._last_check_ns = 0
         self._services: Dict[str, ServiceConfig] = {}
         self._profiles: Dict[str, LLMProfile] = {}
-        self._mtime: Optional[float] = None
+        self._last_stat: Optional[Tuple[float, int]] = None
         self._raw_config: Dict[str, Any] = {}
         self.reload()
 
@@ -63,7 +93,7 @@ class ServiceRegistry:
         self._raw_config = data
         self._load_profiles(data.get("profiles", []))
         self._load_services(data.get("services", []))
-        self._mtime = self._current_mtime()
+        self._last_stat = self._current_stat()
 
     def list_services(self) -> List[ServiceConfig]:
         self._maybe_reload()
@@ -136,15 +166,20 @@ class ServiceRegistry:
     def _maybe_reload(self):
         if not self.auto_reload:
             return
-        current = self._current_mtime()
-        if self._mtime is None or (current and current > self._mtime):
+        # Debounce: at most one stat() per check interval
+        now = time.monotonic_ns()
+        if now - self._last_check_ns < self._check_interval_ns:
+            return
+        self._last_check_ns = now
+        # Unchanged (mtime, size): keep the parsed config, no re-read
+        current = self._current_stat()
+        if self._last_stat is None or (current and current != self._last_stat):
             self.reload()
 
     def _read_config(self) -> Dict[str, Any]:
         if not self.config_path.exists():
             raise FileNotFoundError(f"Config not found: {self.config_path}")
-        with self.config_path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return _loads(self.config_path.read_bytes())
 
     def _load_profiles(self, items: List[Dict[str, Any]]):
         self._profiles = {}
@@ -166,10 +201,12 @@ class ServiceRegistry:
             )
             self._services[cfg.id] = cfg
 
-    def _current_mtime(self) -> Optional[float]:
-        if not self.config_path.exists():
+    def _current_stat(self) -> Optional[Tuple[float, int]]:
+        try:
+            st = self.config_path.stat()
+        except FileNotFoundError:
             return None
-        return self.config_path.stat().st_mtime
+        return st.st_mtime, st.st_size
 
     def _split_impl(self, impl: str) -> Tuple[str, str]:
         if ":" not in impl:
@@ -182,7 +219,7 @@ class ServiceRegistry:
         Persist current profiles/services to JSON (human-readable).
         """
         data = {
-            "profiles": [asdict(p) for p in self._profiles.values()],
+            "profiles": [p.to_dict() for p in self._profiles.values()],
             "services": [
                 {
                     "id": s.id,
@@ -198,5 +235,5 @@ class ServiceRegistry:
         with self.config_path.open("w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
         self._raw_config = data
-        self._mtime = self._current_mtime()
+        self._last_stat = self._current_stat()
 
@@ -1,25 +1,206 @@
 """
-LLM service for Gemini with mock fallback and simple file cache.
+LLM service for Gemini with mock fallback and a SQLite response cache.
 """
+import asyncio
+import functools
 import hashlib
 import json
 import logging
 import os
+import re
+import sqlite3
+import threading
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-import google.generativeai as genai
+from backend.utils.lru_cache import LRUCache
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Structured output: Gemini constrains the reply to this JSON shape
+ACTOR_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "type": {
+            "type": "string",
+            "format": "enum",
+            "enum": ["politician", "person", "company", "country", "government", "int_org", "organization"],
+        },
+        "confidence": {"type": "number"},
+    },
+    "required": ["name", "type"],
+}
+ACTORS_SCHEMA = {"type": "array", "items": ACTOR_SCHEMA}
+ACTORS_BATCH_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {"doc_id": {"type": "integer"}, "actors": ACTORS_SCHEMA},
+        "required": ["doc_id", "actors"],
+    },
+}
+
+# Generation overrides for the actor extraction prompt (part of its cache key)
+ACTORS_PARAMS = {
+    "temperature": 0.2,
+    "max_output_tokens": 2048,
+    "response_mime_type": "application/json",
+    "response_schema": ACTORS_SCHEMA,
+}
+
+# Documents packed into one prompt by extract_actors_batch
+ACTORS_BATCH_SIZE = int(os.getenv("LLM_ACTORS_BATCH_SIZE", "8"))
+
+# Parallel requests issued by run_batch
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+
+# Responses kept in process memory in front of the SQLite cache
+MEM_CACHE_SIZE = 512
+
+# Actor types accepted as-is from the LLM
+_ALLOWED_TYPES = frozenset({
+    "person", "company", "country", "organization",
+    "government", "politician", "int_org",
+    "structure", "event"
+})
+
+# Other type labels the LLM returns, mapped to allowed types
+_TYPE_SYNONYMS = {
+    "human": "person", "man": "person", "woman": "person", "individual": "person",
+
+    # Politician mapping
+    "president": "politician", "prime minister": "politician",
+    "minister": "politician", "deputy": "politician",
+    "official": "politician", "leader": "politician",
+    "ambassador": "politician", "diplomat": "politician",
+    "senator": "politician", "governor": "politician",
+
+    # Government mapping
+    "ministry": "government", "department": "government",
+    "council": "government", "parliament": "government",
+    "court": "government", "administration": "government",
+    "white house": "government", "kremlin": "government",
+
+    # Int Org mapping
+    "alliance": "int_org", "union": "int_org",
+
+    "firm": "company", "corporation": "company", "business": "company", "enterprise": "company",
+    "nation": "country",
+    "agency": "organization", "association": "organization", "group": "organization", "party": "organization"
+}
+
+# Short/local country names -> canonical actor names
+_COUNTRY_MAP = {
+    "us": "United States",
+    "usa": "United States",
+    "u.s.": "United States",
+    "u.s.a.": "United States",
+    "america": "United States",
+    "uk": "United Kingdom",
+    "u.k.": "United Kingdom",
+    "eu": "European Union",
+    "nato": "NATO",
+    "who": "World Health Organization",
+    "un": "United Nations",
+    "оон": "United Nations",
+    "россия": "Russia",
+    "рф": "Russia",
+    "китай": "China",
+    "prc": "China",
+    "украина": "Ukraine"
+}
+
+# Per-process memo size for the name helpers below (names recur across articles)
+NAME_CACHE_SIZE = 4096
+
+# Substrings that make an "organization" look like a country / company
+_COUNTRY_INDICATORS = ("united states", "russia", "china", "ukraine", "france", "germany",
+                       "japan", "korea", "india", "brazil", "mexico", "canada", "australia")
+_COMPANY_INDICATORS = ("inc", "corp", "ltd", "llc", "company", "technologies", "systems")
+
+# One alternation per list: a single scan of the name instead of one
+# substring search per indicator (plain substrings, no word boundaries)
+_COUNTRY_RE = re.compile("|".join(map(re.escape, _COUNTRY_INDICATORS)))
+_COMPANY_RE = re.compile("|".join(map(re.escape, _COMPANY_INDICATORS)))
+
+# A reply wrapped in one ```lang ... ``` fence; group 1 is the body.
+# Greedy on purpose: a lazy body retries the closing anchor at every character.
+_FENCE_RE = re.compile(r"^\s*```[^\n]*\n(.*)```\s*$", re.DOTALL)
+
+
+def _iter_array_objects(chunks: Iterable[str]) -> Iterator[Any]:
+    """
+    Yield each {...} element of a streamed top-level JSON array once it closes
+
+    Text before the array (e.g. a ```json fence) and after it is ignored;
+    elements that fail to parse are skipped.
+    """
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+    buf = ""
+    pos = 0
+    depth = 0  # 1 inside the outer array, 2 inside an element, ...
+    start = -1
+    in_string = escape = done = False
+    for chunk in chunks:
+        if done:
+            continue  # keep draining so the producer can finish (and cache)
+        buf += chunk
+        while pos < len(buf) and not done:
+            ch = buf[pos]
+            if depth == 0:
+                if ch == "[":
+                    depth = 1
+            elif in_string:
+                if escape:
+                    escape = False
+                elif ch == "\\":
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch in "[{":
+                depth += 1
+                if depth == 2 and ch == "{":
+                    start = pos
+            elif ch in "]}":
+                depth -= 1
+                if depth == 1 and start >= 0:
+                    try:
+                        yield loads(buf[start:pos + 1])
+                    except ValueError:
+                        pass
+                    start = -1
+                elif depth == 0:
+                    done = True
+            pos += 1
+        if start < 0:
+            buf, pos = buf[pos:], 0
+
 
 class LLMService:
     """
     Gemini facade with:
     - model selection
     - basic params (temp/top_p/top_k/max_tokens/timeout)
-    - file cache
+    - response cache (in-memory LRU over SQLite in WAL mode, keyed by prompt hash)
     - mock fallback if no API key
     """
 
@@ -46,14 +227,50 @@ class LLMService:
         self.timeout = int(os.getenv("GEMINI_TIMEOUT", timeout or 15))
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._cache_lock = threading.Lock()
+        self._mem_cache: LRUCache = LRUCache(MEM_CACHE_SIZE)
+        # Keys of pre-SQLite {key}.json entries, listed once so misses never stat the disk
+        self._legacy_keys = {path.stem for path in self.cache_dir.glob("*.json")}
+        self._db = sqlite3.connect(
+            str(self.cache_dir / "cache.sqlite"), check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, text BLOB, created_at INT)"
+        )
 
         self.use_mock = use_mock or not self.api_key
         self.client = None
-        self.last_raw: Optional[str] = None
+        self._genai = None
+        self._model_clients: Dict[str, Any] = {}
+        self._clients_lock = threading.Lock()
+        self._last_raw_text: Optional[str] = None
+        self._last_error: Optional[Exception] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
         if not self.use_mock:
+            # Imported lazily: the SDK (gRPC, protobuf) is heavy and unused in mock mode
+            import google.generativeai as genai
             genai.configure(api_key=self.api_key)
+            self._genai = genai
             self.client = genai.GenerativeModel(self.model_name)
 
+    @property
+    def last_raw(self) -> Optional[str]:
+        """Raw text of the last LLM reply, or the last error with its traceback"""
+        if self._last_error is not None:
+            e = self._last_error
+            tb = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+            self._last_raw_text = f"LLM error: {e}\n{tb}"
+            self._last_error = None
+        return self._last_raw_text
+
+    @last_raw.setter
+    def last_raw(self, value: Optional[str]):
+        self._last_error = None
+        self._last_raw_text = value
+
     # --- High-level tasks ---
     def summarize(self, title: str, text: str) -> str:
         prompt = f"Summarize concisely:\nTitle: {title}\nText: {text}"
@@ -61,6 +278,12 @@ class LLMService:
             return f"{title} — summarized (mock)."
         return self._run(prompt)
 
+    async def summarize_async(self, title: str, text: str) -> str:
+        prompt = f"Summarize concisely:\nTitle: {title}\nText: {text}"
+        if self.use_mock:
+            return f"{title} — summarized (mock)."
+        return await self._run_async(prompt)
+
     def make_bullets(self, title: str, text: str, max_points: int = 4) -> List[str]:
         prompt = f"Create up to {max_points} concise bullets for the story:\nTitle: {title}\nText: {text}"
         if self.use_mock:
@@ -68,12 +291,19 @@ class LLMService:
         resp = self._run(prompt)
         return self._split_lines(resp, max_points)
 
+    async def make_bullets_async(self, title: str, text: str, max_points: int = 4) -> List[str]:
+        prompt = f"Create up to {max_points} concise bullets for the story:\nTitle: {title}\nText: {text}"
+        if self.use_mock:
+            return [f"Key point {i+1} about {title} (mock)" for i in range(max_points)]
+        resp = await self._run_async(prompt)
+        return self._split_lines(resp, max_points)
+
     def extract_domains(self, text: str) -> List[str]:
         prompt = "Identify 1-3 domains/categories relevant to the text. Return as comma-separated short ids.\n" + text
         if self.use_mock:
             return ["domain_misc"]
         resp = self._run(prompt)
-        return [d.strip() for d in resp.split(",") if d.strip()]
+        return [d for part in resp.split(",") if (d := part.strip())]
 
     def extract_events(self, text: str) -> List[Dict]:
         prompt = (
@@ -87,17 +317,14 @@ class LLMService:
                 "description": text[:120] + "...",
             }]
         resp = self._run(f"{prompt}\n{text}")
-        events = []
-        for line in resp.splitlines():
-            line = line.strip("-• ").strip()
-            if not line:
-                continue
-            events.append({
+        return [
+            {
                 "event_type": "fact",
                 "title": line[:80],
                 "description": line
-            })
-        return events
+            }
+            for line in self._bullet_lines(resp)
+        ]
 
     def extract_actors(self, text: str) -> List[Dict]:
         if self.use_mock:
@@ -106,51 +333,120 @@ class LLMService:
                 {"name": "John Doe", "type": "person", "confidence": 0.76},
             ]
 
-        def _map_type(t: Optional[str]) -> str:
-            allowed = {
-                "person", "company", "country", "organization", 
-                "government", "politician", "int_org", 
-                "structure", "event"
-            }
-            # Synonyms mapping
-            synonyms = {
-                "human": "person", "man": "person", "woman": "person", "individual": "person", 
-                
-                # Politician mapping
-                "president": "politician", "prime minister": "politician", 
-                "minister": "politician", "deputy": "politician",
-                "official": "politician", "leader": "politician", 
-                "ambassador": "politician", "diplomat": "politician",
-                "senator": "politician", "governor": "politician",
-
-                # Government mapping
-                "ministry": "government", "department": "government", 
-                "council": "government", "parliament": "government",
-                "court": "government", "administration": "government",
-                "white house": "government", "kremlin": "government",
-
-                # Int Org mapping
-                "alliance": "int_org", "union": "int_org",
-
-                "firm": "company", "corporation": "company", "business": "company", "enterprise": "company",
-                "nation": "country", 
-                "agency": "organization", "association": "organization", "group": "organization", "party": "organization"
-            }
-            
-            if not t:
-                return "organization"
-            t_low = str(t).lower().strip()
-            
-            if t_low in allowed:
-                return t_low
-            
-            if t_low in synonyms:
-                return synonyms[t_low]
-                
-            # heuristic: map 'other' and unknown to organization
-            return "organization"
+        # response_schema makes Gemini return a well-formed array on the first
+        # call, so there are no re-ask prompts for fenced/malformed output
+        raw = self._run(self._actors_prompt(text), **ACTORS_PARAMS)
+        self.last_raw = raw
 
-        prompt = (
+        data = self._parse_json_array(raw)
+        if not isinstance(data, list):
+            data = []
+
+        return self._normalize_actors(data)
+
+    def extract_actors_stream(self, text: str) -> Iterator[Dict]:
+        """
+        extract_actors yielding each actor as soon as its JSON object closes
+
+        The reply is streamed and parsed incrementally; the full text is
+        cached at the end under the same key as extract_actors.
+        """
+        if self.use_mock:
+            yield from self.extract_actors(text)
+            return
+
+        seen_names = set()
+        for item in _iter_array_objects(self._run_stream(self._actors_prompt(text), **ACTORS_PARAMS)):
+            actor = self._normalize_actor_item(item, seen_names)
+            if actor is not None:
+                yield actor
+
+    def extract_actors_batch(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[Dict]]:
+        """
+        extract_actors for many documents with one request per batch_size docs
+
+        Results are cached under each document's single-prompt key, so cached
+        documents are served without a request and later extract_actors calls
+        hit the cache too. Documents missing from a parsed batch response fall
+        back to extract_actors.
+        """
+        if self.use_mock:
+            return [self.extract_actors(text) for text in texts]
+
+        batch_size = max(1, batch_size or ACTORS_BATCH_SIZE)
+        results: List[Optional[List[Dict]]] = [None] * len(texts)
+        params = {**self.params, **ACTORS_PARAMS}
+        prompts = [self._actors_prompt(text) for text in texts]
+        keys = self._cache_keys(prompts, self.model_name, params)
+
+        misses = []
+        for i, key in enumerate(keys):
+            if self._cache_lookup(prompts[i], self.model_name, params, key):
+                results[i] = self.extract_actors(texts[i])
+            else:
+                misses.append(i)
+
+        for start in range(0, len(misses), batch_size):
+            chunk = misses[start:start + batch_size]
+            if len(chunk) == 1:
+                continue  # the single prompt is cheaper and is cached under its own key
+            raw = self._run(
+                self._actors_batch_prompt([texts[i] for i in chunk]),
+                temperature=ACTORS_PARAMS["temperature"],
+                max_output_tokens=ACTORS_PARAMS["max_output_tokens"] * len(chunk),
+                response_mime_type="application/json",
+                response_schema=ACTORS_BATCH_SCHEMA,
+            )
+            self.last_raw = raw
+            data = self._parse_json_array(raw)
+            if not isinstance(data, list):
+                continue
+            for entry in data:
+                if not isinstance(entry, dict) or not isinstance(entry.get("actors"), list):
+                    continue
+                try:
+                    doc_id = int(entry.get("doc_id"))
+                except (TypeError, ValueError):
+                    continue
+                if not 0 <= doc_id < len(chunk) or not entry["actors"]:
+                    continue
+                i = chunk[doc_id]
+                results[i] = self._normalize_actors(entry["actors"])
+                self._cache_set(keys[i], self._dumps(entry["actors"]))
+
+        for i, actors in enumerate(results):
+            if actors is None:
+                results[i] = self.extract_actors(texts[i])
+        return results
+
+    def run_batch(self, prompts: List[str], max_concurrency: Optional[int] = None, **overrides) -> List[str]:
+        """
+        _run over independent prompts, returned in input order
+
+        Cache hits are answered inline; misses are sent in parallel (at most
+        max_concurrency requests in flight) instead of one after another.
+        """
+        params = {**self.params, **{k: v for k, v in overrides.items() if v is not None}}
+        keys = self._cache_keys(prompts, self.model_name, params)
+        results = [
+            self._cache_lookup(prompt, self.model_name, params, key)
+            for prompt, key in zip(prompts, keys)
+        ]
+        misses = [i for i, text in enumerate(results) if not text]
+
+        if len(misses) > 1:
+            workers = min(len(misses), max_concurrency or LLM_MAX_CONCURRENCY)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for i, text in zip(misses, pool.map(lambda i: self._run(prompts[i], **overrides), misses)):
+                    results[i] = text
+        else:
+            for i in misses:
+                results[i] = self._run(prompts[i], **overrides)
+        return results
+
+    def _actors_prompt(self, text: str) -> str:
+        """Single-document actor extraction prompt (its hash is the per-item cache key)"""
+        return (
             "Extract ALL named entities (actors) from the text. Classify them into these types:\n"
             "- politician: government officials, presidents, ministers, diplomats (e.g., 'Vladimir Putin', 'Joe Biden')\n"
             "- person: other individuals (non-political)\n"
@@ -175,131 +471,157 @@ class LLMService:
             "{\"name\": \"United States\", \"type\": \"country\", \"confidence\": 0.9}]\n\n"
             f"Text:\n{text}"
         )
-        raw = self._run(prompt, **{"temperature": 0.2, "max_output_tokens": 2048})
-        self.last_raw = raw
-        
-        # Проверка на пустой ответ
-        if not raw or raw.strip() == "[empty response]" or len(raw.strip()) < 10:
-            # Повторная попытка с упрощенным промптом
-            simple_prompt = (
-                "Extract named entities from the text. Return JSON array: "
-                "[{\"name\": string, \"type\": \"politician|person|company|country|organization\", \"confidence\": 0.9}]. "
-                "Extract persons, politicians, companies, countries, organizations mentioned in the text.\n"
-                f"Text:\n{text}"
-            )
-            raw = self._run(simple_prompt, **{"temperature": 0.2, "max_output_tokens": 2048})  # Более детерминированный режим
-            self.last_raw = raw
-        
-        data = self._parse_json_array(raw)
-        if not isinstance(data, list) or not data:
-            # Частый кейс: ответ обрезан/невалидный JSON. Повторяем коротким промптом.
-            simple_prompt = (
-                "Extract named entities from the text. Return JSON array ONLY (no markdown fences): "
-                "[{\"name\": string, \"type\": \"politician|person|company|country|organization\", \"confidence\": 0.9}].\n"
-                f"Text:\n{text}"
-            )
-            raw = self._run(simple_prompt, **{"temperature": 0.1, "max_output_tokens": 2048})
-            self.last_raw = raw
-            data = self._parse_json_array(raw)
-            if not isinstance(data, list):
-                data = []
 
-        normalized = []
+    def _actors_batch_prompt(self, texts: List[str]) -> str:
+        docs = "\n\n".join(f"<<<DOC {i}>>>\n{text}" for i, text in enumerate(texts))
+        return (
+            "Extract ALL named entities (actors) from EACH document below, using the same rules for every document.\n"
+            "Types: politician (government officials, presidents, ministers, diplomats), person (other individuals), "
+            "company (commercial entities), country (nations), government (state bodies, ministries, parliaments), "
+            "int_org (international organizations such as NATO, UN, EU), organization (other organizations, parties, NGOs).\n"
+            "- Extract indirect mentions with canonical names ('US' -> 'United States', 'Putin' -> 'Vladimir Putin')\n"
+            "- Deduplicate similar entities within a document; keep the top 8-10 most relevant actors per document\n"
+            "- confidence: 0.9+ for explicit mentions, 0.7-0.8 for indirect/implied mentions\n\n"
+            "Return a JSON array with one item per document: "
+            "[{\"doc_id\": number, \"actors\": [{\"name\": string, "
+            "\"type\": \"politician|person|company|country|government|int_org|organization\", \"confidence\": number 0-1}]}]\n"
+            "- doc_id is the number from the <<<DOC n>>> marker\n"
+            "- Output JSON ONLY. No markdown fences.\n\n"
+            f"{docs}"
+        )
+
+    def _normalize_actors(self, data: List) -> List[Dict]:
+        """Map raw LLM items to {name, type, confidence}, deduplicated"""
         seen_names = set()  # Для дедупликации
-        
+        normalized = []
         for item in data:
-            if not isinstance(item, dict):
-                continue
-            name = item.get("name")
-            if not name:
-                continue
-            
-            name = str(name).strip()
-            name_lower = name.lower()
-            
-            # Дедупликация (пропускаем если уже видели похожее имя)
-            if name_lower in seen_names:
-                continue
-            
-            # Нормализация: приводим к каноническим формам
-            normalized_name = self._normalize_actor_name(name)
-            
-            ent_type = _map_type(item.get("type"))
-            
-            # Улучшенное определение типа на основе имени
-            if ent_type == "organization" and self._looks_like_country(normalized_name):
-                ent_type = "country"
-            elif ent_type == "organization" and self._looks_like_company(normalized_name):
-                ent_type = "company"
-            
-            conf = item.get("confidence")
-            try:
-                conf_val = float(conf) if conf is not None else 0.5
-            except Exception:
-                conf_val = 0.5
-            
-            normalized.append({
-                "name": normalized_name,
-                "type": ent_type,
-                "confidence": conf_val
-            })
-            seen_names.add(name_lower)
-            seen_names.add(normalized_name.lower())
-        
+            actor = self._normalize_actor_item(item, seen_names)
+            if actor is not None:
+                normalized.append(actor)
         return normalized
-    
-    def _normalize_actor_name(self, name: str) -> str:
-        """Нормализовать имя актора к канонической форме"""
-        name = name.strip()
-        name_lower = name.lower()
+
+    def _normalize_actor_item(self, item: Any, seen_names: set) -> Optional[Dict]:
+        """One raw LLM item -> {name, type, confidence}; None if invalid or already seen"""
+        if not isinstance(item, dict):
+            return None
+        name = item.get("name")
+        if not name:
+            return None
+        
+        # Нормализация: приводим к каноническим формам
+        normalized_name = self._normalize_actor_name(str(name))
+        
+        # Дедупликация по каноническому имени ('US' и 'United States' - один актор)
+        key = normalized_name.lower()
+        if key in seen_names:
+            return None
+        seen_names.add(key)
+        
+        ent_type = self._map_type(item.get("type"))
+        
+        # Улучшенное определение типа на основе имени
+        if ent_type == "organization" and self._looks_like_country(normalized_name):
+            ent_type = "country"
+        elif ent_type == "organization" and self._looks_like_company(normalized_name):
+            ent_type = "company"
         
-        # Страны - приводим к полным названиям
-        country_map = {
-            "us": "United States",
-            "usa": "United States",
-            "u.s.": "United States",
-            "u.s.a.": "United States",
-            "america": "United States",
-            "uk": "United Kingdom",
-            "u.k.": "United Kingdom",
-            "eu": "European Union",
-            "nato": "NATO",
-            "who": "World Health Organization",
-            "un": "United Nations",
-            "оон": "United Nations",
-            "россия": "Russia",
-            "рф": "Russia",
-            "китай": "China",
-            "prc": "China",
-            "украина": "Ukraine"
+        conf = item.get("confidence")
+        try:
+            conf_val = float(conf) if conf is not None else 0.5
+        except Exception:
+            conf_val = 0.5
+        
+        return {
+            "name": normalized_name,
+            "type": ent_type,
+            "confidence": conf_val
         }
+
+    @staticmethod
+    def _map_type(t: Optional[str]) -> str:
+        if not t:
+            return "organization"
+        t_low = str(t).lower().strip()
         
-        if name_lower in country_map:
-            return country_map[name_lower]
+        if t_low in _ALLOWED_TYPES:
+            return t_low
         
-        # Сохраняем оригинальное имя, но очищаем
-        return name
+        # heuristic: map 'other' and unknown to organization
+        return _TYPE_SYNONYMS.get(t_low, "organization")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=NAME_CACHE_SIZE)
+    def _normalize_actor_name(name: str) -> str:
+        """Нормализовать имя актора к канонической форме"""
+        name = name.strip()
+        # Страны - приводим к полным названиям; иначе сохраняем очищенное имя
+        return _COUNTRY_MAP.get(name.lower(), name)
     
-    def _looks_like_country(self, name: str) -> bool:
+    @staticmethod
+    @functools.lru_cache(maxsize=NAME_CACHE_SIZE)
+    def _looks_like_country(name: str) -> bool:
         """Эвристика: похоже ли имя на страну"""
-        country_indicators = ["united states", "russia", "china", "ukraine", "france", "germany", 
-                            "japan", "korea", "india", "brazil", "mexico", "canada", "australia"]
-        return any(indicator in name.lower() for indicator in country_indicators)
+        return _COUNTRY_RE.search(name.lower()) is not None
     
-    def _looks_like_company(self, name: str) -> bool:
+    @staticmethod
+    @functools.lru_cache(maxsize=NAME_CACHE_SIZE)
+    def _looks_like_company(name: str) -> bool:
         """Эвристика: похоже ли имя на компанию"""
-        company_indicators = ["inc", "corp", "ltd", "llc", "company", "technologies", "systems"]
-        name_lower = name.lower()
-        return any(indicator in name_lower for indicator in company_indicators)
+        return _COMPANY_RE.search(name.lower()) is not None
 
     # --- Internal helpers ---
+    def _cache_key(self, prompt: str, model: str, params: Dict) -> str:
+        """_hash of the canonical prompt/params, so trivially different requests share an entry"""
+        return self._hash(self._canon_prompt(prompt), model, self._canon_params(params))
+
+    def _cache_keys(self, prompts: List[str], model: str, params: Dict) -> List[str]:
+        """_cache_key for many prompts sharing model/params"""
+        return self._hash_many([self._canon_prompt(p) for p in prompts], model, self._canon_params(params))
+
+    @staticmethod
+    def _canon_prompt(prompt: str) -> str:
+        # Whitespace runs collapse to one space; ends are trimmed
+        return " ".join(prompt.split())
+
+    @staticmethod
+    def _canon_params(params: Dict) -> Dict:
+        # Floats rounded to 3 decimals; None values dropped
+        return {
+            k: round(v, 3) if isinstance(v, float) else v
+            for k, v in params.items() if v is not None
+        }
+
     def _hash(self, prompt: str, model: str, params: Dict) -> str:
+        """Cache key: "blake3:<hex>" when blake3 is installed, else the sha256 hex used so far"""
+        payload = self._key_payload(prompt, model, params)
+        if BLAKE3_AVAILABLE:
+            return "blake3:" + blake3(payload).hexdigest()
+        return hashlib.sha256(payload).hexdigest()
+
+    def _hash_many(self, prompts: List[str], model: str, params: Dict) -> List[str]:
+        """_hash for many prompts sharing model/params; those are serialized once"""
+        # sort_keys puts "prompt" after "model" and "params", so only the tail varies
+        head = json.dumps({"model": model, "params": params}, sort_keys=True)[:-1] + ', "prompt": '
+        digest = blake3 if BLAKE3_AVAILABLE else hashlib.sha256
+        prefix = "blake3:" if BLAKE3_AVAILABLE else ""
+        return [
+            prefix + digest(f"{head}{json.dumps(prompt)}}}".encode("utf-8")).hexdigest()
+            for prompt in prompts
+        ]
+
+    @staticmethod
+    def _key_payload(prompt: str, model: str, params: Dict) -> bytes:
+        # stdlib on purpose: keys must not depend on whether orjson is installed
         payload = json.dumps({"prompt": prompt, "model": model, "params": params}, sort_keys=True)
-        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return payload.encode("utf-8")
 
     def _strip_code_fences(self, text: str) -> str:
         if not text:
             return text
+        m = _FENCE_RE.match(text)
+        if m:
+            return m.group(1).strip()
+        # partial fences (e.g. a reply cut off before the closing ```)
         t = text.strip()
         if t.startswith("```"):
             # remove leading fence ```lang (optional)
@@ -314,6 +636,11 @@ class LLMService:
     def _parse_json_array(self, raw: str):
         cleaned = self._strip_code_fences(raw)
         for candidate in (cleaned, raw):
+            if ORJSON_AVAILABLE:
+                try:
+                    return orjson.loads(candidate)
+                except Exception:
+                    pass  # stdlib also accepts NaN/Infinity and lone surrogates
             try:
                 parsed = json.loads(candidate)
                 return parsed
@@ -321,93 +648,256 @@ class LLMService:
                 continue
         return None
 
+    @staticmethod
+    def _dumps(obj) -> str:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(obj).decode("utf-8")
+        return json.dumps(obj, ensure_ascii=False)
+
+    def _cache_lookup(self, prompt: str, model: str, params: Dict, key: str) -> Optional[str]:
+        """
+        _cache_get for a _cache_key; on a miss, keys written by earlier versions
+        (verbatim prompt/params, sha256 or blake3) are tried and copied forward
+        """
+        cached = self._cache_get(key)
+        if cached:
+            return cached
+        payload = self._key_payload(prompt, model, params)
+        legacy_keys = [hashlib.sha256(payload).hexdigest()]
+        if BLAKE3_AVAILABLE:
+            legacy_keys.insert(0, "blake3:" + blake3(payload).hexdigest())
+        for legacy_key in legacy_keys:
+            if legacy_key == key:
+                continue
+            cached = self._cache_get(legacy_key)
+            if cached:
+                self._cache_set(key, cached)
+                return cached
+        return None
+
     def _cache_get(self, key: str) -> Optional[str]:
-        path = self.cache_dir / f"{key}.json"
-        if path.exists():
+        with self._cache_lock:
+            text = self._mem_cache.get(key)
+            if text is not None:
+                return text
             try:
-                return json.loads(path.read_text()).get("text")
-            except Exception:
+                row = self._db.execute("SELECT text FROM cache WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
                 return None
-        return None
+            if row is not None:
+                text = row[0].decode("utf-8")
+                self._mem_cache[key] = text
+                return text
+        if key.startswith("blake3:"):
+            return None  # per-file caches only ever used sha256 keys
+        return self._legacy_cache_get(key)
 
-    def _cache_set(self, key: str, text: str):
+    def _legacy_cache_get(self, key: str) -> Optional[str]:
+        """Responses cached as {key}.json by earlier versions; imported on first hit"""
+        if key not in self._legacy_keys:
+            return None
         path = self.cache_dir / f"{key}.json"
         try:
-            path.write_text(json.dumps({"text": text}, ensure_ascii=False))
+            data = path.read_bytes()
+            text = (orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)).get("text")
         except Exception:
-            pass
+            return None
+        if text:
+            self._cache_set(key, text)
+            self._legacy_keys.discard(key)
+        return text
 
-    def _run(self, prompt: str, model: Optional[str] = None, **overrides) -> str:
+    def _cache_set(self, key: str, text: str):
+        with self._cache_lock:
+            self._mem_cache[key] = text
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, text, created_at) VALUES (?, ?, ?)",
+                    (key, text.encode("utf-8"), int(time.time())),
+                )
+            except sqlite3.Error:
+                pass
+
+    def cache_clear(self):
+        """Drop every cached response (including legacy per-file entries)"""
+        with self._cache_lock:
+            self._mem_cache.clear()
+            self._legacy_keys.clear()
+            self._db.execute("DELETE FROM cache")
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                path.unlink()
+            except Exception:
+                continue
+
+    def _prepare_run(self, prompt: str, model: Optional[str], overrides: Dict):
         mdl = model or self.model_name
         params = self.params.copy()
         params.update({k: v for k, v in overrides.items() if v is not None})
+        return mdl, params, self._cache_key(prompt, mdl, params)
+
+    def _mock_run(self, prompt: str, cache_key: str) -> str:
+        print(f"DEBUG: LLM _run using mock. use_mock={self.use_mock}, client={self.client}, api_key_len={len(str(self.api_key)) if self.api_key else 0}")
+        text = f"[mock response] {prompt[:80]}..."
+        self._cache_set(cache_key, text)
+        self.last_raw = text
+        return text
 
-        cache_key = self._hash(prompt, mdl, params)
-        cached = self._cache_get(cache_key)
+    def _run(self, prompt: str, model: Optional[str] = None, **overrides) -> str:
+        mdl, params, cache_key = self._prepare_run(prompt, model, overrides)
+        cached = self._cache_lookup(prompt, mdl, params, cache_key)
         if cached:
             self.last_raw = cached
             return cached
 
         if self.use_mock or not self.client:
-            print(f"DEBUG: LLM _run using mock. use_mock={self.use_mock}, client={self.client}, api_key_len={len(str(self.api_key)) if self.api_key else 0}")
-            text = f"[mock response] {prompt[:80]}..."
-            self._cache_set(cache_key, text)
-            self.last_raw = text
-            return text
+            return self._mock_run(prompt, cache_key)
 
         try:
-            client = genai.GenerativeModel(mdl)
+            client = self._client_for(mdl)
             response = client.generate_content(
                 prompt,
                 generation_config=params,
                 request_options={"timeout": self.timeout}
             )
-            text = ""
-            try:
-                text = getattr(response, "text", None) or ""
-            except Exception:
-                text = ""
-            if not text:
-                # fallback: concatenate parts from first candidate
-                candidates = getattr(response, "candidates", None) or []
-                if candidates:
-                    parts = getattr(candidates[0], "content", None)
-                    if parts and getattr(parts, "parts", None):
-                        text = "\n".join([getattr(p, "text", "") or "" for p in parts.parts if getattr(p, "text", "")])
-            if not text:
-                text = "[empty response]"
-            self._cache_set(cache_key, text)
-            self.last_raw = text
-            return text
         except Exception as e:
-            # Проверяем на ошибку API ключа (403 - leaked/invalid key)
-            error_str = str(e).lower()
-            if "403" in error_str or "forbidden" in error_str:
-                if "leaked" in error_str or "reported" in error_str:
-                    error_msg = (
-                        "❌ ОШИБКА API КЛЮЧА: Ваш ключ Google Gemini был помечен как утечённый (leaked) и заблокирован.\n"
-                        "📝 РЕШЕНИЕ: Получите новый API ключ на https://aistudio.google.com/app/apikey\n"
-                        "   Обновите GEMINI_API_KEY в файле .env и перезапустите сервер."
-                    )
-                    print(f"\n{error_msg}\n")
-                    logger.error(error_msg)
-                    self.last_raw = error_msg
-                    raise ValueError(error_msg) from e
-                else:
-                    error_msg = (
-                        "❌ ОШИБКА API КЛЮЧА: Неверный или недействительный API ключ Google Gemini.\n"
-                        "📝 РЕШЕНИЕ: Проверьте GEMINI_API_KEY в файле .env и убедитесь, что ключ корректен."
-                    )
-                    print(f"\n{error_msg}\n")
-                    logger.error(error_msg)
-                    self.last_raw = error_msg
-                    raise ValueError(error_msg) from e
-            
-            # store error text for debug
-            self.last_raw = f"LLM error: {e}\n{traceback.format_exc()}"
-            raise
+            self._raise_llm_error(e)
+        return self._finish_run(response, cache_key)
+
+    def _run_stream(self, prompt: str, model: Optional[str] = None, **overrides) -> Iterator[str]:
+        """_run yielding text chunks as Gemini generates them; the joined text is cached at the end"""
+        mdl, params, cache_key = self._prepare_run(prompt, model, overrides)
+        cached = self._cache_lookup(prompt, mdl, params, cache_key)
+        if cached:
+            self.last_raw = cached
+            yield cached
+            return
+
+        if self.use_mock or not self.client:
+            yield self._mock_run(prompt, cache_key)
+            return
+
+        parts = []
+        try:
+            client = self._client_for(mdl)
+            response = client.generate_content(
+                prompt,
+                generation_config=params,
+                request_options={"timeout": self.timeout},
+                stream=True
+            )
+            for chunk in response:
+                try:
+                    piece = chunk.text
+                except Exception:
+                    piece = ""  # e.g. a chunk carrying only finish/safety metadata
+                if piece:
+                    parts.append(piece)
+                    yield piece
+        except Exception as e:
+            self._raise_llm_error(e)
+
+        text = "".join(parts) or "[empty response]"
+        self._cache_set(cache_key, text)
+        self.last_raw = text
+
+    async def _run_async(self, prompt: str, model: Optional[str] = None, **overrides) -> str:
+        """_run awaiting generate_content_async; at most LLM_MAX_CONCURRENCY requests in flight"""
+        mdl, params, cache_key = self._prepare_run(prompt, model, overrides)
+        cached = self._cache_lookup(prompt, mdl, params, cache_key)
+        if cached:
+            self.last_raw = cached
+            return cached
+
+        if self.use_mock or not self.client:
+            return self._mock_run(prompt, cache_key)
+
+        try:
+            async with self._async_semaphore():
+                client = self._client_for(mdl)
+                response = await client.generate_content_async(
+                    prompt,
+                    generation_config=params,
+                    request_options={"timeout": self.timeout}
+                )
+        except Exception as e:
+            self._raise_llm_error(e)
+        return self._finish_run(response, cache_key)
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        # asyncio primitives belong to one event loop; asyncio.run() makes a new one per call
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _client_for(self, model: str):
+        """self.client for the configured model; other models are built once and kept"""
+        if model == self.model_name:
+            return self.client
+        client = self._model_clients.get(model)
+        if client is None:
+            with self._clients_lock:
+                client = self._model_clients.get(model)
+                if client is None:
+                    client = self._genai.GenerativeModel(model)
+                    self._model_clients[model] = client
+        return client
+
+    def _finish_run(self, response, cache_key: str) -> str:
+        text = ""
+        try:
+            text = getattr(response, "text", None) or ""
+        except Exception:
+            text = ""
+        if not text:
+            # fallback: concatenate parts from first candidate
+            candidates = getattr(response, "candidates", None) or []
+            if candidates:
+                parts = getattr(candidates[0], "content", None)
+                if parts and getattr(parts, "parts", None):
+                    text = "\n".join([getattr(p, "text", "") or "" for p in parts.parts if getattr(p, "text", "")])
+        if not text:
+            text = "[empty response]"
+        self._cache_set(cache_key, text)
+        self.last_raw = text
+        return text
+
+    def _raise_llm_error(self, e: Exception):
+        # Проверяем на ошибку API ключа (403 - leaked/invalid key)
+        error_str = str(e).lower()
+        if "403" in error_str or "forbidden" in error_str:
+            if "leaked" in error_str or "reported" in error_str:
+                error_msg = (
+                    "❌ ОШИБКА API КЛЮЧА: Ваш ключ Google Gemini был помечен как утечённый (leaked) и заблокирован.\n"
+                    "📝 РЕШЕНИЕ: Получите новый API ключ на https://aistudio.google.com/app/apikey\n"
+                    "   Обновите GEMINI_API_KEY в файле .env и перезапустите сервер."
+                )
+                print(f"\n{error_msg}\n")
+                logger.error(error_msg)
+                self.last_raw = error_msg
+                raise ValueError(error_msg) from e
+            else:
+                error_msg = (
+                    "❌ ОШИБКА API КЛЮЧА: Неверный или недействительный API ключ Google Gemini.\n"
+                    "📝 РЕШЕНИЕ: Проверьте GEMINI_API_KEY в файле .env и убедитесь, что ключ корректен."
+                )
+                print(f"\n{error_msg}\n")
+                logger.error(error_msg)
+                self.last_raw = error_msg
+                raise ValueError(error_msg) from e
+        
+        # store the error for debug; the traceback text is built only if last_raw is read
+        self._last_error = e
+        raise
+
+    @staticmethod
+    def _bullet_lines(text: str) -> Iterator[str]:
+        """Non-empty lines with bullet markers ("-", "•") and whitespace stripped"""
+        return (s for line in text.splitlines() if (s := line.strip("-• ").strip()))
 
     def _split_lines(self, text: str, limit: int) -> List[str]:
-        lines = [l.strip("-• ").strip() for l in text.splitlines() if l.strip()]
-        return lines[:limit] or [text[:80]]
+        lines = list(islice(self._bullet_lines(text), limit))
+        return lines or [text[:80]]
 
@@ -7,11 +7,19 @@ class ActorsLLMService:
     """
     LLM-бейзлайн для извлечения акторов.
     Использует существующий LLMService.extract_actors.
+    Список в payload["texts"] (или payload["text"]) обрабатывается батчем
+    через LLMService.extract_actors_batch.
     """
 
     service_id = "actors_llm"
 
     def run(self, llm: LLMService, payload: Dict[str, Any]) -> Dict[str, Any]:
+        texts = payload.get("texts")
+        if texts is None and isinstance(payload.get("text"), list):
+            texts = payload["text"]
+        if texts is not None:
+            batch = llm.extract_actors_batch([t or "" for t in texts])
+            return {"results": [{"actors": actors} for actors in batch], "raw": getattr(llm, "last_raw", None)}
         text = payload.get("text") or ""
         actors = llm.extract_actors(text)
         return {"actors": actors, "raw": getattr(llm, "last_raw", None)}
@@ -1,3 +1,4 @@
+import asyncio
 from dataclasses import dataclass
 from typing import Any, Dict
 
@@ -15,17 +16,38 @@ class SummaryBulletsService:
     """
     Объединённый сервис саммари + буллетов.
     Предполагается регистрация через ServiceRegistry.
+    Саммари и буллеты запрашиваются параллельно (run_async).
     """
 
     service_id = "summary_bullets"
 
-    def run(self, llm: LLMService, payload: Dict[str, Any]) -> Dict[str, Any]:
-        data = SummaryBulletsInput(
+    @staticmethod
+    def _parse(payload: Dict[str, Any]) -> SummaryBulletsInput:
+        return SummaryBulletsInput(
             title=payload.get("title") or "",
             text=payload.get("text") or "",
             max_points=int(payload.get("max_points") or 4),
         )
+
+    async def run_async(self, llm: LLMService, payload: Dict[str, Any]) -> Dict[str, Any]:
+        data = self._parse(payload)
+        summary, bullets = await asyncio.gather(
+            llm.summarize_async(data.title, data.text),
+            llm.make_bullets_async(data.title, data.text, max_points=data.max_points),
+        )
+        return {"summary": summary, "bullets": bullets}
+
+    def run(self, llm: LLMService, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Синхронная обёртка: параллельно вне event loop, последовательно
+        внутри уже запущенного (asyncio.run там недоступен)
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.run_async(llm, payload))
+
+        data = self._parse(payload)
         summary = llm.summarize(data.title, data.text)
         bullets = llm.make_bullets(data.title, data.text, max_points=data.max_points)
         return {"summary": summary, "bullets": bullets}
-
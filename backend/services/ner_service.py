@@ -3,13 +3,44 @@ NER Service for actor extraction from text
 For prototype: uses simple pattern matching and keyword extraction
 Can be replaced with spaCy or other NER models
 """
-import uuid
 import re
-from typing import List, Dict, Tuple, Optional
+from secrets import token_hex
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
 
 from backend.models.entities import Actor, ActorType, ActorRelation, RelationType
 
+# Word tokens for whole-word gazetteer matching (\w covers Cyrillic too)
+TOKEN_RE = re.compile(r"\w+")
+
+# Trie key marking the end of a name; holds the canonical_map key
+_TRIE_END = ""
+
+# Capitalized words that start sentences rather than name entities
+CAPITALIZED_STOP_WORDS = frozenset({"The", "This", "That", "These", "Those", "Это", "Этот"})
+
+# Actor type heuristics (simplified)
+COMPANY_INDICATORS = ("corp", "inc", "llc", "ltd", "gmbh", "oao")
+COUNTRY_NAMES = frozenset({"russia", "ukraine", "usa", "china", "germany", "france", "россия", "украина"})
+ORG_KEYWORDS = ("organization", "committee", "agency", "ministry", "department", "организация")
+_ORG_KEYWORDS_RE = re.compile("|".join(map(re.escape, ORG_KEYWORDS)), re.IGNORECASE)
+
+
+# Letter classes for capitalized words: Latin (incl. Latin-1 accented),
+# Russian and Ukrainian
+UPPER_LETTERS = "A-ZÀ-ÖØ-ÞА-ЯЁІЇЄҐ"
+LOWER_LETTERS = "a-zß-öø-ÿа-яёіїєґ"
+
+
+@lru_cache(maxsize=None)
+def _capitalized_phrase_re(max_words: int) -> "re.Pattern":
+    """1..max_words capitalized words in a row"""
+    word = f"[{UPPER_LETTERS}][{LOWER_LETTERS}]+"
+    return re.compile(
+        r'\b' + word + r'(?:\s+' + word + r'){0,' + str(max_words - 1) + r'}\b'
+    )
+
 
 class NERService:
     """Named Entity Recognition service for extracting actors"""
@@ -21,6 +52,15 @@ class NERService:
         # Canonical names mapping
         self.canonical_map: Dict[str, str] = {}  # alias -> canonical_id
 
+        # Token trie over canonical_map keys (built lazily)
+        self._trie = None
+        self._trie_size = -1
+
+        # Lowercased name + aliases per gazetteer actor, NUL-joined (built lazily)
+        self._actor_names: Optional[Dict[str, str]] = None
+        self._actor_names_size = -1
+        self._name_tokens: Dict[str, Set[str]] = {}  # word -> actor IDs, same lifecycle
+
         # Relationship patterns (simple pattern matching)
         self.relation_patterns = {
             RelationType.MEMBER_OF: [
@@ -34,6 +74,33 @@ class NERService:
                 r"(\w+)\s+(?:supports|поддерживает|backed)\s+(\w+)",
             ],
         }
+        self._relation_re, self._relation_groups = self._compile_relation_patterns(self.relation_patterns)
+
+    @staticmethod
+    def _compile_relation_patterns(
+        relation_patterns: Dict[RelationType, List[str]]
+    ) -> Tuple[re.Pattern, Dict[str, Tuple[RelationType, int]]]:
+        """
+        One regex for all relation patterns, scanned once per text
+
+        Each pattern becomes a named alternative inside a lookahead anchored at
+        word starts, so matches of different patterns may overlap (as with one
+        finditer pass per pattern). Overlaps within one pattern must be skipped
+        by the caller. Returns the regex and, per group name, the
+        relation type and the index of the pattern's first entity group.
+        """
+        alternatives = []
+        groups: Dict[str, Tuple[RelationType, int]] = {}
+        group_index = 0
+        for relation_type, patterns in relation_patterns.items():
+            for i, pattern in enumerate(patterns):
+                name = f"{relation_type.value}_{i}"
+                group_index += 1  # the named group itself
+                groups[name] = (relation_type, group_index + 1)
+                alternatives.append(f"(?P<{name}>{pattern})")
+                group_index += re.compile(pattern).groups
+        combined = re.compile(r"(?<!\w)(?=" + "|".join(alternatives) + ")", re.IGNORECASE)
+        return combined, groups
 
     def load_gazetteer(self, actors: List[Actor]) -> None:
         """Load known actors into gazetteer"""
@@ -47,45 +114,133 @@ class NERService:
                 alias = alias_entry.get("name", "")
                 if alias:
                     self.canonical_map[alias.lower()] = actor.id
+        self._trie = None
+        self._actor_names = None
+
+    def _alias_trie(self) -> Dict:
+        """
+        Dict-of-dicts trie over the word tokens of every canonical_map key
+
+        Terminal nodes hold the name under _TRIE_END; actor IDs are read from
+        canonical_map at match time, so remapped aliases need no rebuild.
+        Alias updates insert into it in place; it is rebuilt after
+        load_gazetteer or when canonical_map is filled directly.
+        """
+        if self._trie is None or self._trie_size != len(self.canonical_map):
+            trie: Dict = {}
+            for name in self.canonical_map:
+                self._trie_insert(trie, name)
+            self._trie = trie
+            self._trie_size = len(self.canonical_map)
+        return self._trie
+
+    @staticmethod
+    def _trie_insert(trie: Dict, name: str) -> None:
+        tokens = TOKEN_RE.findall(name)
+        if not tokens:
+            return
+        node = trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_TRIE_END] = name
+
+    def _index_names(self, names: Iterable[str], map_size_before: int) -> None:
+        """Insert names just added to canonical_map into a current trie"""
+        if self._trie is None or self._trie_size != map_size_before:
+            self._trie = None
+            return
+        for name in names:
+            self._trie_insert(self._trie, name)
+        self._trie_size = len(self.canonical_map)
+
+    def _match_known_actors(self, text: str) -> List[str]:
+        """
+        IDs of gazetteer actors whose name or alias occurs in text
+
+        Names match whole words only ("in" does not match inside "ministry");
+        at each position the longest name wins and the scan resumes after it.
+        """
+        trie = self._alias_trie()
+        if not trie:
+            return []
+
+        # One lowered copy tokenizes faster and with a lower peak than
+        # lowering each token separately
+        tokens = TOKEN_RE.findall(text.lower())
+        found: Dict[str, None] = {}  # insertion-ordered set of actor IDs
+        i, n = 0, len(tokens)
+        while i < n:
+            node = trie.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+            match_name, match_end = None, i
+            j = i
+            while node is not None:
+                j += 1
+                name = node.get(_TRIE_END)
+                if name is not None:
+                    match_name, match_end = name, j
+                node = node.get(tokens[j]) if j < n else None
+            if match_name is None:
+                i += 1
+                continue
+            actor_id = self.canonical_map.get(match_name)
+            if actor_id is not None:
+                found[actor_id] = None
+            i = match_end
+        return list(found)
 
     def extract_actors_from_text(
         self,
         text: str,
-        context: Optional[Dict] = None
+        context: Optional[Dict] = None,
+        emit_new: bool = True
     ) -> Tuple[List[str], List[Actor]]:
         """
         Extract actors from text
 
+        Args:
+            text: Source text
+            context: Optional extraction context (unused by this service)
+            emit_new: Set False when only known actors are needed; skips the
+                      capitalized-phrase pass and Actor construction
+
         Returns:
             - List of known actor IDs
-            - List of newly discovered Actor objects
+            - List of newly discovered Actor objects (empty if not emit_new)
         """
-        known_actors = []
         new_actors = []
 
         # Simple approach: match against gazetteer
-        text_lower = text.lower()
-
-        for canonical, actor_id in self.canonical_map.items():
-            if canonical in text_lower:
-                if actor_id not in known_actors:
-                    known_actors.append(actor_id)
+        known_actors = self._match_known_actors(text)
+        if not emit_new:
+            return known_actors, new_actors
 
         # Extract potential new entities (very simplified)
         # In real implementation, use spaCy NER here
         potential_entities = self._extract_capitalized_phrases(text)
 
+        # Context keywords are the same for every entity: scan the text once
+        context_has_org = bool(potential_entities) and bool(_ORG_KEYWORDS_RE.search(text))
+
+        seen_new = set()
         for entity in potential_entities:
             entity_lower = entity.lower()
 
-            # Skip if already known
-            if entity_lower in self.canonical_map:
+            # Skip if already known, or a case variant of one created above
+            if entity_lower in self.canonical_map or entity_lower in seen_new:
+                continue
+            seen_new.add(entity_lower)
+
+            # Skip phrases wrapping a known name ("President Biden")
+            if known_actors and self._match_known_actors(entity_lower):
                 continue
 
             # Create new actor (with low confidence)
-            actor_type = self._infer_actor_type(entity, text)
+            actor_type = self._infer_actor_type(entity, text, context_has_org)
             actor = Actor(
-                id=f"actor_{uuid.uuid4().hex[:12]}",
+                id=f"actor_{token_hex(6)}",
                 canonical_name=entity,
                 actor_type=actor_type,
                 aliases=[],
@@ -95,35 +250,55 @@ class NERService:
 
         return known_actors, new_actors
 
+    def extract_actors_batch(
+        self,
+        texts: List[str],
+        context: Optional[Dict] = None,
+        emit_new: bool = True
+    ) -> List[Tuple[List[str], List[Actor]]]:
+        """
+        Extract actors from many texts
+
+        The trie and compiled regexes are shared by every text; the result
+        for each text is what extract_actors_from_text returns for it.
+        """
+        self._alias_trie()  # build any pending index once, up front
+        extract = self.extract_actors_from_text
+        return [extract(text, context, emit_new) for text in texts]
+
     def _extract_capitalized_phrases(self, text: str, max_words: int = 3) -> List[str]:
         """Extract capitalized phrases (potential named entities)"""
-        # Pattern: 1-3 capitalized words in a row
-        pattern = r'\b[A-ZА-ЯЁ][a-zа-яё]+(?:\s+[A-ZА-ЯЁ][a-zа-яё]+){0,' + str(max_words - 1) + r'}\b'
-        matches = re.findall(pattern, text)
+        matches = _capitalized_phrase_re(max_words).findall(text)
 
-        # Filter out common words (simplified)
-        stop_words = {"The", "This", "That", "These", "Those", "Это", "Этот"}
-        matches = [m for m in matches if m not in stop_words]
+        # Deduplicate first, then filter out common words (simplified)
+        return [m for m in set(matches) if m not in CAPITALIZED_STOP_WORDS]
 
-        return list(set(matches))
+    def _infer_actor_type(
+        self,
+        entity: str,
+        context: str,
+        context_has_org: Optional[bool] = None
+    ) -> ActorType:
+        """
+        Infer actor type from entity and context
 
-    def _infer_actor_type(self, entity: str, context: str) -> ActorType:
-        """Infer actor type from entity and context"""
+        context_has_org: precomputed organization-keyword check for context
+                         (scanned here when None)
+        """
         entity_lower = entity.lower()
-        context_lower = context.lower()
 
         # Company indicators
-        if any(indicator in entity_lower for indicator in ["corp", "inc", "llc", "ltd", "gmbh", "oao"]):
+        if any(indicator in entity_lower for indicator in COMPANY_INDICATORS):
             return ActorType.COMPANY
 
         # Country indicators (simplified)
-        countries = ["russia", "ukraine", "usa", "china", "germany", "france", "россия", "украина"]
-        if entity_lower in countries:
+        if entity_lower in COUNTRY_NAMES:
             return ActorType.COUNTRY
 
         # Organization indicators
-        org_keywords = ["organization", "committee", "agency", "ministry", "department", "организация"]
-        if any(kw in context_lower for kw in org_keywords):
+        if context_has_org is None:
+            context_has_org = bool(_ORG_KEYWORDS_RE.search(context))
+        if context_has_org:
             return ActorType.ORGANIZATION
 
         # Default to person
@@ -146,34 +321,48 @@ class NERService:
         """
         relations = []
 
-        # Simple pattern-based extraction
-        for relation_type, patterns in self.relation_patterns.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    # Try to map matched entities to known actors
-                    entity1 = match.group(1)
-                    entity2 = match.group(2)
-
-                    actor1_id = self._find_actor_by_name(entity1, mentioned_actors)
-                    actor2_id = self._find_actor_by_name(entity2, mentioned_actors)
-
-                    if actor1_id and actor2_id:
-                        relation = ActorRelation(
-                            id=f"rel_{uuid.uuid4().hex[:12]}",
-                            source_actor_id=actor1_id,
-                            target_actor_id=actor2_id,
-                            relation_type=relation_type,
-                            confidence=0.6,
-                            is_ephemeral=(relation_type in [RelationType.CRITICIZED, RelationType.SUPPORTS]),
-                            ttl_days=60 if relation_type in [RelationType.CRITICIZED, RelationType.SUPPORTS] else None
-                        )
-                        relations.append(relation)
+        # Ordered set: O(1) membership, partial matches still tried in order
+        candidates = dict.fromkeys(mentioned_actors)
+
+        # Simple pattern-based extraction: one scan for all patterns.
+        # The lookahead lets a pattern re-match inside its own previous match
+        # ("A criticized B criticized C"); skip those, as a per-pattern
+        # finditer would.
+        pattern_ends: Dict[str, int] = {}
+        for match in self._relation_re.finditer(text):
+            name = match.lastgroup
+            if match.start() < pattern_ends.get(name, 0):
+                continue
+            pattern_ends[name] = match.end(name)
+            relation_type, entity_group = self._relation_groups[name]
+
+            # Try to map matched entities to known actors
+            entity1 = match.group(entity_group)
+            entity2 = match.group(entity_group + 1)
+
+            actor1_id = self._find_actor_by_name(entity1, candidates)
+            actor2_id = self._find_actor_by_name(entity2, candidates)
+
+            if actor1_id and actor2_id:
+                relation = ActorRelation(
+                    id=f"rel_{token_hex(6)}",
+                    source_actor_id=actor1_id,
+                    target_actor_id=actor2_id,
+                    relation_type=relation_type,
+                    confidence=0.6,
+                    is_ephemeral=(relation_type in [RelationType.CRITICIZED, RelationType.SUPPORTS]),
+                    ttl_days=60 if relation_type in [RelationType.CRITICIZED, RelationType.SUPPORTS] else None
+                )
+                relations.append(relation)
 
         return relations
 
-    def _find_actor_by_name(self, name: str, candidate_ids: List[str]) -> Optional[str]:
-        """Find actor ID by name from candidates"""
+    def _find_actor_by_name(self, name: str, candidate_ids: Iterable[str]) -> Optional[str]:
+        """
+        Find actor ID by name from candidates
+
+        candidate_ids: a dict/set for O(1) membership; a list also works
+        """
         name_lower = name.lower()
 
         # Check canonical map
@@ -182,18 +371,71 @@ class NERService:
             if actor_id in candidate_ids:
                 return actor_id
 
+        # Whole-word partial match ("biden" in "joe biden") via the token index
+        actor_names = self._lowered_actor_names()
+        hits = self._name_tokens.get(name_lower)
+        if hits:
+            matched = hits.intersection(candidate_ids)
+            if len(matched) == 1:
+                return matched.pop()
+            if matched:
+                return next(actor_id for actor_id in candidate_ids if actor_id in matched)
+
         # Check partial matches in candidates
         for actor_id in candidate_ids:
-            if actor_id in self.gazetteer:
-                actor = self.gazetteer[actor_id]
-                if name_lower in actor.canonical_name.lower():
-                    return actor_id
-                for alias_entry in actor.aliases:
-                    if name_lower in alias_entry.get("name", "").lower():
-                        return actor_id
+            names = actor_names.get(actor_id)
+            if names is not None and name_lower in names:
+                return actor_id
 
         return None
 
+    def _lowered_actor_names(self) -> Dict[str, str]:
+        """
+        Per gazetteer actor: lowercased canonical name and aliases, NUL-joined
+
+        One buffer per actor turns the partial-match check into a single
+        substring search; names never contain NUL, so hits cannot straddle
+        two names.
+
+        Kept up to date by add_actor_alias/merge_actors; rebuilt after
+        load_gazetteer or when the gazetteer grows or shrinks behind our back.
+        """
+        if self._actor_names is None or self._actor_names_size != len(self.gazetteer):
+            self._actor_names = {
+                actor_id: self._joined_actor_names(actor)
+                for actor_id, actor in self.gazetteer.items() if actor is not None
+            }
+            self._actor_names_size = len(self.gazetteer)
+            self._name_tokens = {}
+            for actor_id, names in self._actor_names.items():
+                self._index_name_tokens(actor_id, names)
+        return self._actor_names
+
+    def _index_name_tokens(self, actor_id: str, names: str) -> None:
+        for token in TOKEN_RE.findall(names):
+            self._name_tokens.setdefault(token, set()).add(actor_id)
+
+    @staticmethod
+    def _joined_actor_names(actor: Actor) -> str:
+        names = [actor.canonical_name]
+        names.extend(alias_entry.get("name", "") for alias_entry in actor.aliases)
+        return "\0".join(names).lower()
+
+    def _refresh_actor_names(self, actor_id: str, removed_id: Optional[str] = None) -> None:
+        """Update one actor's cached names (and drop a removed actor's)"""
+        if self._actor_names is None:
+            return
+        if self._actor_names_size != len(self.gazetteer) + (removed_id is not None):
+            self._actor_names = None  # stale already: rebuild on next use
+            return
+        if removed_id is not None:
+            for token in TOKEN_RE.findall(self._actor_names.pop(removed_id, "")):
+                self._name_tokens[token].discard(removed_id)
+        names = self._joined_actor_names(self.gazetteer[actor_id])
+        self._actor_names[actor_id] = names
+        self._index_name_tokens(actor_id, names)
+        self._actor_names_size = len(self.gazetteer)
+
     def canonicalize_actor(self, actor_name: str) -> Optional[str]:
         """Find canonical actor ID for a name"""
         return self.canonical_map.get(actor_name.lower())
@@ -202,8 +444,29 @@ class NERService:
         """Add alias to actor"""
         if actor_id in self.gazetteer:
             actor = self.gazetteer[actor_id]
-            actor.aliases.append({"name": alias, "type": alias_type})
+            actor.add_alias({"name": alias, "type": alias_type})
+            map_size = len(self.canonical_map)
             self.canonical_map[alias.lower()] = actor_id
+            self._index_names([alias.lower()], map_size)
+            self._refresh_actor_names(actor_id)
+
+    def bulk_update(
+        self,
+        aliases: Iterable[Tuple[str, str, str]] = (),
+        merges: Iterable[Tuple[str, str]] = ()
+    ) -> None:
+        """
+        Apply many gazetteer changes at once
+
+        Args:
+            aliases: (actor_id, alias, alias_type) tuples for add_actor_alias
+            merges: (primary_id, secondary_id) tuples for merge_actors,
+                    applied after the aliases
+        """
+        for actor_id, alias, alias_type in aliases:
+            self.add_actor_alias(actor_id, alias, alias_type)
+        for primary_id, secondary_id in merges:
+            self.merge_actors(primary_id, secondary_id)
 
     def merge_actors(self, primary_id: str, secondary_id: str) -> Optional[Actor]:
         """Merge two actors into one"""
@@ -214,18 +477,24 @@ class NERService:
         secondary = self.gazetteer[secondary_id]
 
         # Add secondary's name and aliases to primary
-        primary.aliases.append({"name": secondary.canonical_name, "type": "merged"})
-        primary.aliases.extend(secondary.aliases)
+        primary.add_alias({"name": secondary.canonical_name, "type": "merged"})
+        for alias_entry in secondary.aliases:
+            primary.add_alias(alias_entry)
 
         # Update canonical map
-        self.canonical_map[secondary.canonical_name.lower()] = primary_id
+        map_size = len(self.canonical_map)
+        names = [secondary.canonical_name.lower()]
         for alias_entry in secondary.aliases:
             alias = alias_entry.get("name", "")
             if alias:
-                self.canonical_map[alias.lower()] = primary_id
+                names.append(alias.lower())
+        for name in names:
+            self.canonical_map[name] = primary_id
+        self._index_names(names, map_size)
 
         # Remove secondary
         del self.gazetteer[secondary_id]
+        self._refresh_actor_names(primary_id, removed_id=secondary_id)
 
         primary.updated_at = datetime.utcnow()
         return primary
@@ -6,22 +6,76 @@
     service.load_gazetteer(actors_list)
     known_ids, new_actors = service.extract_actors_from_text(text)
 """
-from typing import List, Dict, Tuple, Optional
+import asyncio
+from functools import lru_cache
+from itertools import chain, groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import List, Dict, Set, Tuple, Optional
+import hashlib
 import logging
 import re
+import threading
 
 try:
     import spacy
+    from spacy.tokens import Doc
     SPACY_AVAILABLE = True
 except ImportError:
     SPACY_AVAILABLE = False
     logging.warning("spaCy not installed. Install with: pip install spacy && python -m spacy download ru_core_news_lg")
 
 from backend.models.entities import Actor, ActorType
+from backend.utils.lru_cache import LRUCache
 
 
 logger = logging.getLogger(__name__)
 
+# Шаблоны для detect_language (компилируются один раз)
+_UKRAINIAN_RE = re.compile(r'[ІіЇїЄєҐґ]')
+_CYRILLIC_RE = re.compile(r'[А-Яа-яЁё]')
+# Весь блок Кириллицы (U+0400–U+04FF), для has_cyrillic
+_CYRILLIC_BLOCK_RE = re.compile(r'[\u0400-\u04FF]')
+
+# Компоненты пайплайна, результаты которых не используются (нужны только doc.ents).
+# NER в моделях spaCy v3 от них не зависит; tok2vec остаётся включённым.
+UNUSED_PIPES = ("parser", "tagger", "morphologizer", "lemmatizer", "attribute_ruler", "senter")
+
+# Языки, которые различает detect_language
+SUPPORTED_LANGUAGES = ("ru", "uk", "en")
+
+# Тексты длиннее этого разбиваются на куски по границам предложений
+MAX_CHUNK_CHARS = 100_000
+# Размер пачки nlp.pipe для кусков одного длинного текста
+CHUNK_BATCH_SIZE = 8
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Сколько разобранных документов держать в кэше (enable_doc_cache=True)
+DOC_CACHE_SIZE = 1024
+
+# Сколько результатов поиска в gazetteer (имя -> actor_id) запоминать
+GAZETTEER_CACHE_SIZE = 16384
+
+# Отличает "нет в кэше" от закэшированного None
+_MISSING = object()
+
+
+@lru_cache(maxsize=4096)
+def _actor_id_for(name_lower: str) -> str:
+    """
+    Детерминированный ID нового актора по имени.
+
+    blake2b не зависит от PYTHONHASHSEED (в отличие от hash()), поэтому
+    одна и та же сущность получает один ID в разных процессах и запусках.
+    """
+    digest = hashlib.blake2b(name_lower.encode("utf-8"), digest_size=8).digest()
+    return f"actor_{int.from_bytes(digest, 'big') % 10**12}"
+
+
+def _actor_type_value(actor_type) -> str:
+    """Тип актора строкой (поддержка как Enum, так и строки)"""
+    return actor_type.value if hasattr(actor_type, 'value') else str(actor_type)
+
 
 def detect_language(text: str) -> str:
     """
@@ -38,34 +92,30 @@ def detect_language(text: str) -> str:
     Returns:
         'ru' если обнаружена кириллица, иначе 'en'
     """
-    if not text:
+    # ASCII-текст не содержит кириллицы: проверка за один проход в C,
+    # без регулярных выражений
+    if not text or text.isascii():
         return 'en'
-    
+
     # Украинские специфические буквы (в русском их нет)
-    ukrainian_pattern = re.compile(r'[ІіЇїЄєҐґ]')
-    if ukrainian_pattern.search(text):
+    if _UKRAINIAN_RE.search(text):
         return 'uk'
 
-    # Проверяем наличие кириллических символов (RU/UA/etc.)
-    cyrillic_pattern = re.compile(r'[А-Яа-яЁёІіЇїЄєҐґ]')
-    has_cyrillic = bool(cyrillic_pattern.search(text))
-    
-    # Подсчитываем процент кириллицы
-    cyrillic_chars = len(cyrillic_pattern.findall(text))
-    total_chars = len(re.findall(r'[А-Яа-яЁёA-Za-z]', text))
-    
-    if total_chars == 0:
-        return 'en'
-    
-    cyrillic_ratio = cyrillic_chars / total_chars
-    
-    # Если больше 30% кириллицы - считаем русским (если не uk — см. выше)
-    if cyrillic_ratio > 0.3 or has_cyrillic:
+    # Любая кириллица (без украинских букв) — русский. Доля кириллицы
+    # на результат не влияла: порог 30% срабатывал только вместе с этим
+    # условием, поэтому подсчёт символов не нужен.
+    if _CYRILLIC_RE.search(text):
         return 'ru'
-    
+
     return 'en'
 
 
+def has_cyrillic(text: str) -> bool:
+    """Есть ли в тексте хотя бы один символ из блока Кириллицы"""
+    return bool(text) and not text.isascii() and bool(_CYRILLIC_BLOCK_RE.search(text))
+
+
+@lru_cache(maxsize=16)
 def get_model_for_language(language: str, prefer_large: bool = False) -> str:
     """
     Получить название spaCy модели для указанного языка.
@@ -105,14 +155,10 @@ def check_model_available(model_name: str) -> bool:
     """
     if not SPACY_AVAILABLE:
         return False
-    
-    try:
-        import spacy.util
-        # Попытка найти модель
-        spacy.load(model_name)
-        return True
-    except (OSError, IOError):
-        return False
+
+    # Только метаданные установленных пакетов (или путь к модели) —
+    # веса модели не загружаются
+    return spacy.util.is_package(model_name) or Path(model_name).is_dir()
 
 
 class NERSpacyService:
@@ -121,7 +167,13 @@ class NERSpacyService:
     Поддерживает канонизацию через gazetteer.
     """
 
-    def __init__(self, model_name: str = "ru_core_news_lg", use_multilang: bool = True):
+    def __init__(
+        self,
+        model_name: str = "ru_core_news_lg",
+        use_multilang: bool = True,
+        enable_doc_cache: bool = False,
+        max_chunk_chars: int = MAX_CHUNK_CHARS
+    ):
         """
         Инициализация spaCy модели.
 
@@ -130,9 +182,32 @@ class NERSpacyService:
                        Для английского: "en_core_web_lg"
                        Для многоязычной: "xx_ent_wiki_sm"
             use_multilang: Использовать многоязычную модель если доступна
+            enable_doc_cache: Кэшировать разобранные документы (Doc.to_bytes)
+                       по хэшу текста — повторный анализ того же текста не
+                       запускает пайплайн. Стоит памяти, поэтому выключено
+            max_chunk_chars: Тексты длиннее обрабатываются кусками (по
+                       предложениям), чтобы не держать в памяти один огромный Doc
         """
+        self.max_chunk_chars = max_chunk_chars
         self.gazetteer: Dict[str, Actor] = {}
         self.canonical_map: Dict[str, str] = {}  # alias -> actor_id
+
+        # blake2b(текст) -> Doc.to_bytes()
+        self._doc_cache: Optional[LRUCache] = LRUCache(DOC_CACHE_SIZE) if enable_doc_cache else None
+
+        # Для частичного сопоставления (строятся в load_gazetteer):
+        # (actor_id, слова канонического имени, слова каждого алиаса) в порядке gazetteer
+        self._actor_index: List[Tuple[str, frozenset, List[frozenset]]] = []
+        # слово -> позиции в _actor_index
+        self._word_to_actors: Dict[str, Set[int]] = {}
+        # actor_id -> тип строкой (для extract_with_canonical_names)
+        self._actor_type_str: Dict[str, str] = {}
+        # нормализованное имя -> actor_id или None; сбрасывается в load_gazetteer
+        self._gazetteer_cache = LRUCache(GAZETTEER_CACHE_SIZE)
+        # LRUCache меняет порядок ключей даже при чтении, а *_async методы
+        # вызывают один экземпляр из нескольких потоков: обращения к
+        # _gazetteer_cache и _doc_cache идут под этой блокировкой
+        self._cache_lock = threading.Lock()
         
         self.nlp = None
         self.model_name = model_name
@@ -159,6 +234,9 @@ class NERSpacyService:
             else:
                 logger.error(f"Не удалось загрузить spaCy модель {model_name}")
 
+        if self.nlp is not None:
+            self._disable_unused_pipes()
+
         # Маппинг типов spaCy на наши типы
         self.type_mapping = {
             "PERSON": ActorType.PERSON,
@@ -168,24 +246,47 @@ class NERSpacyService:
             "MISC": ActorType.ORGANIZATION,
         }
 
+    def _disable_unused_pipes(self) -> None:
+        """Отключить компоненты, не влияющие на doc.ents"""
+        disabled = [name for name in UNUSED_PIPES if name in self.nlp.pipe_names]
+        for name in disabled:
+            self.nlp.disable_pipe(name)
+        if disabled:
+            logger.debug(f"Отключены компоненты spaCy: {', '.join(disabled)}")
+
     def load_gazetteer(self, actors: List[Actor]) -> None:
         """Загрузить известных акторов в gazetteer для канонизации"""
         self.gazetteer = {}
         self.canonical_map = {}
         
+        self._actor_index = []
+        self._word_to_actors = {}
+        with self._cache_lock:
+            self._gazetteer_cache.clear()
+
         for actor in actors:
             self.gazetteer[actor.id] = actor
-            
-            # Добавить каноническое имя
-            canonical_lower = actor.canonical_name.lower().strip()
+            # Нормализованные имена кэшируются в самом Actor
+            canonical_lower, aliases_lower = actor.normalized_names
+
+            # Добавить каноническое имя и все алиасы
             self.canonical_map[canonical_lower] = actor.id
-            
-            # Добавить все алиасы
-            for alias_entry in actor.aliases:
-                alias = alias_entry.get("name", "").lower().strip()
+            for alias in aliases_lower:
                 if alias:
                     self.canonical_map[alias] = actor.id
-        
+
+        self._actor_type_str = {
+            actor_id: _actor_type_value(actor.actor_type) for actor_id, actor in self.gazetteer.items()
+        }
+        for actor_id, actor in self.gazetteer.items():
+            canonical_lower, aliases_lower = actor.normalized_names
+            canonical_words = frozenset(canonical_lower.split())
+            alias_words_sets = [frozenset(alias.split()) for alias in aliases_lower]
+            position = len(self._actor_index)
+            self._actor_index.append((actor_id, canonical_words, alias_words_sets))
+            for word in canonical_words.union(*alias_words_sets):
+                self._word_to_actors.setdefault(word, set()).add(position)
+
         logger.info(f"Загружено {len(actors)} акторов в gazetteer")
 
     def extract_actors_from_text(
@@ -211,18 +312,145 @@ class NERSpacyService:
             logger.warning("spaCy модель не загружена. Используйте базовый NERService.")
             return [], []
 
+        # Обработка текста через spaCy (длинный текст — кусками)
+        chunks = self._split_text(text)
+        if len(chunks) == 1:
+            ents = self._parse(text).ents
+        else:
+            docs = self._parse_many(chunks, CHUNK_BATCH_SIZE, 1)
+            ents = chain.from_iterable(doc.ents for doc in docs)
+        return self._process_ents(ents, text, confidence_threshold)
+
+    def extract_actors_from_texts(
+        self,
+        texts: List[str],
+        confidence_threshold: float = 0.7,
+        batch_size: int = 64,
+        n_process: int = 1
+    ) -> List[Tuple[List[str], List[Actor]]]:
+        """
+        Извлечь акторов из нескольких текстов за один проход nlp.pipe().
+
+        spaCy обрабатывает документы пачками (batch_size), а при n_process > 1 —
+        в нескольких процессах. Результат для каждого текста тот же, что у
+        extract_actors_from_text.
+        """
+        if not self.nlp:
+            logger.warning("spaCy модель не загружена. Используйте базовый NERService.")
+            return [([], []) for _ in texts]
+
+        # Длинные тексты режутся на куски; куски одного текста идут подряд
+        owners = []
+        chunks = []
+        for i, text in enumerate(texts):
+            for chunk in self._split_text(text):
+                owners.append(i)
+                chunks.append(chunk)
+
+        docs = self._parse_many(chunks, batch_size, n_process)
+        return [
+            self._process_ents(
+                chain.from_iterable(doc.ents for _, doc in group), texts[owner], confidence_threshold
+            )
+            for owner, group in groupby(zip(owners, docs), key=itemgetter(0))
+        ]
+
+    def _split_text(self, text: str) -> List[str]:
+        """
+        Разбить текст длиннее max_chunk_chars на куски по границам предложений.
+
+        Предложение длиннее лимита режется по лимиту. Короткий текст
+        возвращается как есть (один кусок).
+        """
+        limit = self.max_chunk_chars
+        if len(text) <= limit:
+            return [text]
+
+        chunks = []
+        current: List[str] = []
+        size = 0
+        for sentence in _SENTENCE_END_RE.split(text):
+            while len(sentence) > limit:
+                if current:
+                    chunks.append(" ".join(current))
+                    current, size = [], 0
+                chunks.append(sentence[:limit])
+                sentence = sentence[limit:]
+            if current and size + len(sentence) + 1 > limit:
+                chunks.append(" ".join(current))
+                current, size = [], 0
+            current.append(sentence)
+            size += len(sentence) + 1
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    @staticmethod
+    def _doc_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _parse(self, text: str):
+        """self.nlp(text) с учётом кэша документов"""
+        if self._doc_cache is None:
+            return self.nlp(text)
+
+        key = self._doc_key(text)
+        with self._cache_lock:
+            data = self._doc_cache.get(key)
+        if data is not None:
+            return Doc(self.nlp.vocab).from_bytes(data)
+        doc = self.nlp(text)
+        data = doc.to_bytes()
+        with self._cache_lock:
+            self._doc_cache[key] = data
+        return doc
+
+    def _parse_many(self, texts: List[str], batch_size: int, n_process: int):
+        """nlp.pipe(texts) с учётом кэша: через пайплайн идут только промахи"""
+        if self._doc_cache is None:
+            return self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+
+        keys = [self._doc_key(text) for text in texts]
+        docs = [None] * len(texts)
+        misses = []
+        with self._cache_lock:
+            cached = [self._doc_cache.get(key) for key in keys]
+        for i, data in enumerate(cached):
+            if data is not None:
+                docs[i] = Doc(self.nlp.vocab).from_bytes(data)
+            else:
+                misses.append(i)
+
+        parsed = self.nlp.pipe([texts[i] for i in misses], batch_size=batch_size, n_process=n_process)
+        for i, doc in zip(misses, parsed):
+            docs[i] = doc
+            data = doc.to_bytes()
+            with self._cache_lock:
+                self._doc_cache[keys[i]] = data
+        return docs
+
+    def _process_ents(
+        self,
+        ents,
+        text: str,
+        confidence_threshold: float
+    ) -> Tuple[List[str], List[Actor]]:
+        """Разобрать сущности spaCy (doc.ents одного или нескольких кусков) на известных и новых акторов"""
         known_actors = []
+        known_set = set()  # O(1) проверка, known_actors хранит порядок
         new_actors = []
         seen_texts = set()  # Для дедупликации
-
-        # Обработка текста через spaCy
-        doc = self.nlp(text)
+        # text.lower() нужен только для confidence новых акторов: считаем
+        # его при первой необходимости и один раз на документ
+        text_lower = None
 
         # Извлечение именованных сущностей
-        for ent in doc.ents:
+        for ent in ents:
             # Пропустить если слишком короткое или уже видели
+            # lower() один раз на сущность: он нужен и gazetteer, и confidence
+            raw_lower = ent.text.lower()
             ent_text = ent.text.strip()
-            ent_text_lower = ent_text.lower()
+            ent_text_lower = raw_lower.strip()
             
             if len(ent_text) < 2 or ent_text_lower in seen_texts:
                 continue
@@ -233,20 +461,23 @@ class NERSpacyService:
             actor_type = self._map_spacy_type(ent.label_)
             
             # Попытка найти в gazetteer (канонизация)
-            matched_actor_id = self._find_in_gazetteer(ent_text)
+            matched_actor_id = self._find_in_gazetteer(ent_text, ent_text_lower)
             
             if matched_actor_id:
                 # Найден известный актор
-                if matched_actor_id not in known_actors:
+                if matched_actor_id not in known_set:
+                    known_set.add(matched_actor_id)
                     known_actors.append(matched_actor_id)
             else:
                 # Новый актор - создать
                 # Вычислить confidence на основе эвристик (spaCy не предоставляет scores напрямую)
-                confidence = self._calculate_confidence(ent, text)
+                if text_lower is None:
+                    text_lower = text.lower()
+                confidence = self._calculate_confidence(ent, text_lower, raw_lower)
                 
                 if confidence >= confidence_threshold:
                     new_actor = Actor(
-                        id=f"actor_{hash(ent_text_lower) % 10**12}",  # Детерминированный ID
+                        id=_actor_id_for(ent_text_lower),  # Детерминированный ID
                         canonical_name=ent_text,
                         actor_type=actor_type,
                         aliases=[],
@@ -266,7 +497,12 @@ class NERSpacyService:
         """Маппинг типов spaCy на наши типы акторов"""
         return self.type_mapping.get(spacy_label, ActorType.ORGANIZATION)
     
-    def _calculate_confidence(self, ent, text: str) -> float:
+    def _calculate_confidence(
+        self,
+        ent,
+        text_lower: str,
+        ent_lower: Optional[str] = None
+    ) -> float:
         """
         Вычислить confidence для сущности на основе эвристик.
         
@@ -276,6 +512,11 @@ class NERSpacyService:
         - Контекст (наличие заглавных букв, позиция в тексте)
         - Повторяемость в тексте
         
+        Args:
+            ent: Сущность spaCy
+            text_lower: Исходный текст в нижнем регистре (text.lower(), один на документ)
+            ent_lower: ent.text.lower(), если уже посчитан для сущности
+
         Returns:
             Confidence score от 0.0 до 1.0
         """
@@ -300,8 +541,8 @@ class NERSpacyService:
             confidence += 0.05
         
         # Проверка повторяемости в тексте (если упоминается несколько раз - выше уверенность)
-        text_lower = text.lower()
-        ent_lower = ent.text.lower()
+        if ent_lower is None:
+            ent_lower = ent.text.lower()
         mentions = text_lower.count(ent_lower)
         if mentions > 1:
             confidence += min(0.1, (mentions - 1) * 0.03)
@@ -311,68 +552,68 @@ class NERSpacyService:
         
         return confidence
 
-    def _find_in_gazetteer(self, entity_text: str) -> Optional[str]:
+    def _find_in_gazetteer(self, entity_text: str, entity_lower: Optional[str] = None) -> Optional[str]:
         """
         Найти актора в gazetteer по тексту сущности.
         Использует точное и частичное сопоставление с проверкой на разумность совпадения.
+        entity_lower - уже нормализованный entity_text.lower().strip(), если есть.
         """
-        entity_lower = entity_text.lower().strip()
+        if entity_lower is None:
+            entity_lower = entity_text.lower().strip()
         
         if not entity_lower or len(entity_lower) < 2:
             return None
-        
+
+        # Одни и те же имена повторяются из документа в документ.
+        # Проверка и чтение - одна операция под блокировкой; сам поиск идёт
+        # без неё (в худшем случае два потока посчитают одно имя дважды)
+        with self._cache_lock:
+            actor_id = self._gazetteer_cache.get(entity_lower, _MISSING)
+        if actor_id is not _MISSING:
+            return actor_id
+        actor_id = self._match_gazetteer(entity_lower)
+        with self._cache_lock:
+            self._gazetteer_cache[entity_lower] = actor_id
+        return actor_id
+
+    def _match_gazetteer(self, entity_lower: str) -> Optional[str]:
+        """Поиск нормализованного имени в gazetteer (без кэша)"""
         # 1. Точное совпадение (высший приоритет)
         if entity_lower in self.canonical_map:
             return self.canonical_map[entity_lower]
         
-        # 2. Поиск по известным акторам с проверкой разумности
+        # 2. Поиск по известным акторам с проверкой разумности.
+        # Точные совпадения канонических имён и алиасов уже покрыты
+        # canonical_map, здесь остаётся только частичное сопоставление.
         best_match = None
         best_score = 0.0
-        
-        for actor_id, actor in self.gazetteer.items():
-            canonical_lower = actor.canonical_name.lower()
-            
-            # Точное совпадение канонического имени
-            if entity_lower == canonical_lower:
-                return actor_id
-            
-            # Проверка алиасов (точное совпадение)
-            for alias_entry in actor.aliases:
-                alias = alias_entry.get("name", "").lower().strip()
-                if entity_lower == alias:
-                    return actor_id
-            
-            # Частичное совпадение (только если разумно)
-            # Проверяем что одна строка содержит другую как целое слово
-            entity_words = set(entity_lower.split())
-            canonical_words = set(canonical_lower.split())
-            alias_words_sets = [set(alias_entry.get("name", "").lower().split()) 
-                               for alias_entry in actor.aliases]
-            
-            # Если все слова сущности есть в каноническом имени или алиасе
-            if entity_words and len(entity_words) > 0:
-                # Проверка канонического имени
-                if entity_words.issubset(canonical_words) or canonical_words.issubset(entity_words):
-                    # Дополнительная проверка: совпадение должно быть значимым
-                    overlap = len(entity_words & canonical_words)
-                    total = len(entity_words | canonical_words)
-                    score = overlap / total if total > 0 else 0
-                    if score >= 0.6 and len(entity_words) >= 2:  # Минимум 60% совпадения и хотя бы 2 слова
-                        if score > best_score:
-                            best_score = score
-                            best_match = actor_id
-                
-                # Проверка алиасов
-                for alias_words in alias_words_sets:
-                    if alias_words and (entity_words.issubset(alias_words) or alias_words.issubset(entity_words)):
-                        overlap = len(entity_words & alias_words)
-                        total = len(entity_words | alias_words)
-                        score = overlap / total if total > 0 else 0
-                        if score >= 0.6:
-                            if score > best_score:
-                                best_score = score
-                                best_match = actor_id
-        
+        entity_words = set(entity_lower.split())
+
+        # Совпадение со score >= 0.6 требует общего слова, поэтому проверяем
+        # только акторов из инвертированного индекса (в порядке gazetteer,
+        # чтобы при равном score побеждал тот же актор, что и раньше)
+        positions = set()
+        for word in entity_words:
+            positions.update(self._word_to_actors.get(word, ()))
+
+        # При вложении одного множества слов в другое Jaccard равен
+        # отношению их размеров, поэтому кандидатов с заведомо низким score
+        # отсекаем по длине, не вычисляя пересечение и объединение.
+        # Каноническое имя сопоставляется только для сущностей от 2 слов.
+        entity_size = len(entity_words)
+        check_canonical = entity_size >= 2
+        for position in sorted(positions):
+            actor_id, canonical_words, alias_words_sets = self._actor_index[position]
+            candidates = chain((canonical_words,), alias_words_sets) if check_canonical else alias_words_sets
+            for words in candidates:
+                size = len(words)
+                score = size / entity_size if size < entity_size else entity_size / size
+                if score < 0.6 or score <= best_score:
+                    continue
+                if entity_words <= words or words <= entity_words:
+                    best_score = score
+                    best_match = actor_id
+
         # Возвращаем лучшее совпадение только если оно достаточно хорошее
         if best_score >= 0.6:
             return best_match
@@ -406,34 +647,51 @@ class NERSpacyService:
             return []
 
         known_ids, new_actors = self.extract_actors_from_text(text)
-        result = []
+        return self._canonical_dicts(known_ids, new_actors)
+
+    def extract_with_canonical_names_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 64,
+        n_process: int = 1
+    ) -> List[List[Dict]]:
+        """extract_with_canonical_names для нескольких текстов через nlp.pipe()"""
+        if not self.nlp:
+            return [[] for _ in texts]
+
+        return [
+            self._canonical_dicts(known_ids, new_actors)
+            for known_ids, new_actors in self.extract_actors_from_texts(
+                texts, batch_size=batch_size, n_process=n_process
+            )
+        ]
+
+    def _canonical_dicts(self, known_ids: List[str], new_actors: List[Actor]) -> List[Dict]:
+        """Известные и новые акторы в формате extract_with_canonical_names"""
+        # Известные акторы: имя и тип подготовлены в load_gazetteer
+        known_types = self._actor_type_str
+        result = [
+            {
+                "name": self.gazetteer[actor_id].canonical_name,
+                "type": known_types[actor_id],
+                "confidence": 0.9,  # Высокая уверенность для известных
+                "original_text": self.gazetteer[actor_id].canonical_name,
+                "actor_id": actor_id
+            }
+            for actor_id in known_ids if actor_id in known_types
+        ]
 
-        # Добавить известных акторов
-        for actor_id in known_ids:
-            actor = self.gazetteer.get(actor_id)
-            if actor:
-                # Поддержка как Enum так и строки
-                actor_type_value = actor.actor_type.value if hasattr(actor.actor_type, 'value') else str(actor.actor_type)
-                result.append({
-                    "name": actor.canonical_name,
-                    "type": actor_type_value,
-                    "confidence": 0.9,  # Высокая уверенность для известных
-                    "original_text": actor.canonical_name,
-                    "actor_id": actor_id
-                })
-
-        # Добавить новых акторов
-        for actor in new_actors:
-            # Поддержка как Enum так и строки
-            actor_type_value = actor.actor_type.value if hasattr(actor.actor_type, 'value') else str(actor.actor_type)
-            result.append({
+        # Новые акторы
+        result.extend(
+            {
                 "name": actor.canonical_name,
-                "type": actor_type_value,
+                "type": _actor_type_value(actor.actor_type),
                 "confidence": actor.metadata.get("confidence", 0.7),
                 "original_text": actor.canonical_name,
                 "actor_id": actor.id
-            })
-
+            }
+            for actor in new_actors
+        )
         return result
 
 
@@ -442,7 +700,8 @@ def create_hybrid_ner_service(
     use_spacy: bool = True,
     spacy_model: Optional[str] = None,
     auto_detect_language: bool = True,
-    prefer_large_models: bool = False
+    prefer_large_models: bool = False,
+    preload_models: bool = False
 ) -> "HybridNERService":
     """
     Создать гибридный NER сервис, объединяющий spaCy и LLM.
@@ -454,6 +713,7 @@ def create_hybrid_ner_service(
         spacy_model: Название spaCy модели (если None - будет автоматически выбираться по языку)
         auto_detect_language: Автоматически определять язык и выбирать модель
         prefer_large_models: Предпочитать большие модели (lg) вместо средних/малых
+        preload_models: Загрузить модели для всех языков сразу, а не при первом тексте
 
     Returns:
         HybridNERService
@@ -463,7 +723,8 @@ def create_hybrid_ner_service(
         use_spacy=use_spacy, 
         spacy_model=spacy_model,
         auto_detect_language=auto_detect_language,
-        prefer_large_models=prefer_large_models
+        prefer_large_models=prefer_large_models,
+        preload_models=preload_models
     )
 
 
@@ -479,7 +740,8 @@ class HybridNERService:
         use_spacy: bool = True,
         spacy_model: Optional[str] = None,  # Если None - будет автоматически выбираться по языку
         auto_detect_language: bool = True,  # Автоматически определять язык и выбирать модель
-        prefer_large_models: bool = False  # Предпочитать большие модели (lg)
+        prefer_large_models: bool = False,  # Предпочитать большие модели (lg)
+        preload_models: bool = False  # Сразу загрузить модели для всех языков
     ):
         self.llm_service = llm_service
         self.use_spacy = use_spacy and SPACY_AVAILABLE
@@ -489,10 +751,17 @@ class HybridNERService:
         
         # Кэш загруженных моделей для быстрого переключения
         self._model_cache: Dict[str, NERSpacyService] = {}
+        # Модели, которые не удалось загрузить (повторно не пробуем)
+        self._failed_models: Set[str] = set()
+        # Язык -> выбранная модель (None, если для языка ничего не загрузилось)
+        self._lang_to_service: Dict[str, Optional[NERSpacyService]] = {}
         
         if self.use_spacy:
             # Предзагружаем модель по умолчанию
             self._load_model(self.default_model)
+            if preload_models and auto_detect_language:
+                for language in SUPPORTED_LANGUAGES:
+                    self._service_for_language(language)
         else:
             self.spacy_service = None
         
@@ -510,6 +779,8 @@ class HybridNERService:
         """
         if model_name in self._model_cache:
             return self._model_cache[model_name]
+        if model_name in self._failed_models:
+            return None
         
         try:
             service = NERSpacyService(model_name=model_name)
@@ -519,10 +790,10 @@ class HybridNERService:
                 return service
             else:
                 logger.warning(f"Модель {model_name} не загружена")
-                return None
         except Exception as e:
             logger.warning(f"Не удалось загрузить модель {model_name}: {e}")
-            return None
+        self._failed_models.add(model_name)
+        return None
     
     def _get_model_for_text(self, text: str) -> Optional[NERSpacyService]:
         """
@@ -538,32 +809,10 @@ class HybridNERService:
             return None
         
         if self.auto_detect_language:
-            # Определяем язык текста
-            language = detect_language(text)
-            model_name = get_model_for_language(language, prefer_large=self.prefer_large_models)
-            
-            # Пробуем загрузить модель для этого языка
-            service = self._load_model(model_name)
+            # Определяем язык текста; модель для языка выбирается один раз
+            service = self._service_for_language(detect_language(text))
             if service:
                 return service
-            
-            # Если модель недоступна, пробуем альтернативу
-            if language == 'ru':
-                # Пробуем другие русские модели
-                for alt_model in ['ru_core_news_sm', 'ru_core_news_lg', 'ru_core_news_md']:
-                    if alt_model != model_name:
-                        service = self._load_model(alt_model)
-                        if service:
-                            logger.info(f"Используется альтернативная модель: {alt_model}")
-                            return service
-            else:
-                # Пробуем другие английские модели
-                for alt_model in ['en_core_web_sm', 'en_core_web_lg']:
-                    if alt_model != model_name:
-                        service = self._load_model(alt_model)
-                        if service:
-                            logger.info(f"Используется альтернативная модель: {alt_model}")
-                            return service
         
         # Возвращаем модель по умолчанию
         if self.default_model in self._model_cache:
@@ -571,6 +820,50 @@ class HybridNERService:
         
         return self._load_model(self.default_model)
 
+    def _service_for_language(self, language: str) -> Optional[NERSpacyService]:
+        """
+        Модель spaCy для языка (с альтернативами), запоминается в _lang_to_service.
+
+        Args:
+            language: Код языка ('ru', 'uk', 'en')
+
+        Returns:
+            NERSpacyService или None, если ни одна модель не загрузилась
+        """
+        if language in self._lang_to_service:
+            return self._lang_to_service[language]
+
+        service = self._resolve_model_for_language(language)
+        self._lang_to_service[language] = service
+        return service
+
+    def _resolve_model_for_language(self, language: str) -> Optional[NERSpacyService]:
+        model_name = get_model_for_language(language, prefer_large=self.prefer_large_models)
+
+        # Пробуем загрузить модель для этого языка
+        service = self._load_model(model_name)
+        if service:
+            return service
+
+        # Если модель недоступна, пробуем альтернативу
+        if language == 'ru':
+            # Пробуем другие русские модели
+            for alt_model in ['ru_core_news_sm', 'ru_core_news_lg', 'ru_core_news_md']:
+                if alt_model != model_name:
+                    service = self._load_model(alt_model)
+                    if service:
+                        logger.info(f"Используется альтернативная модель: {alt_model}")
+                        return service
+        else:
+            # Пробуем другие английские модели
+            for alt_model in ['en_core_web_sm', 'en_core_web_lg']:
+                if alt_model != model_name:
+                    service = self._load_model(alt_model)
+                    if service:
+                        logger.info(f"Используется альтернативная модель: {alt_model}")
+                        return service
+        return None
+
     def load_gazetteer(self, actors: List[Actor]) -> None:
         """Загрузить gazetteer во все загруженные модели"""
         for service in self._model_cache.values():
@@ -607,7 +900,8 @@ class HybridNERService:
         result = []
         spacy_used = False
         low_confidence_entities = []
-        
+        spacy_results = []
+
         # Этап 1: Быстрое извлечение через spaCy (если доступно и модель загружена)
         # Автоматически выбираем модель на основе языка текста
         spacy_service = self._get_model_for_text(text)
@@ -615,104 +909,251 @@ class HybridNERService:
             try:
                 spacy_results = spacy_service.extract_with_canonical_names(text)
                 if spacy_results:
-                    # Разделяем на высокую и низкую уверенность
-                    for actor in spacy_results:
-                        confidence = actor.get('confidence', 0.7)
-                        if confidence >= low_confidence_threshold:
-                            # Высокая уверенность - используем как есть
-                            result.append(actor)
-                        else:
-                            # Низкая уверенность - помечаем для перепроверки
-                            low_confidence_entities.append(actor)
-                    
+                    result, low_confidence_entities = self._split_by_confidence(
+                        spacy_results, low_confidence_threshold
+                    )
                     spacy_used = True
-                    logger.debug(f"spaCy извлек {len(spacy_results)} акторов "
-                               f"({len(result)} высокий confidence, "
-                               f"{len(low_confidence_entities)} низкий confidence)")
             except Exception as e:
                 logger.warning(f"Ошибка при использовании spaCy: {e}, fallback на LLM")
-        
+
         # Этап 2: Использование LLM для перепроверки и дополнения
         if use_llm:
             try:
-                # Проверяем, нужно ли вызывать LLM
-                need_llm = False
-                llm_reason = []
-                
-                # Причина 1: Есть сущности с низким confidence для перепроверки
-                if use_llm_for_low_confidence and low_confidence_entities:
-                    need_llm = True
-                    llm_reason.append(f"{len(low_confidence_entities)} низкий confidence")
-                
-                # Причина 2: spaCy не нашел достаточно акторов (возможно что-то пропустил)
-                if spacy_used and len(result) < 3:
-                    need_llm = True
-                    llm_reason.append("мало результатов от spaCy")
-                
-                # Причина 3: spaCy вообще не сработал
-                if not spacy_used:
-                    need_llm = True
-                    llm_reason.append("spaCy недоступен")
-                
-                if need_llm:
+                llm_reason = self._llm_reasons(
+                    spacy_used, result, low_confidence_entities, use_llm_for_low_confidence
+                )
+                if llm_reason:
                     logger.debug(f"Использование LLM: {', '.join(llm_reason)}")
-                    
+
                     # Полное извлечение через LLM
                     llm_results = self.llm_service.extract_actors(text)
-                    
-                    if spacy_used:
-                        # Объединяем результаты
-                        result_names = {r['name'].lower() for r in result}
-                        
-                        # Сначала перепроверяем сущности с низким confidence
-                        if use_llm_for_low_confidence and low_confidence_entities:
-                            for low_conf_actor in low_confidence_entities:
-                                low_conf_name = low_conf_actor['name'].lower()
-                                # Ищем в LLM результатах - есть ли подтверждение?
-                                found_in_llm = any(
-                                    llm_name.lower() == low_conf_name or 
-                                    low_conf_name in llm_name.lower() or 
-                                    llm_name.lower() in low_conf_name
-                                    for llm_name in [a['name'] for a in llm_results]
-                                )
-                                
-                                if found_in_llm:
-                                    # LLM подтвердил - повышаем confidence
-                                    low_conf_actor['confidence'] = min(0.9, low_conf_actor['confidence'] + 0.15)
-                                    result.append(low_conf_actor)
-                                    result_names.add(low_conf_name)
-                                    logger.debug(f"LLM подтвердил: {low_conf_actor['name']} "
-                                               f"(confidence: {low_conf_actor['confidence']:.2f})")
-                        
-                        # Добавляем новые сущности из LLM, которых нет в spaCy
-                        new_from_llm = 0
-                        for llm_actor in llm_results:
-                            llm_name_lower = llm_actor['name'].lower()
-                            if llm_name_lower not in result_names:
-                                # Проверяем, не было ли это в low_confidence_entities
-                                was_low_conf = any(
-                                    e['name'].lower() == llm_name_lower 
-                                    for e in low_confidence_entities
-                                )
-                                if not was_low_conf:
-                                    result.append(llm_actor)
-                                    result_names.add(llm_name_lower)
-                                    new_from_llm += 1
-                        
-                        logger.debug(f"LLM добавил {new_from_llm} новых акторов, "
-                                   f"подтвердил {len([a for a in result if a.get('confidence', 0) > low_confidence_threshold + 0.1])} низкоконфиденциальных")
-                    else:
-                        # Fallback: использовать только LLM результаты
-                        result = llm_results
-                        logger.debug("Использован только LLM (spaCy недоступен)")
-                
+                    result = self._merge_llm_results(
+                        result, spacy_used, low_confidence_entities, llm_results,
+                        use_llm_for_low_confidence, low_confidence_threshold
+                    )
             except Exception as e:
                 logger.error(f"Ошибка при использовании LLM: {e}")
-                # Если была ошибка LLM, но есть результаты от spaCy - используем их
-                if not result and spacy_used:
-                    # Возвращаем даже низкоконфиденциальные, лучше что-то чем ничего
-                    result.extend(spacy_results)
-                    logger.debug("Ошибка LLM, используем все результаты spaCy (включая низкий confidence)")
-        
+                result = self._spacy_fallback(result, spacy_used, spacy_results)
+
+        return result
+
+    def extract_actors_batch(
+        self,
+        texts: List[str],
+        use_llm: bool = True,
+        llm_for_canonical_only: bool = False,
+        low_confidence_threshold: float = 0.75,
+        use_llm_for_low_confidence: bool = True,
+        batch_size: int = 64
+    ) -> List[List[Dict]]:
+        """
+        extract_actors для нескольких текстов.
+
+        spaCy прогоняет тексты одной модели через nlp.pipe(), а тексты, которым
+        нужна перепроверка, уходят в LLM одним вызовом extract_actors_batch
+        (если LLMService его поддерживает). Результат для каждого текста тот же,
+        что у extract_actors.
+        """
+        spacy_results: List[List[Dict]] = [[] for _ in texts]
+
+        # Этап 1: spaCy пачками, сгруппировав тексты по модели
+        if self.use_spacy:
+            by_service: Dict[NERSpacyService, List[int]] = {}
+            for i, text in enumerate(texts):
+                spacy_service = self._get_model_for_text(text)
+                if spacy_service and spacy_service.nlp:
+                    by_service.setdefault(spacy_service, []).append(i)
+            for spacy_service, indices in by_service.items():
+                try:
+                    batch = spacy_service.extract_with_canonical_names_batch(
+                        [texts[i] for i in indices], batch_size=batch_size
+                    )
+                except Exception as e:
+                    logger.warning(f"Ошибка при использовании spaCy: {e}, fallback на LLM")
+                    continue
+                for i, found in zip(indices, batch):
+                    spacy_results[i] = found
+
+        results = []
+        low_confidence = []
+        for found in spacy_results:
+            if found:
+                high, low = self._split_by_confidence(found, low_confidence_threshold)
+            else:
+                high, low = [], []
+            results.append(high)
+            low_confidence.append(low)
+
+        if not use_llm:
+            return results
+
+        # Этап 2: один вызов LLM на все тексты, которым он нужен
+        need_llm = [
+            i for i in range(len(texts))
+            if self._llm_reasons(bool(spacy_results[i]), results[i], low_confidence[i],
+                                 use_llm_for_low_confidence)
+        ]
+        if not need_llm:
+            return results
+
+        try:
+            llm_batch = self._llm_extract_batch([texts[i] for i in need_llm])
+        except Exception as e:
+            logger.error(f"Ошибка при использовании LLM: {e}")
+            for i in need_llm:
+                results[i] = self._spacy_fallback(results[i], bool(spacy_results[i]), spacy_results[i])
+            return results
+
+        for i, llm_results in zip(need_llm, llm_batch):
+            spacy_used = bool(spacy_results[i])
+            try:
+                results[i] = self._merge_llm_results(
+                    results[i], spacy_used, low_confidence[i], llm_results,
+                    use_llm_for_low_confidence, low_confidence_threshold
+                )
+            except Exception as e:
+                logger.error(f"Ошибка при использовании LLM: {e}")
+                results[i] = self._spacy_fallback(results[i], spacy_used, spacy_results[i])
+        return results
+
+    async def extract_actors_async(self, text: str, **kwargs) -> List[Dict]:
+        """
+        extract_actors для async-кода: spaCy и LLM выполняются в рабочем
+        потоке и не блокируют event loop. Параметры те же, что у extract_actors.
+        Параллельные вызовы на одном экземпляре безопасны: общие кэши
+        защищены _cache_lock.
+        """
+        return await asyncio.to_thread(self.extract_actors, text, **kwargs)
+
+    async def extract_actors_batch_async(self, texts: List[str], **kwargs) -> List[List[Dict]]:
+        """
+        extract_actors_batch для async-кода.
+
+        Вся пачка уходит в один рабочий поток: внутри неё spaCy уже идёт через
+        nlp.pipe(), а LLM получает один батч-запрос, поэтому дробить тексты по
+        отдельным потокам (asyncio.gather) невыгодно. По той же причине не
+        стоит сочетать вынос в поток с nlp.pipe(n_process>1) - нужно выбрать
+        что-то одно.
+        """
+        return await asyncio.to_thread(self.extract_actors_batch, texts, **kwargs)
+
+    def _llm_extract_batch(self, texts: List[str]) -> List[List[Dict]]:
+        """LLM-извлечение для нескольких текстов (батчем, если сервис умеет)"""
+        extract_batch = getattr(self.llm_service, "extract_actors_batch", None)
+        if callable(extract_batch):
+            return extract_batch(texts)
+        return [self.llm_service.extract_actors(text) for text in texts]
+
+    @staticmethod
+    def _split_by_confidence(
+        spacy_results: List[Dict],
+        low_confidence_threshold: float
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Разделить результаты spaCy на высокую и низкую уверенность"""
+        result = []
+        low_confidence_entities = []
+        for actor in spacy_results:
+            confidence = actor.get('confidence', 0.7)
+            if confidence >= low_confidence_threshold:
+                # Высокая уверенность - используем как есть
+                result.append(actor)
+            else:
+                # Низкая уверенность - помечаем для перепроверки
+                low_confidence_entities.append(actor)
+
+        logger.debug(f"spaCy извлек {len(spacy_results)} акторов "
+                     f"({len(result)} высокий confidence, "
+                     f"{len(low_confidence_entities)} низкий confidence)")
+        return result, low_confidence_entities
+
+    @staticmethod
+    def _llm_reasons(
+        spacy_used: bool,
+        result: List[Dict],
+        low_confidence_entities: List[Dict],
+        use_llm_for_low_confidence: bool
+    ) -> List[str]:
+        """Причины вызвать LLM (пустой список — LLM не нужен)"""
+        llm_reason = []
+
+        # Причина 1: Есть сущности с низким confidence для перепроверки
+        if use_llm_for_low_confidence and low_confidence_entities:
+            llm_reason.append(f"{len(low_confidence_entities)} низкий confidence")
+
+        # Причина 2: spaCy не нашел достаточно акторов (возможно что-то пропустил)
+        if spacy_used and len(result) < 3:
+            llm_reason.append("мало результатов от spaCy")
+
+        # Причина 3: spaCy вообще не сработал
+        if not spacy_used:
+            llm_reason.append("spaCy недоступен")
+
+        return llm_reason
+
+    @staticmethod
+    def _merge_llm_results(
+        result: List[Dict],
+        spacy_used: bool,
+        low_confidence_entities: List[Dict],
+        llm_results: List[Dict],
+        use_llm_for_low_confidence: bool,
+        low_confidence_threshold: float
+    ) -> List[Dict]:
+        """Объединить результаты spaCy с результатами LLM"""
+        if not spacy_used:
+            # Fallback: использовать только LLM результаты
+            logger.debug("Использован только LLM (spaCy недоступен)")
+            return llm_results
+
+        # Объединяем результаты
+        result_names = {r['name'].lower() for r in result}
+
+        # Сначала перепроверяем сущности с низким confidence
+        if use_llm_for_low_confidence and low_confidence_entities and llm_results:
+            # Имена LLM: множество для точного совпадения, склейка через \0 для
+            # "имя spaCy внутри имени LLM", альтернация для обратного случая
+            llm_names = {a['name'].lower() for a in llm_results}
+            llm_names_joined = "\0".join(llm_names)
+            llm_names_re = re.compile("|".join(map(re.escape, llm_names)))
+            for low_conf_actor in low_confidence_entities:
+                low_conf_name = low_conf_actor['name'].lower()
+                # Ищем в LLM результатах - есть ли подтверждение?
+                found_in_llm = (
+                    low_conf_name in llm_names or
+                    low_conf_name in llm_names_joined or
+                    llm_names_re.search(low_conf_name) is not None
+                )
+
+                if found_in_llm:
+                    # LLM подтвердил - повышаем confidence
+                    low_conf_actor['confidence'] = min(0.9, low_conf_actor['confidence'] + 0.15)
+                    result.append(low_conf_actor)
+                    result_names.add(low_conf_name)
+                    logger.debug(f"LLM подтвердил: {low_conf_actor['name']} "
+                               f"(confidence: {low_conf_actor['confidence']:.2f})")
+
+        # Добавляем новые сущности из LLM, которых нет в spaCy
+        new_from_llm = 0
+        low_conf_names = {e['name'].lower() for e in low_confidence_entities}
+        for llm_actor in llm_results:
+            llm_name_lower = llm_actor['name'].lower()
+            if llm_name_lower not in result_names:
+                # Проверяем, не было ли это в low_confidence_entities
+                if llm_name_lower not in low_conf_names:
+                    result.append(llm_actor)
+                    result_names.add(llm_name_lower)
+                    new_from_llm += 1
+
+        logger.debug(f"LLM добавил {new_from_llm} новых акторов, "
+                   f"подтвердил {len([a for a in result if a.get('confidence', 0) > low_confidence_threshold + 0.1])} низкоконфиденциальных")
         return result
 
+    @staticmethod
+    def _spacy_fallback(result: List[Dict], spacy_used: bool, spacy_results: List[Dict]) -> List[Dict]:
+        """Результат при ошибке LLM"""
+        # Если была ошибка LLM, но есть результаты от spaCy - используем их
+        if not result and spacy_used:
+            # Возвращаем даже низкоконфиденциальные, лучше что-то чем ничего
+            result.extend(spacy_results)
+            logger.debug("Ошибка LLM, используем все результаты spaCy (включая низкий confidence)")
+        return result
@@ -2,13 +2,31 @@
 Сервис для работы с Wikidata API.
 Используется для канонизации имен акторов и получения метаданных.
 """
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import time
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from backend.models.entities import ActorType
+from backend.utils.lru_cache import LRUCache
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import requests_cache
+    from requests_cache import CachedSession
+    # cache.delete(expired=True) есть только начиная с requests-cache 1.0
+    REQUESTS_CACHE_AVAILABLE = int(requests_cache.__version__.split(".")[0]) >= 1
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +38,14 @@ class WikidataService:
     
     WIKIDATA_API_URL = "https://www.wikidata.org/w/api.php"
     WIKIDATA_SPARQL_URL = "https://query.wikidata.org/sparql"
+    # Свойства-ссылки на сущности: (свойство, ключ metadata).
+    # QID_CLAIMS сохраняются как QID, для LABEL_CLAIMS запрашиваются названия.
+    QID_CLAIMS = (("P31", "instance_of_qids"), ("P106", "occupation_qids"))
+    LABEL_CLAIMS = (("P39", "positions"), ("P27", "countries"))
+
+    # wbgetentities принимает не больше 50 ids за запрос
+    LABELS_BATCH_SIZE = 50
+    USER_AGENT = "SDAS Actor Canonicalization Service/1.0 (https://github.com/your-repo)"
     
     # Mapping of QIDs to ActorTypes
     TYPE_MAPPINGS = {
@@ -71,41 +97,91 @@ class WikidataService:
         "Q3024240": ActorType.COUNTRY, # historical country (USSR)
     }
 
-    def __init__(self, cache_ttl: int = 86400):
+    # Generic P31 types, used only if nothing more specific matched: Human, Organization
+    _GENERIC_QIDS = frozenset({"Q5", "Q43229"})
+    # Country, Sovereign State, Historical Country
+    _COUNTRY_QIDS = frozenset({"Q6256", "Q3624078", "Q3024240"})
+    # P31 types that rule out a person (see _finish_search)
+    _BAD_PERSON_TYPES = frozenset({
+        "Q2095", # food
+        "Q486972", "Q2023000", "Q532", "Q15865662", # settlements/places
+        "Q101352", # family name
+        "Q56061" # administrative territorial entity
+    })
+
+    def __init__(
+        self,
+        cache_ttl: int = 86400,
+        cache_size: int = 10000,
+        cache_dir: Optional[str] = None
+    ):
         """
         Инициализация сервиса Wikidata.
         
         Args:
             cache_ttl: Время жизни кэша в секундах (по умолчанию 24 часа)
+            cache_size: Максимум записей в кэше (давно не используемые вытесняются)
+            cache_dir: Каталог дискового HTTP-кэша, например "data/cache/wikidata"
+                       (нужен requests-cache >= 1.0; по умолчанию None - без него).
+                       Относительный путь считается от текущего каталога.
         """
         self.cache_ttl = cache_ttl
-        self._cache: Dict[str, Dict] = {}
-        self._cache_timestamps: Dict[str, datetime] = {}
+        # ключ -> (время записи по time.monotonic(), значение)
+        self._cache: Dict[str, Tuple[float, Any]] = LRUCache(cache_size)
+
+        # Одна сессия на сервис: keep-alive соединение с wikidata.org
+        # переиспользуется между запросами (без TLS handshake на каждый вызов)
+        self._session = self._create_session(cache_dir)
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries))
+        self._session.headers.update({"User-Agent": self.USER_AGENT})
+
+        # Асинхронный клиент для asearch_entity/aget_entity_info (создаётся лениво)
+        self._aclient = None
+        self._aclient_loop = None
         
         logger.info(f"WikidataService initialized (cache_ttl={cache_ttl}s)")
-    
-    def _is_cache_valid(self, key: str) -> bool:
-        """Проверить, валиден ли кэш для ключа"""
-        if key not in self._cache:
-            return False
-        
-        timestamp = self._cache_timestamps.get(key)
-        if not timestamp:
-            return False
-        
-        age = datetime.utcnow() - timestamp
-        return age.total_seconds() < self.cache_ttl
+
+    def _create_session(self, cache_dir: Optional[str]) -> requests.Session:
+        """
+        HTTP-сессия для sync-запросов.
+
+        С requests-cache GET-ответы дополнительно хранятся в SQLite и
+        переживают перезапуск процесса (in-memory LRU остаётся первым уровнем).
+        """
+        if not (cache_dir and REQUESTS_CACHE_AVAILABLE):
+            return requests.Session()
+
+        cache_path = Path(cache_dir)
+        cache_path.mkdir(parents=True, exist_ok=True)
+        session = CachedSession(
+            str(cache_path / "http_cache"),
+            backend="sqlite",
+            expire_after=self.cache_ttl,
+            allowable_methods=("GET",),
+            stale_if_error=True
+        )
+        session.cache.delete(expired=True)
+        return session
+
+    def close(self):
+        """Закрыть HTTP-сессию"""
+        self._session.close()
     
     def _get_cached(self, key: str) -> Optional[Dict]:
-        """Получить значение из кэша"""
-        if self._is_cache_valid(key):
-            return self._cache[key]
+        """Получить значение из кэша (просроченная запись удаляется)"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        timestamp, value = entry
+        if time.monotonic() - timestamp < self.cache_ttl:
+            return value
+        del self._cache[key]
         return None
     
     def _set_cached(self, key: str, value: Dict):
         """Сохранить значение в кэш"""
-        self._cache[key] = value
-        self._cache_timestamps[key] = datetime.utcnow()
+        self._cache[key] = (time.monotonic(), value)
     
     def search_entity(
         self,
@@ -135,7 +211,7 @@ class WikidataService:
             return None
         
         # Проверяем кэш (добавляем expected_type в ключ, так как результат может зависеть от фильтра)
-        cache_key = f"search:{language}:{name.lower()}:{expected_type or 'any'}"
+        cache_key = self._search_cache_key(name, language, expected_type)
         cached = self._get_cached(cache_key)
         if cached:
             logger.debug(f"Cache hit for '{name}' (type={expected_type})")
@@ -143,18 +219,8 @@ class WikidataService:
         
         try:
             # Поиск через Wikidata Search API
-            params = {
-                "action": "wbsearchentities",
-                "search": name,
-                "language": language,
-                "format": "json",
-                "limit": limit
-            }
-            
-            headers = {
-                'User-Agent': 'SDAS Actor Canonicalization Service/1.0 (https://github.com/your-repo)'
-            }
-            response = requests.get(self.WIKIDATA_API_URL, params=params, headers=headers, timeout=10)
+            params = self._search_params(name, language, limit)
+            response = self._session.get(self.WIKIDATA_API_URL, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -171,118 +237,18 @@ class WikidataService:
             best_match = None
             
             if expected_type:
-                # Нормализуем ожидаемый тип
-                t_lower = expected_type.lower()
-                
                 # Запрашиваем детали для топ-3 результатов, чтобы проверить их instance_of
+                # (по одному, до первого подходящего)
                 top_results = search_results[:3]
-                for res in top_results:
-                    qid = res.get("id")
-                    info = self.get_entity_info(qid, language)
-                    if not info:
-                        continue
-                        
-                    instances = info.get("metadata", {}).get("instance_of_qids", [])
-                    
-                    # Логика проверки типов
-                    is_match = False
-                    
-                    if t_lower in ["person", "politician"]:
-                        # Q5 = Human
-                        if "Q5" in instances:
-                            is_match = True
-                    elif t_lower in ["country"]:
-                        # Q6256=Country, Q3624078=Sovereign State, Q3024240=Historical Country
-                        if any(x in instances for x in ["Q6256", "Q3624078", "Q3024240"]):
-                            is_match = True
-                    elif t_lower in ["organization", "company", "government", "int_org"]:
-                         # Q43229=Org, Q4830453=Business, etc.
-                         # Для организаций проверка сложнее, так как типов много.
-                         # Упрощенно: если это НЕ человек и НЕ географический объект (если не страна)
-                         if "Q5" not in instances:
-                             is_match = True
-
-                    if is_match:
-                        # Дополнительная проверка: если ищем человека, а это "фамилия" (даже если instance of human - вряд ли, но вдруг)
-                        desc = res.get("description", "").lower()
-                        if "family name" in desc or "фамилия" in desc:
-                             # Но если это ТОЧНО Human (Q5), то это не фамилия. 
-                             # Фамилии обычно Q101352.
-                             if "Q101352" in instances:
-                                 is_match = False
-                        
-                        if is_match:
-                            best_match = info
-                            break
+                infos = (self.get_entity_info(res.get("id"), language) for res in top_results)
+                best_match = self._first_type_match(top_results, infos, expected_type)
             
             # Если строгая проверка не дала результата или тип не был указан, используем эвристику
             if not best_match:
-                # Перебираем результаты, чтобы найти наиболее подходящий (как раньше)
-                selected_res_item = None
-                
-                # 1. Проход: ищем известных людей (если не ищем явно организацию)
-                if expected_type not in ["organization", "company", "country"]:
-                    for res in search_results:
-                        desc = res.get("description", "").lower()
-                        # Игнорируем явные "family name"
-                        if "family name" in desc or "фамилия" in desc:
-                            continue
-                        # Приоритет политикам
-                        if "president" in desc or "politician" in desc or "президент" in desc or "политик" in desc:
-                            selected_res_item = res
-                            break
-                
-                # 2. Если не нашли, берем первый, который не "family name"
-                if not selected_res_item:
-                    for res in search_results:
-                        desc = res.get("description", "").lower()
-                        if "family name" not in desc and "фамилия" not in desc:
-                            selected_res_item = res
-                            break
-                
-                # 3. Fallback
-                if not selected_res_item:
-                    selected_res_item = search_results[0]
-                
-                # Получаем полную инфу
-                qid = selected_res_item.get("id")
+                qid = self._select_by_description(search_results, expected_type)
                 best_match = self.get_entity_info(qid, language)
 
-            if best_match:
-                # Финальная проверка: исключаем географические объекты и еду, если искали человека
-                # Это случается, если expected_type был Person, но Strict Check не сработал (например, нет Q5),
-                # и свалились в эвристику, которая выбрала первый результат.
-                
-                instances = best_match.get("metadata", {}).get("instance_of_qids", [])
-                
-                should_discard = False
-                
-                if expected_type in ["person", "politician"]:
-                    # Проверяем на "запрещенные" типы для людей
-                    # Q2095 = food (poutine)
-                    # Q486972 = human settlement (khutor, village, etc.)
-                    # Q101352 = family name (уже проверяли, но на всякий случай)
-                    
-                    # Получаем рекурсивно типы? Нет, это долго. Проверим прямые совпадения.
-                    # Q15865662 (хутор) -> Q2023000 -> Q486972. Wikidata сервис возвращает прямые P31.
-                    # Для Хутора Зеленский P31 = Q2023000 (хутор).
-                    
-                    bad_types = {
-                        "Q2095", # food
-                        "Q486972", "Q2023000", "Q532", "Q15865662", # settlements/places
-                        "Q101352", # family name
-                        "Q56061" # administrative territorial entity
-                    }
-                    
-                    if any(bt in instances for bt in bad_types):
-                        should_discard = True
-                        logger.debug(f"Discarding result {best_match.get('qid')} (bad type for Person)")
-
-                if not should_discard:
-                    self._set_cached(cache_key, best_match)
-                    return best_match
-            
-            return None
+            return self._finish_search(cache_key, best_match, expected_type)
             
         except requests.RequestException as e:
             logger.warning(f"Wikidata search request failed for '{name}': {e}")
@@ -290,6 +256,138 @@ class WikidataService:
         except Exception as e:
             logger.error(f"Unexpected error in Wikidata search for '{name}': {e}")
             return None
+
+    @staticmethod
+    def _search_cache_key(name: str, language: str, expected_type: Optional[str]) -> str:
+        return f"search:{language}:{name.lower()}:{expected_type or 'any'}"
+
+    @staticmethod
+    def _search_params(name: str, language: str, limit: int) -> Dict:
+        return {
+            "action": "wbsearchentities",
+            "search": name,
+            "language": language,
+            "format": "json",
+            "limit": limit
+        }
+
+    @classmethod
+    def _first_type_match(cls, results: List[Dict], infos, expected_type: str) -> Optional[Dict]:
+        """
+        Первый результат поиска, чей instance_of соответствует ожидаемому типу.
+
+        Args:
+            results: Результаты wbsearchentities
+            infos: get_entity_info для каждого результата (в том же порядке)
+            expected_type: Ожидаемый тип актора
+        """
+        # Нормализуем ожидаемый тип
+        t_lower = expected_type.lower()
+
+        for res, info in zip(results, infos):
+            if not info:
+                continue
+                
+            instances = info.get("metadata", {}).get("instance_of_qids", [])
+            
+            # Логика проверки типов
+            is_match = False
+            
+            if t_lower in ["person", "politician"]:
+                # Q5 = Human
+                if "Q5" in instances:
+                    is_match = True
+            elif t_lower in ["country"]:
+                if not cls._COUNTRY_QIDS.isdisjoint(instances):
+                    is_match = True
+            elif t_lower in ["organization", "company", "government", "int_org"]:
+                 # Q43229=Org, Q4830453=Business, etc.
+                 # Для организаций проверка сложнее, так как типов много.
+                 # Упрощенно: если это НЕ человек и НЕ географический объект (если не страна)
+                 if "Q5" not in instances:
+                     is_match = True
+
+            if is_match:
+                # Дополнительная проверка: если ищем человека, а это "фамилия" (даже если instance of human - вряд ли, но вдруг)
+                desc = res.get("description", "").lower()
+                if "family name" in desc or "фамилия" in desc:
+                     # Но если это ТОЧНО Human (Q5), то это не фамилия. 
+                     # Фамилии обычно Q101352.
+                     if "Q101352" in instances:
+                         is_match = False
+                
+                if is_match:
+                    return info
+
+        return None
+
+    @staticmethod
+    def _select_by_description(search_results: List[Dict], expected_type: Optional[str]) -> Optional[str]:
+        """QID наиболее подходящего результата поиска по его описанию"""
+        # Перебираем результаты, чтобы найти наиболее подходящий (как раньше)
+        selected_res_item = None
+        
+        # 1. Проход: ищем известных людей (если не ищем явно организацию)
+        if expected_type not in ["organization", "company", "country"]:
+            for res in search_results:
+                desc = res.get("description", "").lower()
+                # Игнорируем явные "family name"
+                if "family name" in desc or "фамилия" in desc:
+                    continue
+                # Приоритет политикам
+                if "president" in desc or "politician" in desc or "президент" in desc or "политик" in desc:
+                    selected_res_item = res
+                    break
+        
+        # 2. Если не нашли, берем первый, который не "family name"
+        if not selected_res_item:
+            for res in search_results:
+                desc = res.get("description", "").lower()
+                if "family name" not in desc and "фамилия" not in desc:
+                    selected_res_item = res
+                    break
+        
+        # 3. Fallback
+        if not selected_res_item:
+            selected_res_item = search_results[0]
+        
+        return selected_res_item.get("id")
+
+    def _finish_search(
+        self,
+        cache_key: str,
+        best_match: Optional[Dict],
+        expected_type: Optional[str]
+    ) -> Optional[Dict]:
+        """Отбросить неподходящий результат поиска, подходящий - закэшировать"""
+        if best_match:
+            # Финальная проверка: исключаем географические объекты и еду, если искали человека
+            # Это случается, если expected_type был Person, но Strict Check не сработал (например, нет Q5),
+            # и свалились в эвристику, которая выбрала первый результат.
+            
+            instances = best_match.get("metadata", {}).get("instance_of_qids", [])
+            
+            should_discard = False
+            
+            if expected_type in ["person", "politician"]:
+                # Проверяем на "запрещенные" типы для людей
+                # Q2095 = food (poutine)
+                # Q486972 = human settlement (khutor, village, etc.)
+                # Q101352 = family name (уже проверяли, но на всякий случай)
+                
+                # Получаем рекурсивно типы? Нет, это долго. Проверим прямые совпадения.
+                # Q15865662 (хутор) -> Q2023000 -> Q486972. Wikidata сервис возвращает прямые P31.
+                # Для Хутора Зеленский P31 = Q2023000 (хутор).
+                
+                if not self._BAD_PERSON_TYPES.isdisjoint(instances):
+                    should_discard = True
+                    logger.debug(f"Discarding result {best_match.get('qid')} (bad type for Person)")
+
+            if not should_discard:
+                self._set_cached(cache_key, best_match)
+                return best_match
+        
+        return None
     
     def get_entity_info(
         self,
@@ -322,18 +420,8 @@ class WikidataService:
         
         try:
             # Получение информации через Wikidata API
-            params = {
-                "action": "wbgetentities",
-                "ids": qid,
-                "languages": f"{language}|en",  # Получаем на русском и английском
-                "props": "labels|aliases|claims|descriptions",
-                "format": "json"
-            }
-            
-            headers = {
-                'User-Agent': 'SDAS Actor Canonicalization Service/1.0 (https://github.com/your-repo)'
-            }
-            response = requests.get(self.WIKIDATA_API_URL, params=params, headers=headers, timeout=10)
+            params = self._entity_params(qid, language)
+            response = self._session.get(self.WIKIDATA_API_URL, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -343,64 +431,14 @@ class WikidataService:
                 return None
             
             entity = entities[qid]
-            
-            # Извлекаем каноническое имя
-            labels = entity.get("labels", {})
-            canonical_name = None
-            
-            # Приоритет английскому языку для стандартизации графа (латиница)
-            if "en" in labels:
-                canonical_name = labels["en"].get("value")
-            elif language in labels:
-                canonical_name = labels[language].get("value")
-            elif labels:
-                # Берем первое доступное
-                canonical_name = list(labels.values())[0].get("value")
-            
+            canonical_name = self._canonical_name(entity, language)
             if not canonical_name:
                 return None
             
-            # Извлекаем алиасы
-            aliases = []
-            aliases_data = entity.get("aliases", {})
-            
-            # Алиасы на русском
-            if language in aliases_data:
-                for alias_entry in aliases_data[language]:
-                    alias_name = alias_entry.get("value")
-                    if alias_name and alias_name != canonical_name:
-                        aliases.append({
-                            "name": alias_name,
-                            "type": "alias",
-                            "language": language
-                        })
-            
-            # Алиасы на английском
-            if "en" in aliases_data:
-                for alias_entry in aliases_data["en"]:
-                    alias_name = alias_entry.get("value")
-                    if alias_name and alias_name != canonical_name:
-                        # Проверяем на дубликаты
-                        if not any(a["name"].lower() == alias_name.lower() for a in aliases):
-                            aliases.append({
-                                "name": alias_name,
-                                "type": "alias",
-                                "language": "en"
-                            })
-            
             # Извлекаем метаданные
             metadata = self._extract_metadata(entity, language)
             
-            # Определяем тип актора
-            inferred_type = self._determine_actor_type(metadata)
-            
-            result = {
-                "qid": qid,
-                "canonical_name": canonical_name,
-                "aliases": aliases,
-                "metadata": metadata,
-                "type": inferred_type
-            }
+            result = self._entity_result(qid, entity, language, canonical_name, metadata)
             
             # Сохраняем в кэш
             self._set_cached(cache_key, result)
@@ -413,42 +451,240 @@ class WikidataService:
         except Exception as e:
             logger.error(f"Unexpected error getting entity info for {qid}: {e}")
             return None
+
+    @staticmethod
+    def _entity_params(qid: str, language: str) -> Dict:
+        return {
+            "action": "wbgetentities",
+            "ids": qid,
+            "languages": f"{language}|en",  # Получаем на русском и английском
+            "props": "labels|aliases|claims|descriptions",
+            "format": "json"
+        }
+
+    @staticmethod
+    def _canonical_name(entity: Dict, language: str) -> Optional[str]:
+        """Каноническое имя сущности"""
+        labels = entity.get("labels", {})
+        canonical_name = None
+        
+        # Приоритет английскому языку для стандартизации графа (латиница)
+        if "en" in labels:
+            canonical_name = labels["en"].get("value")
+        elif language in labels:
+            canonical_name = labels[language].get("value")
+        elif labels:
+            # Берем первое доступное
+            canonical_name = list(labels.values())[0].get("value")
+        
+        return canonical_name
+
+    def _entity_result(
+        self,
+        qid: str,
+        entity: Dict,
+        language: str,
+        canonical_name: str,
+        metadata: Dict
+    ) -> Dict:
+        """Собрать результат get_entity_info: алиасы и тип актора"""
+        # Извлекаем алиасы
+        aliases = []
+        aliases_data = entity.get("aliases", {})
+        
+        # Алиасы на русском
+        if language in aliases_data:
+            for alias_entry in aliases_data[language]:
+                alias_name = alias_entry.get("value")
+                if alias_name and alias_name != canonical_name:
+                    aliases.append({
+                        "name": alias_name,
+                        "type": "alias",
+                        "language": language
+                    })
+        
+        # Алиасы на английском
+        if "en" in aliases_data:
+            for alias_entry in aliases_data["en"]:
+                alias_name = alias_entry.get("value")
+                if alias_name and alias_name != canonical_name:
+                    # Проверяем на дубликаты
+                    if not any(a["name"].lower() == alias_name.lower() for a in aliases):
+                        aliases.append({
+                            "name": alias_name,
+                            "type": "alias",
+                            "language": "en"
+                        })
+        
+        # Определяем тип актора
+        inferred_type = self._determine_actor_type(metadata)
+        
+        return {
+            "qid": qid,
+            "canonical_name": canonical_name,
+            "aliases": aliases,
+            "metadata": metadata,
+            "type": inferred_type
+        }
+
+    def _async_client(self) -> "httpx.AsyncClient":
+        # Соединения httpx привязаны к event loop; asyncio.run() создаёт новый на каждый вызов
+        loop = asyncio.get_running_loop()
+        if self._aclient_loop is not loop:
+            self._aclient = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(
+                    retries=3,
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+                ),
+                timeout=10,
+                headers={"User-Agent": self.USER_AGENT}
+            )
+            self._aclient_loop = loop
+        return self._aclient
+
+    async def aclose(self):
+        """Закрыть асинхронный HTTP-клиент (из того же event loop, где он использовался)"""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+            self._aclient_loop = None
+
+    async def _aget_json(self, params: Dict) -> Dict:
+        response = await self._async_client().get(self.WIKIDATA_API_URL, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def asearch_entity(
+        self,
+        name: str,
+        language: str = "ru",
+        limit: int = 5,
+        expected_type: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Асинхронный search_entity через httpx.
+
+        Результат тот же, но топ-3 кандидата для строгой проверки типа
+        запрашиваются параллельно (один RTT вместо трёх). Без httpx
+        выполняет search_entity в рабочем потоке.
+        """
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self.search_entity, name, language, limit, expected_type)
+
+        if not name or not name.strip():
+            return None
+
+        cache_key = self._search_cache_key(name, language, expected_type)
+        cached = self._get_cached(cache_key)
+        if cached:
+            logger.debug(f"Cache hit for '{name}' (type={expected_type})")
+            return cached
+
+        try:
+            data = await self._aget_json(self._search_params(name, language, limit))
+            search_results = data.get("search", [])
+
+            if not search_results:
+                logger.debug(f"No Wikidata results for '{name}'")
+                self._set_cached(cache_key, None)
+                return None
+
+            best_match = None
+            if expected_type:
+                top_results = search_results[:3]
+                infos = await asyncio.gather(
+                    *(self.aget_entity_info(res.get("id"), language) for res in top_results)
+                )
+                best_match = self._first_type_match(top_results, infos, expected_type)
+
+            if not best_match:
+                qid = self._select_by_description(search_results, expected_type)
+                best_match = await self.aget_entity_info(qid, language)
+
+            return self._finish_search(cache_key, best_match, expected_type)
+
+        except httpx.HTTPError as e:
+            logger.warning(f"Wikidata search request failed for '{name}': {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error in Wikidata search for '{name}': {e}")
+            return None
+
+    async def aget_entity_info(self, qid: str, language: str = "ru") -> Optional[Dict]:
+        """Асинхронный get_entity_info через httpx (без httpx - в рабочем потоке)"""
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self.get_entity_info, qid, language)
+
+        if not qid or not qid.startswith("Q"):
+            return None
+
+        cache_key = f"entity:{qid}:{language}"
+        cached = self._get_cached(cache_key)
+        if cached:
+            logger.debug(f"Cache hit for QID {qid}")
+            return cached
+
+        try:
+            data = await self._aget_json(self._entity_params(qid, language))
+            entity = data.get("entities", {}).get(qid)
+            if entity is None:
+                return None
+
+            canonical_name = self._canonical_name(entity, language)
+            if not canonical_name:
+                return None
+
+            labels = await self._abatch_get_labels(self._label_qids(entity.get("claims", {})), language)
+            metadata = self._extract_metadata(entity, language, labels)
+
+            result = self._entity_result(qid, entity, language, canonical_name, metadata)
+            self._set_cached(cache_key, result)
+            return result
+
+        except httpx.HTTPError as e:
+            logger.warning(f"Wikidata entity request failed for {qid}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error getting entity info for {qid}: {e}")
+            return None
     
     def _determine_actor_type(self, metadata: Dict) -> Optional[ActorType]:
         """
         Определить тип актора на основе метаданных (P31, P106).
         """
         # Check P106 (Occupation) - Priority 1
-        occupations = metadata.get("occupation_qids", [])
-        for qid in occupations:
-            if qid in self.TYPE_MAPPINGS:
-                return self.TYPE_MAPPINGS[qid]
+        for qid in metadata.get("occupation_qids", []):
+            actor_type = self.TYPE_MAPPINGS.get(qid)
+            if actor_type:
+                return actor_type
         
         # Check P31 (Instance of) - Priority 2
-        instances = metadata.get("instance_of_qids", [])
-        
-        # First pass: Look for SPECIFIC types (excluding generic Human/Organization)
-        # Q5 = Human, Q43229 = Organization
-        generic_qids = {"Q5", "Q43229"}
+        # Specific types win; the first generic one (Human/Organization) is the fallback
+        fallback = None
+        for qid in metadata.get("instance_of_qids", []):
+            actor_type = self.TYPE_MAPPINGS.get(qid)
+            if not actor_type:
+                continue
+            if qid not in self._GENERIC_QIDS:
+                return actor_type
+            if fallback is None:
+                fallback = actor_type
         
-        for qid in instances:
-            if qid in self.TYPE_MAPPINGS and qid not in generic_qids:
-                return self.TYPE_MAPPINGS[qid]
-                
-        # Second pass: Allow generic types
-        for qid in instances:
-            if qid in self.TYPE_MAPPINGS:
-                return self.TYPE_MAPPINGS[qid]
-        
-        return None
+        return fallback
 
-    def _extract_metadata(self, entity: Dict, language: str) -> Dict:
+    def _extract_metadata(
+        self,
+        entity: Dict,
+        language: str,
+        labels: Optional[Dict[str, str]] = None
+    ) -> Dict:
         """
         Извлечь метаданные из данных Wikidata.
         
         Args:
             entity: Данные сущности из Wikidata API
             language: Язык для получения меток
+            labels: Уже полученные метки должностей и стран (иначе запрашиваются)
             
         Returns:
             Словарь с метаданными
@@ -456,63 +692,23 @@ class WikidataService:
         metadata = {}
         claims = entity.get("claims", {})
 
-        # Instance of (P31)
-        instance_of_qids = []
-        if "P31" in claims:
-            for claim in claims["P31"]:
-                mainsnak = claim.get("mainsnak", {})
-                datavalue = mainsnak.get("datavalue", {})
-                if datavalue.get("type") == "wikibase-entityid":
-                    qid = datavalue.get("value", {}).get("id")
-                    if qid:
-                        instance_of_qids.append(qid)
-        metadata["instance_of_qids"] = instance_of_qids
-
-        # Occupation (P106)
-        occupation_qids = []
-        if "P106" in claims:
-            for claim in claims["P106"]:
-                mainsnak = claim.get("mainsnak", {})
-                datavalue = mainsnak.get("datavalue", {})
-                if datavalue.get("type") == "wikibase-entityid":
-                    qid = datavalue.get("value", {}).get("id")
-                    if qid:
-                        occupation_qids.append(qid)
-        metadata["occupation_qids"] = occupation_qids
-        
-        # Должности (P39 - position held)
-        positions = []
-        if "P39" in claims:
-            for claim in claims["P39"]:
-                mainsnak = claim.get("mainsnak", {})
-                datavalue = mainsnak.get("datavalue", {})
-                if datavalue.get("type") == "wikibase-entityid":
-                    position_qid = datavalue.get("value", {}).get("id")
-                    if position_qid:
-                        # Получаем название должности
-                        position_name = self._get_label_for_qid(position_qid, language)
-                        if position_name:
-                            positions.append(position_name)
-        
-        if positions:
-            metadata["positions"] = positions
-        
-        # Страна гражданства (P27 - country of citizenship)
-        countries = []
-        if "P27" in claims:
-            for claim in claims["P27"]:
-                mainsnak = claim.get("mainsnak", {})
-                datavalue = mainsnak.get("datavalue", {})
-                if datavalue.get("type") == "wikibase-entityid":
-                    country_qid = datavalue.get("value", {}).get("id")
-                    if country_qid:
-                        country_name = self._get_label_for_qid(country_qid, language)
-                        if country_name:
-                            countries.append(country_name)
+        # Instance of (P31), Occupation (P106)
+        for prop, key in self.QID_CLAIMS:
+            metadata[key] = self._extract_entity_qids(claims, prop)
+
+        # Должности (P39) и страны гражданства (P27): названия всех QID -
+        # одним запросом wbgetentities
+        label_qids = {key: self._extract_entity_qids(claims, prop) for prop, key in self.LABEL_CLAIMS}
+        if labels is None:
+            labels = self._batch_get_labels([qid for qids in label_qids.values() for qid in qids], language)
+
+        for key, qids in label_qids.items():
+            names = [labels[qid] for qid in qids if qid in labels]
+            if names:
+                metadata[key] = names
         
-        if countries:
-            metadata["countries"] = countries
-            metadata["country"] = countries[0]  # Основная страна
+        if "countries" in metadata:
+            metadata["country"] = metadata["countries"][0]  # Основная страна
         
         # Дата рождения (P569)
         if "P569" in claims:
@@ -533,6 +729,20 @@ class WikidataService:
         
         return metadata
     
+    @staticmethod
+    def _extract_entity_qids(claims: Dict, prop: str) -> List[str]:
+        """QID-значения утверждений свойства prop (mainsnak.datavalue.value.id)"""
+        return [
+            datavalue["value"]["id"]
+            for claim in claims.get(prop, ())
+            if (datavalue := claim.get("mainsnak", {}).get("datavalue", {})).get("type") == "wikibase-entityid"
+            and datavalue.get("value", {}).get("id")
+        ]
+
+    def _label_qids(self, claims: Dict) -> List[str]:
+        """QID, метки которых нужны _extract_metadata"""
+        return [qid for prop, _ in self.LABEL_CLAIMS for qid in self._extract_entity_qids(claims, prop)]
+    
     def _get_label_for_qid(self, qid: str, language: str) -> Optional[str]:
         """
         Получить метку (название) для QID.
@@ -559,23 +769,15 @@ class WikidataService:
                 "format": "json"
             }
             
-            headers = {
-                'User-Agent': 'SDAS Actor Canonicalization Service/1.0 (https://github.com/your-repo)'
-            }
-            response = requests.get(self.WIKIDATA_API_URL, params=params, headers=headers, timeout=5)
+            response = self._session.get(self.WIKIDATA_API_URL, params=params, timeout=5)
             response.raise_for_status()
             
             data = response.json()
             entities = data.get("entities", {})
             
             if qid in entities:
-                labels = entities[qid].get("labels", {})
-                if language in labels:
-                    label = labels[language].get("value")
-                    self._set_cached(cache_key, label)
-                    return label
-                elif "en" in labels:
-                    label = labels["en"].get("value")
+                label = self._pick_label(entities[qid].get("labels", {}), language)
+                if label:
                     self._set_cached(cache_key, label)
                     return label
             
@@ -585,3 +787,95 @@ class WikidataService:
             logger.debug(f"Failed to get label for {qid}: {e}")
             return None
 
+    def _batch_get_labels(self, qids: List[str], language: str) -> Dict[str, str]:
+        """
+        Получить метки для нескольких QID.
+
+        Закэшированные метки берутся из кэша, остальные запрашиваются одним
+        wbgetentities на каждые LABELS_BATCH_SIZE QID (вместо запроса на QID).
+
+        Args:
+            qids: QID сущностей (повторы допустимы)
+            language: Язык меток
+
+        Returns:
+            Словарь QID -> название (QID без метки отсутствуют)
+        """
+        result, missing = self._cached_labels(qids, language)
+
+        if len(missing) == 1:
+            label = self._get_label_for_qid(missing[0], language)
+            if label:
+                result[missing[0]] = label
+            return result
+
+        for chunk in self._label_chunks(missing):
+            try:
+                params = self._labels_params(chunk, language)
+                response = self._session.get(self.WIKIDATA_API_URL, params=params, timeout=10)
+                response.raise_for_status()
+                entities = response.json().get("entities", {})
+            except Exception as e:
+                logger.debug(f"Failed to get labels for {len(chunk)} QIDs: {e}")
+                continue
+            self._store_labels(entities, chunk, language, result)
+
+        return result
+
+    async def _abatch_get_labels(self, qids: List[str], language: str) -> Dict[str, str]:
+        """_batch_get_labels через httpx, пачки запрашиваются параллельно"""
+        result, missing = self._cached_labels(qids, language)
+        chunks = self._label_chunks(missing)
+        responses = await asyncio.gather(
+            *(self._aget_json(self._labels_params(chunk, language)) for chunk in chunks),
+            return_exceptions=True
+        )
+        for chunk, data in zip(chunks, responses):
+            if isinstance(data, Exception):
+                logger.debug(f"Failed to get labels for {len(chunk)} QIDs: {data}")
+                continue
+            self._store_labels(data.get("entities", {}), chunk, language, result)
+        return result
+
+    def _cached_labels(self, qids: List[str], language: str) -> Tuple[Dict[str, str], List[str]]:
+        """Метки из кэша и список QID (без повторов), которых в кэше нет"""
+        result = {}
+        missing = []
+        for qid in dict.fromkeys(qids):
+            cached = self._get_cached(f"label:{qid}:{language}")
+            if cached:
+                result[qid] = cached
+            else:
+                missing.append(qid)
+        return result, missing
+
+    def _label_chunks(self, qids: List[str]) -> List[List[str]]:
+        return [qids[start:start + self.LABELS_BATCH_SIZE] for start in range(0, len(qids), self.LABELS_BATCH_SIZE)]
+
+    @staticmethod
+    def _labels_params(qids: List[str], language: str) -> Dict:
+        return {
+            "action": "wbgetentities",
+            "ids": "|".join(qids),
+            "languages": f"{language}|en",
+            "props": "labels",
+            "format": "json"
+        }
+
+    def _store_labels(self, entities: Dict, qids: List[str], language: str, result: Dict[str, str]):
+        """Положить найденные метки в result и в кэш"""
+        for qid in qids:
+            label = self._pick_label(entities.get(qid, {}).get("labels", {}), language)
+            if label:
+                self._set_cached(f"label:{qid}:{language}", label)
+                result[qid] = label
+
+    @staticmethod
+    def _pick_label(labels: Dict, language: str) -> Optional[str]:
+        """Метка на нужном языке, иначе английская"""
+        if language in labels:
+            return labels[language].get("value")
+        if "en" in labels:
+            return labels["en"].get("value")
+        return None
+
@@ -0,0 +1,72 @@
+"""
+Traversal kernels over a CSR adjacency (indptr, indices, weights)
+JIT-compiled with Numba when available; plain Python otherwise
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernels stay importable without Numba"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def bfs_within_depth(indptr, indices, start, depth):
+    """Rows reachable from `start` in 1..depth hops (start excluded), BFS order"""
+    n = len(indptr) - 1
+    visited = np.zeros(n, dtype=np.bool_)
+    visited[start] = True
+    frontier = np.empty(n, dtype=np.int32)
+    next_frontier = np.empty(n, dtype=np.int32)
+    out = np.empty(n, dtype=np.int32)
+    frontier[0] = start
+    frontier_len = 1
+    out_len = 0
+
+    for _ in range(depth):
+        next_len = 0
+        for k in range(frontier_len):
+            u = frontier[k]
+            for p in range(indptr[u], indptr[u + 1]):
+                v = indices[p]
+                if not visited[v]:
+                    visited[v] = True
+                    next_frontier[next_len] = v
+                    next_len += 1
+                    out[out_len] = v
+                    out_len += 1
+        if next_len == 0:
+            break
+        frontier, next_frontier = next_frontier, frontier
+        frontier_len = next_len
+
+    return out[:out_len]
+
+
+@njit(cache=True)
+def mean_internal_weight(indptr, indices, weights, rows):
+    """Mean weight of edges with both endpoints in `rows` (unique row ids)"""
+    n = len(indptr) - 1
+    member = np.zeros(n, dtype=np.bool_)
+    for r in rows:
+        member[r] = True
+
+    total = 0.0
+    count = 0
+    for r in rows:
+        for p in range(indptr[r], indptr[r + 1]):
+            if member[indices[p]]:
+                total += weights[p]
+                count += 1
+
+    # Each undirected edge is seen from both ends; the mean is unaffected
+    if count == 0:
+        return 0.0
+    return total / count
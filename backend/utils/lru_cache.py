@@ -0,0 +1,38 @@
+"""
+Size-bounded dict with least-recently-used eviction
+Drop-in for the plain dict caches in GraphManager
+"""
+from collections import OrderedDict
+
+
+class LRUCache(OrderedDict):
+    """OrderedDict that evicts the least recently read/written key past maxsize"""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    # OrderedDict rebuilds copies/pickles via cls() with no arguments
+    def __reduce__(self):
+        return self.__class__, (self.maxsize,), None, None, iter(self.items())
+
+    def copy(self):
+        clone = self.__class__(self.maxsize)
+        clone.update(self.items())
+        return clone
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
@@ -0,0 +1,176 @@
+"""
+Pairwise cosine similarity over news embedding matrices
+Used to build news relations in memory instead of one vector query per news
+"""
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# "numpy" (tiled BLAS matmul, default) or "numba" (parallel prange kernel).
+# BLAS sgemm is already multithreaded and faster per core; the Numba kernel
+# helps when NumPy is linked against a single-threaded BLAS.
+SIMILARITY_BACKEND = os.getenv("SIMILARITY_BACKEND", "numpy").lower()
+
+# Below this many rows Numba JIT compile time outweighs the parallel speedup
+NUMBA_MIN_ROWS = 1000
+
+# Rows per matmul tile in the NumPy path (temporary is BLOCK_SIZE x N floats)
+BLOCK_SIZE = 1024
+
+
+def normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize rows as contiguous float32; zero vectors stay zero"""
+    matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def similar_pairs(
+    embeddings: np.ndarray,
+    threshold: float,
+    use_numba: Optional[bool] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find all row pairs (i < j) with cosine similarity >= threshold
+
+    Args:
+        embeddings: (N, D) embedding matrix (normalized here)
+        threshold: Minimum cosine similarity
+        use_numba: Force/disable the Numba path (default: SIMILARITY_BACKEND
+                   and NUMBA_MIN_ROWS decide); ignored if numba is missing
+
+    Returns:
+        (rows_i, rows_j, similarities) arrays of equal length
+    """
+    matrix = normalize_rows(embeddings)
+    n = matrix.shape[0]
+    if n < 2:
+        return (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.float32))
+
+    if use_numba is None:
+        use_numba = SIMILARITY_BACKEND == "numba" and n >= NUMBA_MIN_ROWS
+
+    # Without numba installed the kernels are not defined; use the NumPy path
+    if use_numba and NUMBA_AVAILABLE:
+        rows_i, rows_j, sims = _similar_pairs_numba(matrix, np.float32(threshold))
+    else:
+        rows_i, rows_j, sims = _similar_pairs_blocked(matrix, threshold)
+
+    # float32 rounding can push self-similar pairs slightly above 1.0
+    return rows_i, rows_j, np.minimum(sims, 1.0)
+
+
+def _similar_pairs_blocked(
+    matrix: np.ndarray,
+    threshold: float,
+    block_size: int = BLOCK_SIZE
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """NumPy path: tile rows, one sgemm per tile against the upper triangle"""
+    n = matrix.shape[0]
+    out_i, out_j, out_s = [], [], []
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        sims = matrix[start:stop] @ matrix[start:].T
+        rows, cols = np.nonzero(sims >= threshold)
+        # Both axes are offset by `start`, so j > i  <=>  col > row
+        upper = cols > rows
+        rows, cols = rows[upper], cols[upper]
+        out_i.append(rows + start)
+        out_j.append(cols + start)
+        out_s.append(sims[rows, cols])
+
+    return (np.concatenate(out_i).astype(np.int64),
+            np.concatenate(out_j).astype(np.int64),
+            np.concatenate(out_s).astype(np.float32))
+
+
+if NUMBA_AVAILABLE:
+
+    # No fastmath: the count and fill passes must make identical >= threshold
+    # decisions, and reassociated reductions are not guaranteed to agree.
+
+    @njit(cache=True)
+    def _count_row(matrix, i, threshold):
+        n, dim = matrix.shape
+        count = 0
+        for j in range(i + 1, n):
+            dot = 0.0
+            for d in range(dim):
+                dot += matrix[i, d] * matrix[j, d]
+            if dot >= threshold:
+                count += 1
+        return count
+
+    @njit(cache=True)
+    def _fill_row(matrix, i, threshold, pos, stop, out_i, out_j, out_s):
+        n, dim = matrix.shape
+        for j in range(i + 1, n):
+            if pos == stop:
+                break
+            dot = 0.0
+            for d in range(dim):
+                dot += matrix[i, d] * matrix[j, d]
+            if dot >= threshold:
+                out_i[pos] = i
+                out_j[pos] = j
+                out_s[pos] = dot
+                pos += 1
+        return pos
+
+    # Row i has N-i-1 candidates, so each prange iteration takes rows k and
+    # N-1-k together to give every thread the same amount of work.
+
+    @njit(parallel=True, cache=True)
+    def _count_pairs(matrix, threshold):
+        n = matrix.shape[0]
+        counts = np.zeros(n, dtype=np.int64)
+        for k in prange((n + 1) // 2):
+            counts[k] = _count_row(matrix, k, threshold)
+            mirror = n - 1 - k
+            if mirror != k:
+                counts[mirror] = _count_row(matrix, mirror, threshold)
+        return counts
+
+    @njit(parallel=True, cache=True)
+    def _fill_pairs(matrix, threshold, offsets, out_i, out_j, out_s):
+        # Writes never go past a row's slot; returns per-row fill counts so
+        # the caller can check them against the count pass
+        n = matrix.shape[0]
+        filled = np.zeros(n, dtype=np.int64)
+        for k in prange((n + 1) // 2):
+            filled[k] = _fill_row(matrix, k, threshold, offsets[k], offsets[k + 1],
+                                  out_i, out_j, out_s) - offsets[k]
+            mirror = n - 1 - k
+            if mirror != k:
+                filled[mirror] = _fill_row(matrix, mirror, threshold, offsets[mirror],
+                                           offsets[mirror + 1], out_i, out_j, out_s) - offsets[mirror]
+        return filled
+
+
+def _similar_pairs_numba(
+    matrix: np.ndarray,
+    threshold: np.float32
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Numba path: parallel count pass, prefix sum, then parallel fill pass"""
+    counts = _count_pairs(matrix, threshold)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    total = int(offsets[-1])
+
+    out_i = np.empty(total, dtype=np.int64)
+    out_j = np.empty(total, dtype=np.int64)
+    out_s = np.empty(total, dtype=np.float32)
+    filled = _fill_pairs(matrix, threshold, offsets, out_i, out_j, out_s)
+    if not np.array_equal(filled, counts):
+        raise RuntimeError("Numba similarity fill pass disagrees with count pass")
+    return out_i, out_j, out_s
@@ -958,3 +958,124 @@ class TestPerformance:
         # Vector search should be fast (< 1 second for 20 items)
         assert elapsed < 1.0
         assert isinstance(results, list)
+
+
+def test_parse_embeddings_copy():
+    """Decode a COPY BINARY payload without a database"""
+    import struct
+
+    def row(news_id, vector):
+        id_bytes = news_id.encode("utf-8")
+        vec_bytes = struct.pack(">HH", len(vector), 0) + struct.pack(f">{len(vector)}f", *vector)
+        return (struct.pack(">h", 2)
+                + struct.pack(">i", len(id_bytes)) + id_bytes
+                + struct.pack(">i", len(vec_bytes)) + vec_bytes)
+
+    data = (b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+            + row("news_1", [0.5, -1.0, 2.0])
+            + row("news_ü", [1.0, 0.0, 0.25])
+            + struct.pack(">h", -1))
+
+    ids, matrix = DatabaseManager._parse_embeddings_copy(data)
+
+    assert ids == ["news_1", "news_ü"]
+    assert matrix.dtype == np.float32
+    np.testing.assert_array_equal(matrix, [[0.5, -1.0, 2.0], [1.0, 0.0, 0.25]])
+
+
+def test_row_to_event_accepts_prefetched_actors():
+    """JSON-aggregated rows (timestamps as ISO strings) decode without extra queries"""
+    db = DatabaseManager.__new__(DatabaseManager)
+    row = {
+        "id": "event_1", "news_id": "news_1", "story_id": None, "event_type": "fact",
+        "title": "Title", "description": None, "event_date": "2025-01-02T03:04:05",
+        "extracted_at": "2025-01-03T00:00:00", "source_trust": 0.5, "confidence": 0.7,
+    }
+
+    event = db._row_to_event(row, actors=["actor_1"])
+
+    assert event.actors == ["actor_1"]
+    assert event.event_date == datetime(2025, 1, 2, 3, 4, 5)
+    assert event.event_type == EventType.FACT
+
+
+def make_offline_db():
+    """DatabaseManager over a mocked pool (no PostgreSQL needed)"""
+    import threading
+    import weakref
+    from unittest.mock import MagicMock
+
+    db = DatabaseManager.__new__(DatabaseManager)
+    db._local = threading.local()
+    db._prepared = weakref.WeakKeyDictionary()
+    db.pool = MagicMock()
+    return db
+
+
+def test_transaction_shares_one_connection():
+    """Calls inside transaction() reuse its connection and commit once"""
+    db = make_offline_db()
+    conn = db.pool.getconn.return_value
+
+    with db.transaction() as tx_conn:
+        with db.get_connection() as inner:
+            assert inner is tx_conn is conn
+        with db.transaction() as nested:
+            assert nested is conn
+        conn.commit.assert_not_called()
+
+    conn.commit.assert_called_once()
+    db.pool.getconn.assert_called_once()
+    db.pool.putconn.assert_called_once_with(conn)
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            with db.get_connection():
+                raise RuntimeError("boom")
+    conn.rollback.assert_called_once()
+    assert db._local.conn is None
+
+
+def test_relations_copy_upsert_twice_in_one_transaction():
+    """The temp table is dropped after each upsert, so a second one in the same transaction works"""
+    db = make_offline_db()
+    conn = db.pool.getconn.return_value
+    cur = conn.cursor.return_value.__enter__.return_value
+    temp_tables = set()
+
+    def execute(sql, params=None):
+        words = sql.split()
+        if words[:3] == ["CREATE", "TEMP", "TABLE"]:
+            if words[3] in temp_tables:
+                raise RuntimeError(f"relation {words[3]} already exists")
+            temp_tables.add(words[3])
+        elif words[:2] == ["DROP", "TABLE"]:
+            temp_tables.remove(words[2])
+
+    cur.execute.side_effect = execute
+    relation = NewsRelation(source_news_id="n1", target_news_id="n2", similarity=0.8,
+                            weight=0.5, is_editorial=True)
+
+    with db.transaction():
+        db.upsert_news_relations_copy([relation])
+        db.upsert_news_relations_copy([relation])
+
+    assert temp_tables == set()
+    assert cur.copy_expert.call_count == 2
+    conn.commit.assert_called_once()
+
+
+def test_hot_statements_are_prepared_once_per_connection():
+    """PREPARE runs on first use per connection, later calls only EXECUTE"""
+    db = make_offline_db()
+    conn = db.pool.getconn.return_value
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.connection = conn
+
+    db.update_news_relation_editorial("n1", "n2", 0.4)
+    db.update_news_relation_editorial("n1", "n3", 0.6)
+
+    statements = [c.args[0] for c in cur.execute.call_args_list]
+    assert sum(s.startswith("PREPARE update_editorial_relation") for s in statements) == 1
+    assert statements.count("EXECUTE update_editorial_relation (%s, %s, %s)") == 2
+    assert cur.execute.call_args.args[1] == (0.6, "n1", "n3")
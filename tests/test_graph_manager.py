@@ -0,0 +1,390 @@
+"""
+Unit tests for GraphManager in-memory indexes and graph operations.
+The database layer is mocked, so these run without PostgreSQL.
+"""
+import pytest
+import networkx as nx
+import numpy as np
+from unittest.mock import MagicMock
+from datetime import datetime
+
+from backend.models.entities import (
+    News, Actor, ActorType, Story, NewsRelation, Event, EventType
+)
+from backend.services.database_manager import DatabaseManager
+from backend.services import graph_manager
+from backend.utils import graph_kernels
+from backend.services.graph_manager import GraphManager
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock(spec=DatabaseManager)
+    db.get_all_actors.return_value = []
+    db.find_actor_by_name_ci.return_value = None
+    db.get_news.return_value = None
+    db.get_news_bulk.return_value = {}
+    db.get_news_actor_pairs.return_value = []
+    db.get_story.return_value = None
+    db.get_actor.return_value = None
+    db.get_all_news.return_value = []
+    return db
+
+
+@pytest.fixture
+def gm(mock_db):
+    return GraphManager(db_manager=mock_db)
+
+
+def make_news(news_id, actors=None, embedding=None):
+    return News(
+        id=news_id,
+        title=f"Title {news_id}",
+        summary="summary",
+        source="test",
+        published_at=datetime(2025, 1, 1),
+        embedding=embedding,
+        mentioned_actors=list(actors or []),
+    )
+
+
+def test_ensure_actor_uses_name_index(gm, mock_db):
+    first = gm.ensure_actor("Elon Musk", "person")
+    second = gm.ensure_actor("elon musk", "person")
+
+    assert first == second
+    # DB is scanned once to seed the index, not on every call
+    assert mock_db.get_all_actors.call_count == 1
+    assert mock_db.save_actor.call_count == 1
+
+
+def test_ensure_actor_matches_existing_db_actor_and_alias(gm, mock_db):
+    mock_db.get_all_actors.return_value = [
+        Actor(
+            id="actor_tesla",
+            canonical_name="Tesla",
+            actor_type=ActorType.COMPANY,
+            aliases=[{"name": "Tesla Inc.", "type": "alias"}],
+        )
+    ]
+
+    assert gm.ensure_actor("TESLA", "company") == "actor_tesla"
+    assert gm.ensure_actor("tesla inc.", "company") == "actor_tesla"
+    mock_db.save_actor.assert_not_called()
+
+
+def test_ensure_actor_falls_back_to_db_lookup(gm, mock_db):
+    mock_db.find_actor_by_name_ci.return_value = "actor_other"
+
+    assert gm.ensure_actor("Added Elsewhere", "person") == "actor_other"
+    assert gm.ensure_actor("added elsewhere", "person") == "actor_other"
+    mock_db.find_actor_by_name_ci.assert_called_once_with("Added Elsewhere")
+    mock_db.save_actor.assert_not_called()
+
+
+def test_add_mention_skips_duplicates(gm, mock_db):
+    gm.add_news(make_news("n1", ["a1"]))
+    mock_db.save_news.reset_mock()
+
+    gm.add_mention("n1", "a1")
+    gm.add_mention("n1", "a2")
+    gm.add_mention("n1", "a2")
+
+    news = gm.get_news("n1")
+    assert news.mentioned_actors == ["a1", "a2"]
+    assert news.mentioned_actors_set == {"a1", "a2"}
+    news.mentioned_actors = ["a1", "a3"]  # assignment rebuilds the set
+    assert news.mentioned_actors_set == {"a1", "a3"}
+    news.mentioned_actors = ["a1", "a2"]
+    mock_db.insert_news_actors_bulk.assert_called_once_with([("n1", "a2", 0.5)])
+    mock_db.save_news.assert_not_called()
+
+
+def test_add_mentions_bulk_writes_once(gm, mock_db):
+    gm.add_news(make_news("n1", ["a1"]))
+
+    gm.add_mentions_bulk("n1", ["a1", "a2", "a3"], [0.9, 0.8, 0.7])
+
+    mock_db.insert_news_actors_bulk.assert_called_once_with([("n1", "a2", 0.8), ("n1", "a3", 0.7)])
+    assert set(gm.mentions_graph["news_n1"]) == {"actor_a1", "actor_a2", "actor_a3"}
+    assert gm.get_news("n1").mentioned_actors == ["a1", "a2", "a3"]
+
+
+def test_update_story_top_actors_counts_in_db(gm, mock_db):
+    story = Story(id="s1", title="Story", summary="", news_ids=["n1", "n2", "n3"])
+    gm._stories_cache[story.id] = story
+    mock_db.get_top_actors_for_news_ids.return_value = ["a2", "a3"]
+
+    gm.update_story_top_actors("s1", top_n=2)
+
+    mock_db.get_top_actors_for_news_ids.assert_called_once_with(["n1", "n2", "n3"], 2)
+    mock_db.get_news.assert_not_called()
+    assert story.top_actors == ["a2", "a3"]
+    mock_db.save_story.assert_called_with(story)
+
+
+def test_component_count_tracks_graph(gm):
+    for news_id in ("n1", "n2", "n3", "n4"):
+        gm.add_news(make_news(news_id))
+    gm.add_news_relation(NewsRelation(source_news_id="n1", target_news_id="n2", similarity=0.9))
+    gm.add_news_relation(NewsRelation(source_news_id="n3", target_news_id="n2", similarity=0.8))
+    gm.add_news_relation(NewsRelation(source_news_id="n1", target_news_id="n3", similarity=0.7))
+    gm.add_news(make_news("n1"))
+
+    assert gm._num_components == nx.number_connected_components(gm.news_graph) == 2
+
+
+def test_rebuild_component_index_after_direct_load(gm):
+    gm.news_graph.add_edge("n1", "n2")
+    gm.news_graph.add_node("n3")
+
+    gm.rebuild_component_index()
+
+    assert gm._num_components == 2
+
+
+def test_embedding_stored_as_float32_array(gm):
+    gm.add_news(make_news("n1", embedding=[0.1, 0.2, 0.3]))
+    gm.add_news(make_news("n2", embedding=[0.4, 0.5, 0.6]))
+
+    vec = gm.news_graph.nodes["n1"]["embedding"]
+    assert isinstance(vec, np.ndarray) and vec.dtype == np.float32
+
+    matrix = gm.get_embedding_matrix([gm.get_news("n1"), gm.get_news("n2")])
+    assert matrix.shape == (2, 3)
+    assert matrix.dtype == np.float32
+
+
+@pytest.mark.parametrize("bitset_max_actors", [4096, 0])
+def test_boost_similarity_by_shared_actors(gm, mock_db, monkeypatch, bitset_max_actors):
+    # 0 forces the sparse-matrix path instead of packed bitsets
+    monkeypatch.setattr(graph_manager, "MENTION_BITSET_MAX_ACTORS", bitset_max_actors)
+    gm.add_news(make_news("n1", ["a1", "a2"]))
+    gm.add_news(make_news("n2", ["a1", "a2", "a3"]))
+    gm.add_news(make_news("n3", ["a4"]))
+    gm.add_news_relation(NewsRelation(source_news_id="n1", target_news_id="n2", similarity=0.5, weight=0.5))
+    gm.add_news_relation(NewsRelation(source_news_id="n2", target_news_id="n3", similarity=0.5, weight=0.5))
+
+    gm.boost_similarity_by_shared_actors(boost_factor=0.1)
+
+    assert gm.news_graph["n1"]["n2"]["weight"] == pytest.approx(0.7)
+    assert gm.news_graph["n2"]["n3"]["weight"] == pytest.approx(0.5)
+    mock_db.update_news_relation_weights.assert_called_once()
+    (updates,), _ = mock_db.update_news_relation_weights.call_args
+    assert [(u, v) for u, v, _ in updates] == [("n1", "n2")]
+
+    # New mentions invalidate the cached mention matrix
+    gm.add_mention("n3", "a3")
+    gm.boost_similarity_by_shared_actors(boost_factor=0.1)
+    assert gm.news_graph["n2"]["n3"]["weight"] == pytest.approx(0.6)
+
+
+def make_event(event_id, day, story_id="s1"):
+    return Event(
+        id=event_id,
+        news_id="n1",
+        story_id=story_id,
+        event_type=EventType.FACT,
+        title=event_id,
+        event_date=datetime(2025, 1, day),
+    )
+
+
+def test_story_events_stay_sorted_after_inserts(gm, mock_db):
+    mock_db.get_story_events.return_value = [make_event("e1", 1), make_event("e3", 3)]
+    assert [e.id for e in gm.get_story_events("s1")] == ["e1", "e3"]
+
+    gm.add_event(make_event("e4", 4))
+    gm.add_event(make_event("e2", 2))
+    gm.add_event(make_event("e1", 5))  # re-saved with a later date
+
+    assert [e.id for e in gm.get_story_events("s1")] == ["e2", "e3", "e4", "e1"]
+    assert mock_db.get_story_events.call_count == 1
+
+
+def test_mention_sets_load_uncached_news_from_db(gm, mock_db):
+    gm.add_news(make_news("n1", ["a1", "a2"]))
+    gm.news_graph.add_node("n2")  # known to the graph, not cached
+    mock_db.get_news_actor_pairs.return_value = [("n2", "a2"), ("n2", "a3")]
+
+    actor_sets = gm._build_actor_sets()
+
+    mock_db.get_news_actor_pairs.assert_called_once_with(["n2"])
+    assert len(actor_sets["n1"] & actor_sets["n2"]) == 1
+    assert all(isinstance(s, frozenset) for s in actor_sets.values())
+
+
+def test_calculate_cluster_cohesion(gm):
+    for news_id in ("n1", "n2", "n3"):
+        gm.add_news(make_news(news_id))
+    gm.add_news_relation(NewsRelation(source_news_id="n1", target_news_id="n2", similarity=0.8, weight=0.8))
+    gm.add_news_relation(NewsRelation(source_news_id="n2", target_news_id="n3", similarity=0.4, weight=0.4))
+
+    assert gm.calculate_cluster_cohesion(["n1", "n2", "n3"]) == pytest.approx(0.6)
+    assert gm.calculate_cluster_cohesion(["n1", "n3"]) == 0.0
+    assert gm.calculate_cluster_cohesion(["n1"]) == 1.0
+
+
+@pytest.fixture(params=[False, True], ids=["networkx", "csr"])
+def traversal_path(request, monkeypatch):
+    # The CSR kernels run as plain Python when Numba is not installed
+    monkeypatch.setattr(graph_kernels, "NUMBA_AVAILABLE", request.param)
+    return request.param
+
+
+def test_node_neighbors_and_cohesion_paths_agree(gm, traversal_path):
+    for news_id in ("n1", "n2", "n3", "n4", "n5"):
+        gm.add_news(make_news(news_id))
+    for source, target, weight in [("n1", "n2", 0.9), ("n2", "n3", 0.5), ("n3", "n4", 0.4)]:
+        gm.add_news_relation(NewsRelation(source_news_id=source, target_news_id=target,
+                                          similarity=weight, weight=weight))
+
+    assert sorted(gm.get_node_neighbors("n2")) == ["n1", "n3"]
+    assert sorted(gm.get_node_neighbors("n1", depth=2)) == ["n2", "n3"]
+    assert gm.get_node_neighbors("n5", depth=3) == []
+    assert gm.calculate_cluster_cohesion(["n1", "n2", "n3"]) == pytest.approx(0.7)
+
+    # Weight edits invalidate the CSR snapshot
+    gm.update_editorial_edge("n1", "n2", 0.1)
+    assert gm.calculate_cluster_cohesion(["n1", "n2"]) == pytest.approx(0.1)
+
+
+def test_add_news_adds_mention_edges(gm):
+    gm.add_news(make_news("n1", ["a1", "a2"]))
+
+    assert set(gm.mentions_graph["news_n1"]) == {"actor_a1", "actor_a2"}
+    assert gm.mentions_graph["news_n1"]["actor_a2"] == {"news_id": "n1", "actor_id": "a2"}
+
+    # Cached until mentions change, and read-only
+    assert gm.mentions_graph is gm.mentions_graph
+    with pytest.raises(nx.NetworkXError):
+        gm.mentions_graph.add_edge("news_n1", "actor_a9")
+    gm.index_mentions("n1", ["a3"])
+    assert "actor_a3" in gm.mentions_graph["news_n1"]
+
+
+def test_actor_mentions_count(gm, mock_db):
+    mock_db.get_actor_mentions_count.return_value = 7
+    assert gm.get_actor_mentions_count("a1") == 7  # graph not populated yet
+
+    gm.add_news(make_news("n1", ["a1", "a2"]))
+    gm.add_news(make_news("n2", ["a1"]))
+
+    assert gm.get_actor_mentions_count("a1") == 2
+    assert gm.get_actor_mentions_count("a3") == 0
+    mock_db.get_actor_mentions_count.assert_called_once_with("a1")
+
+
+def test_traversals_are_memoized_per_generation(gm):
+    for news_id in ("n1", "n2", "n3"):
+        gm.add_news(make_news(news_id))
+    gm.add_news_relation(NewsRelation(source_news_id="n1", target_news_id="n2", similarity=0.8, weight=0.8))
+
+    assert gm.get_node_neighbors("n1") == ["n2"]
+    gm.get_node_neighbors("n1").append("mutated")  # callers get a fresh list
+    assert gm.get_node_neighbors("n1") == ["n2"]
+    assert gm.calculate_cluster_cohesion(["n1", "n2"]) == gm.calculate_cluster_cohesion(["n2", "n1"])
+    assert gm._neighbors_cached.cache_info().hits == 2
+    assert gm._cohesion_cached.cache_info().hits == 1
+
+    gm.add_news_relation(NewsRelation(source_news_id="n1", target_news_id="n3", similarity=0.6, weight=0.6))
+    assert sorted(gm.get_node_neighbors("n1")) == ["n2", "n3"]
+
+
+def test_news_property_reuses_snapshot_until_data_changes(gm, mock_db):
+    mock_db.get_all_news.return_value = [make_news("n1")]
+
+    assert len(gm.news) == 1 and "n1" in gm.news
+    gm.news.clear()  # callers get a copy
+    assert list(gm.news) == ["n1"]
+    # ...and so do the entities in it
+    gm.news["n1"].mentioned_actors.append("a9")
+    for news in gm.news.values():
+        news.title = "edited"
+    assert gm.news["n1"].mentioned_actors == [] and gm.news["n1"].title == "Title n1"
+    assert mock_db.get_all_news.call_count == 1
+
+    mock_db.get_all_news.return_value = [make_news("n1"), make_news("n2")]
+    gm.add_news(make_news("n2"))
+    assert sorted(gm.news) == ["n1", "n2"]
+    assert mock_db.get_all_news.call_count == 2
+
+
+def test_graph_stats_use_single_count_query(gm, mock_db):
+    mock_db.get_entity_counts.return_value = {"news": 3, "actors": 2, "stories": 1, "events": 0}
+    gm.add_news(make_news("n1"))
+
+    stats = gm.get_graph_stats()
+
+    assert stats["news_count"] == 3 and stats["events_count"] == 0
+    assert stats["news_components"] == 1
+    mock_db.get_all_news.assert_not_called()
+
+
+def test_news_cache_is_bounded(mock_db):
+    gm = GraphManager(db_manager=mock_db, cache_size=2)
+    for news_id in ("n1", "n2", "n3"):
+        gm.add_news(make_news(news_id))
+    assert list(gm._news_cache) == ["n2", "n3"]
+
+    mock_db.get_news_bulk.return_value = {"n1": make_news("n1")}
+    assert list(gm.get_news_bulk(["n1", "n2", "n3"])) == ["n1", "n2", "n3"]
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("Person", "person"),
+    (ActorType.COMPANY, "company"),
+    ("org", "organization"),
+    ("spaceship", "organization"),
+    (None, "organization"),
+])
+def test_normalize_actor_type(gm, raw, expected):
+    assert gm._normalize_actor_type(raw) == expected
+
+
+def test_bulk_update_editorial(gm, mock_db):
+    for news_id in ("n1", "n2", "n3"):
+        gm.add_news(make_news(news_id))
+    gm.add_news_relation(NewsRelation(source_news_id="n1", target_news_id="n2", similarity=0.8, weight=0.8))
+
+    gm.bulk_update_editorial([
+        ("n1", "n2", 0.5), ("n2", "n3", 0.9), ("n3", "missing", 0.5), ("n1", "n2", 0.3)
+    ])
+
+    assert gm.news_graph["n1"]["n2"]["weight"] == 0.3
+    assert gm.news_graph["n2"]["n3"]["is_editorial"] is True
+    assert not gm.news_graph.has_node("missing")
+    assert gm._num_components == 1
+    (relations,), _ = mock_db.upsert_news_relations_copy.call_args
+    assert [(r.source_news_id, r.target_news_id, r.similarity, r.weight) for r in relations] == [
+        ("n1", "n2", 0.8, 0.3), ("n2", "n3", 0.9, 0.9)
+    ]
+
+
+def test_mention_index_add_remove_and_counts(gm):
+    gm.add_news(make_news("n1", ["a1", "a2"]))
+    gm.add_news(make_news("n2", ["a1"]))
+
+    gm.unindex_news_mentions("n1")
+    gm.index_mentions("n1", ["a2", "a3"])
+
+    assert sorted(gm.iter_mentions()) == [("n1", "a2"), ("n1", "a3"), ("n2", "a1")]
+    assert gm.get_actor_mentions_count("a1") == 1
+    assert gm._mention_count == gm.mentions_graph.number_of_edges() == 3
+
+    gm.clear_mentions()
+    assert list(gm.iter_mentions()) == [] and gm._mention_count == 0
+
+
+def test_compute_news_similarities_adds_edges(gm, mock_db):
+    mock_db.compute_news_similarities.return_value = [
+        NewsRelation(source_news_id="n1", target_news_id="n2", similarity=0.9, weight=0.9),
+        NewsRelation(source_news_id="n2", target_news_id="n3", similarity=0.7, weight=0.7),
+    ]
+
+    relations = gm.compute_news_similarities(threshold=0.6, k=10)
+
+    mock_db.compute_news_similarities.assert_called_once_with(threshold=0.6, k=10)
+    assert len(relations) == 2
+    assert gm.news_graph["n2"]["n3"]["weight"] == 0.7
+    assert gm._num_components == 1
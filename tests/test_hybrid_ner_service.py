@@ -0,0 +1,128 @@
+"""
+Тесты объединения spaCy и LLM в HybridNERService (без реального spaCy)
+"""
+import copy
+
+from backend.services.ner_spacy_service import HybridNERService
+
+
+SPACY_RESULTS = {
+    "a": [
+        {"name": "Vladimir Putin", "type": "person", "confidence": 0.9},
+        {"name": "Kremlin", "type": "organization", "confidence": 0.6},
+    ],
+    "b": [
+        {"name": "NATO", "type": "organization", "confidence": 0.9},
+        {"name": "EU", "type": "organization", "confidence": 0.8},
+        {"name": "Tesla", "type": "company", "confidence": 0.8},
+    ],
+    "c": [],
+}
+
+LLM_RESULTS = {
+    "a": [{"name": "Kremlin Palace", "type": "organization"}, {"name": "Moscow", "type": "location"}],
+    "c": [{"name": "Elon Musk", "type": "person"}],
+}
+
+
+class FakeSpacyService:
+    nlp = object()
+
+    def __init__(self):
+        self.batches = []
+
+    def extract_with_canonical_names(self, text):
+        return copy.deepcopy(SPACY_RESULTS[text])
+
+    def extract_with_canonical_names_batch(self, texts, batch_size=64):
+        self.batches.append(list(texts))
+        return [copy.deepcopy(SPACY_RESULTS[text]) for text in texts]
+
+
+class FakeLLM:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def extract_actors(self, text):
+        self.calls.append([text])
+        if self.fail:
+            raise RuntimeError("LLM down")
+        return copy.deepcopy(LLM_RESULTS[text])
+
+    def extract_actors_batch(self, texts):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("LLM down")
+        return [copy.deepcopy(LLM_RESULTS[text]) for text in texts]
+
+
+def make_hybrid(llm, spacy_service):
+    hybrid = HybridNERService(llm, use_spacy=False)
+    hybrid.use_spacy = True
+    hybrid._get_model_for_text = lambda text: spacy_service
+    return hybrid
+
+
+def test_extract_actors_batch_matches_single_calls_with_one_llm_call():
+    texts = ["a", "b", "c"]
+    single = make_hybrid(FakeLLM(), FakeSpacyService())
+    expected = [single.extract_actors(text) for text in texts]
+
+    llm, spacy_service = FakeLLM(), FakeSpacyService()
+    hybrid = make_hybrid(llm, spacy_service)
+    assert hybrid.extract_actors_batch(texts) == expected
+    assert spacy_service.batches == [texts]
+    assert llm.calls == [["a", "c"]]  # "b" has enough confident spaCy results
+
+
+def test_extract_actors_batch_falls_back_to_spacy_when_llm_fails():
+    texts = ["a", "c"]
+    single = make_hybrid(FakeLLM(fail=True), FakeSpacyService())
+    expected = [single.extract_actors(text) for text in texts]
+
+    hybrid = make_hybrid(FakeLLM(fail=True), FakeSpacyService())
+    assert hybrid.extract_actors_batch(texts) == expected
+    assert [a["name"] for a in expected[0]] == ["Vladimir Putin"]
+    assert expected[1] == []
+
+
+def test_model_per_language_resolved_once(monkeypatch):
+    from backend.services import ner_spacy_service
+
+    loads = []
+
+    class FakeModel:
+        def __init__(self, model_name):
+            loads.append(model_name)
+            self.nlp = object() if model_name in ("en_core_web_sm", "ru_core_news_sm") else None
+
+    monkeypatch.setattr(ner_spacy_service, "SPACY_AVAILABLE", True)
+    monkeypatch.setattr(ner_spacy_service, "NERSpacyService", FakeModel)
+
+    hybrid = HybridNERService(FakeLLM(), preload_models=True)
+    after_preload = list(loads)
+    assert "ru_core_news_md" in after_preload and "ru_core_news_sm" in after_preload
+
+    ru = hybrid._get_model_for_text("Привет мир")
+    en = hybrid._get_model_for_text("Hello world")
+    assert hybrid._get_model_for_text("Ещё текст") is ru
+    assert loads == after_preload  # no load attempts after preloading, failed ones included
+    assert en is not ru
+
+
+def test_async_wrappers_match_sync_results():
+    import asyncio
+
+    texts = ["a", "b", "c"]
+    sync = make_hybrid(FakeLLM(), FakeSpacyService())
+    hybrid = make_hybrid(FakeLLM(), FakeSpacyService())
+
+    async def run():
+        single = await hybrid.extract_actors_async("a", use_llm=False)
+        batch = await hybrid.extract_actors_batch_async(texts, batch_size=2)
+        return single, batch
+
+    single, batch = asyncio.run(run())
+    assert single == sync.extract_actors("a", use_llm=False)
+    assert batch == sync.extract_actors_batch(texts, batch_size=2)
@@ -0,0 +1,76 @@
+"""
+Unit tests for ServiceRegistry config loading and hot reload
+"""
+import json
+
+from backend.services.llm_registry import ServiceRegistry
+
+
+def write_config(path, model="gemini-2.5-flash"):
+    data = {
+        "profiles": [
+            {"id": "p1", "label": "Profile1", "provider": "gemini", "model": model},
+        ],
+        "services": [
+            {
+                "id": "summary_bullets",
+                "impl": "backend.services.llm_tasks.summary_bullets_service:SummaryBulletsService",
+                "default_profile_id": "p1",
+            }
+        ],
+    }
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_unchanged_config_is_not_reparsed(tmp_path, monkeypatch):
+    cfg_path = tmp_path / "llm_services.json"
+    write_config(cfg_path)
+    registry = ServiceRegistry(config_path=str(cfg_path))
+
+    calls = []
+    original_reload = registry.reload
+    monkeypatch.setattr(registry, "reload", lambda: calls.append(1) or original_reload())
+
+    assert registry.get_profile("p1").model == "gemini-2.5-flash"
+    assert registry.list_services()[0].id == "summary_bullets"
+    assert calls == []
+
+
+def test_changed_config_is_reloaded(tmp_path):
+    cfg_path = tmp_path / "llm_services.json"
+    write_config(cfg_path)
+    registry = ServiceRegistry(config_path=str(cfg_path), reload_check_interval=0)
+
+    # Size changes too, so a write within the mtime granularity is still seen
+    write_config(cfg_path, model="gemini-2.5-pro-long")
+
+    assert registry.get_profile("p1").model == "gemini-2.5-pro-long"
+
+
+def test_stat_checks_are_debounced(tmp_path):
+    cfg_path = tmp_path / "llm_services.json"
+    write_config(cfg_path)
+    registry = ServiceRegistry(config_path=str(cfg_path), reload_check_interval=3600)
+
+    registry.get_profile("p1")  # first check after startup
+    write_config(cfg_path, model="gemini-2.5-pro-long")
+
+    assert registry.get_profile("p1").model == "gemini-2.5-flash"
+    registry.reload()
+    assert registry.get_profile("p1").model == "gemini-2.5-pro-long"
+
+
+def test_profile_params_and_persist_roundtrip(tmp_path):
+    cfg_path = tmp_path / "llm_services.json"
+    write_config(cfg_path)
+    registry = ServiceRegistry(config_path=str(cfg_path))
+    profile = registry.get_profile("p1")
+
+    assert profile.to_params() is profile.to_params()
+    assert profile.to_params()["model_name"] == "gemini-2.5-flash"
+    assert "_params" not in profile.to_dict()
+
+    registry.update_service("summary_bullets", params={"max_bullets": 3})
+    saved = json.loads(cfg_path.read_text(encoding="utf-8"))
+    assert saved["profiles"][0] == profile.to_dict()
+    assert ServiceRegistry(config_path=str(cfg_path)).get_profile("p1") == profile
@@ -0,0 +1,435 @@
+"""
+Unit tests for LLMService cache and response parsing helpers
+"""
+import asyncio
+import json
+
+from backend.services.llm_service import LLMService, _COMPANY_INDICATORS, _COUNTRY_INDICATORS
+
+
+def make_llm(tmp_path):
+    return LLMService(use_mock=True, cache_dir=str(tmp_path / "cache"))
+
+
+def test_cache_roundtrip_keeps_unicode(tmp_path):
+    llm = make_llm(tmp_path)
+    llm._cache_set("k1", "Зеленский — \"quoted\"")
+    assert llm._cache_get("k1") == "Зеленский — \"quoted\""
+
+
+def test_cache_imports_legacy_json_files(tmp_path):
+    legacy = tmp_path / "cache" / "k2.json"
+    legacy.parent.mkdir()
+    legacy.write_text(json.dumps({"text": "Київ"}, ensure_ascii=False), encoding="utf-8")
+    llm = make_llm(tmp_path)
+    assert llm._cache_get("k2") == "Київ"
+    legacy.unlink()
+    assert llm._cache_get("k2") == "Київ"
+
+
+def test_cache_persists_across_instances_and_clears(tmp_path):
+    make_llm(tmp_path)._cache_set("k3", "persisted")
+    llm = make_llm(tmp_path)
+    assert llm._cache_get("k3") == "persisted"
+    llm.cache_clear()
+    assert llm._cache_get("k3") is None
+
+
+def test_hash_is_stable_and_key_order_independent(tmp_path):
+    llm = make_llm(tmp_path)
+    a = llm._hash("p", "m", {"temperature": 0.2, "top_k": 40})
+    b = llm._hash("p", "m", {"top_k": 40, "temperature": 0.2})
+    assert a == b
+    assert len(a) == 64
+
+
+def test_parse_json_array_strips_fences_and_falls_back(tmp_path):
+    llm = make_llm(tmp_path)
+    fenced = "```json\n[{\"name\": \"NATO\", \"confidence\": 0.9}]\n```"
+    assert llm._parse_json_array(fenced) == [{"name": "NATO", "confidence": 0.9}]
+    # NaN is rejected by orjson but accepted by the stdlib fallback
+    parsed = llm._parse_json_array("[{\"name\": \"X\", \"confidence\": NaN}]")
+    assert parsed[0]["name"] == "X"
+    assert llm._parse_json_array("not json") is None
+
+
+def make_live_llm(tmp_path, responder):
+    """LLMService that takes the non-mock code paths with _run stubbed out"""
+    llm = make_llm(tmp_path)
+    llm.use_mock = False
+    calls = []
+    real_run = llm._run
+
+    def fake_run(prompt, model=None, **overrides):
+        calls.append(prompt)
+        text = responder(prompt)
+        llm._cache_set(llm._hash(prompt, model or llm.model_name, {**llm.params, **overrides}), text)
+        return text
+
+    llm._run = fake_run
+    llm._real_run = real_run
+    return llm, calls
+
+
+def test_extract_actors_batch_packs_misses_and_caches_per_item(tmp_path):
+    def responder(prompt):
+        assert "<<<DOC 0>>>" in prompt and "<<<DOC 1>>>" in prompt
+        return json.dumps([
+            {"doc_id": 0, "actors": [{"name": "NATO", "type": "int_org", "confidence": 0.95}]},
+            {"doc_id": 1, "actors": [{"name": "US", "type": "country", "confidence": 0.9}]},
+        ])
+
+    llm, calls = make_live_llm(tmp_path, responder)
+    result = llm.extract_actors_batch(["text about NATO", "text about US"])
+
+    assert len(calls) == 1
+    assert result[0][0]["name"] == "NATO"
+    assert result[1][0]["name"] == "United States"
+
+    # Per-item cache: single-document extraction no longer calls the model
+    llm._run = llm._real_run
+    assert llm.extract_actors("text about NATO")[0]["name"] == "NATO"
+
+
+def test_extract_actors_batch_falls_back_for_missing_docs(tmp_path):
+    def responder(prompt):
+        if "<<<DOC" in prompt:
+            return json.dumps([{"doc_id": 0, "actors": [{"name": "NATO", "type": "int_org"}]}])
+        return json.dumps([{"name": "Kremlin", "type": "government", "confidence": 0.9}])
+
+    llm, calls = make_live_llm(tmp_path, responder)
+    result = llm.extract_actors_batch(["a" * 20, "b" * 20])
+
+    assert len(calls) == 2  # one batch + one single-document fallback
+    assert result[0][0]["name"] == "NATO"
+    assert result[1][0]["name"] == "Kremlin"
+
+
+def test_run_batch_preserves_order_and_uses_cache(tmp_path):
+    llm = make_llm(tmp_path)
+    first = llm.run_batch(["p1", "p2", "p3"])
+    assert [t.split("] ")[1] for t in first] == ["p1...", "p2...", "p3..."]
+    assert llm.run_batch(["p3", "p1"]) == [first[2], first[0]]
+
+
+def test_summary_bullets_issues_both_calls_concurrently(tmp_path):
+    from backend.services.llm_tasks.summary_bullets_service import SummaryBulletsService
+
+    llm = make_llm(tmp_path)
+    started = []
+
+    async def summarize_async(title, text):
+        started.append("summary")
+        await asyncio.sleep(0.01)
+        assert "bullets" in started  # make_bullets was dispatched before summary finished
+        return "S"
+
+    async def make_bullets_async(title, text, max_points=4):
+        started.append("bullets")
+        await asyncio.sleep(0.01)
+        return ["b1"]
+
+    llm.summarize_async = summarize_async
+    llm.make_bullets_async = make_bullets_async
+
+    result = SummaryBulletsService().run(llm, {"title": "T", "text": "X"})
+    assert result == {"summary": "S", "bullets": ["b1"]}
+
+
+def test_summary_bullets_run_inside_event_loop_is_sequential(tmp_path):
+    from backend.services.llm_tasks.summary_bullets_service import SummaryBulletsService
+
+    llm = make_llm(tmp_path)
+    llm.summarize = lambda title, text: "S"
+    llm.make_bullets = lambda title, text, max_points=4: ["b1"] * max_points
+
+    async def call_from_loop():
+        return SummaryBulletsService().run(llm, {"title": "T", "text": "X", "max_points": 2})
+
+    assert asyncio.run(call_from_loop()) == {"summary": "S", "bullets": ["b1", "b1"]}
+
+
+def test_run_async_shares_cache_with_run(tmp_path):
+    llm = make_llm(tmp_path)
+    text = llm._run("same prompt")
+    assert asyncio.run(llm._run_async("same prompt")) == text
+
+
+def test_async_semaphore_is_per_event_loop(tmp_path):
+    llm = make_llm(tmp_path)
+
+    async def grab():
+        first = llm._async_semaphore()
+        assert llm._async_semaphore() is first
+        async with first:
+            return first
+
+    assert asyncio.run(grab()) is not asyncio.run(grab())
+
+
+def test_mem_cache_serves_hits_without_sqlite(tmp_path):
+    llm = make_llm(tmp_path)
+    llm._cache_set("k4", "hot")
+    llm._db.execute("DELETE FROM cache")
+    assert llm._cache_get("k4") == "hot"
+
+
+def test_mem_cache_is_filled_from_sqlite_and_bounded(tmp_path):
+    make_llm(tmp_path)._cache_set("k5", "cold")
+    llm = make_llm(tmp_path)
+    assert "k5" not in llm._mem_cache
+    assert llm._cache_get("k5") == "cold"
+    assert "k5" in llm._mem_cache
+
+    llm._mem_cache.maxsize = 2
+    llm._cache_set("a", "1")
+    llm._cache_set("b", "2")
+    assert list(llm._mem_cache) == ["a", "b"]
+
+
+def test_normalize_actors_maps_types_and_names(tmp_path):
+    llm = make_llm(tmp_path)
+    result = llm._normalize_actors([
+        {"name": "USA", "type": "Nation", "confidence": "0.8"},
+        {"name": "Kremlin", "type": "kremlin"},
+        {"name": "Acme Technologies", "type": "other"},
+        {"name": "Russian Federation"},
+        {"name": "usa", "type": "country"},
+    ])
+    assert result == [
+        {"name": "United States", "type": "country", "confidence": 0.8},
+        {"name": "Kremlin", "type": "government", "confidence": 0.5},
+        {"name": "Acme Technologies", "type": "company", "confidence": 0.5},
+        {"name": "Russian Federation", "type": "country", "confidence": 0.5},
+    ]
+
+
+def test_indicator_matching_keeps_substring_semantics():
+    names = ["Russian Federation", "South Korea", "Sinclair", "Corpus Christi",
+             "Open Systems", "Acme", "Indiana", "", "LLC Gazprom"]
+    for name in names:
+        lower = name.lower()
+        assert LLMService._looks_like_country(name) == any(i in lower for i in _COUNTRY_INDICATORS)
+        assert LLMService._looks_like_company(name) == any(i in lower for i in _COMPANY_INDICATORS)
+
+
+def test_iter_array_objects_handles_split_chunks_and_strings():
+    from backend.services.llm_service import _iter_array_objects
+
+    raw = '```json\n[{"name": "A \\"}]{", "type": "x"}, {"name": "B", "tags": [1, {"k": 2}]}, {bad}, {"name": "C"}]\n```'
+    chunks = [raw[i:i + 3] for i in range(0, len(raw), 3)]
+    assert [o["name"] for o in _iter_array_objects(chunks)] == ['A "}]{', "B", "C"]
+
+
+def test_extract_actors_stream_yields_before_reply_completes(tmp_path):
+    produced = []
+    reply = ['[{"name": "NATO", "type": "int_org", "confidence": 0.9},',
+             ' {"name": "US", "type": "country", "confidence": 0.8}]']
+
+    class Chunk:
+        def __init__(self, text):
+            self.text = text
+
+    class FakeModel:
+        def __init__(self, name):
+            pass
+
+        def generate_content(self, prompt, stream=False, **kwargs):
+            assert stream
+            for piece in reply:
+                produced.append(piece)
+                yield Chunk(piece)
+
+    llm = make_llm(tmp_path)
+    llm.use_mock = False
+    llm.client = FakeModel(llm.model_name)
+
+    stream = llm.extract_actors_stream("NATO and the US")
+    first = next(stream)
+    assert first["name"] == "NATO" and len(produced) == 1
+    assert [a["name"] for a in stream] == ["United States"]
+
+    # The joined reply was cached under the extract_actors key
+    produced.clear()
+    assert [a["name"] for a in llm.extract_actors("NATO and the US")] == ["NATO", "United States"]
+    assert produced == []
+
+
+def test_extract_actors_requests_schema_and_makes_one_call(tmp_path):
+    seen = []
+
+    def responder(prompt):
+        return "[]"
+
+    llm, calls = make_live_llm(tmp_path, responder)
+    real_fake = llm._run
+
+    def spy(prompt, model=None, **overrides):
+        seen.append(overrides)
+        return real_fake(prompt, model, **overrides)
+
+    llm._run = spy
+    assert llm.extract_actors("nothing here") == []
+    assert len(calls) == 1
+    assert seen[0]["response_mime_type"] == "application/json"
+    assert seen[0]["response_schema"]["type"] == "array"
+
+
+def test_mock_mode_does_not_import_gemini_sdk():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, tempfile\n"
+        "from backend.services.llm_service import LLMService\n"
+        "LLMService(use_mock=True, cache_dir=tempfile.mkdtemp()).summarize('t', 'x')\n"
+        "assert 'google.generativeai' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_alternate_model_clients_are_built_once(tmp_path):
+    llm = make_llm(tmp_path)
+    built = []
+
+    class FakeGenai:
+        @staticmethod
+        def GenerativeModel(name):
+            built.append(name)
+            return object()
+
+    llm._genai = FakeGenai
+    llm.client = object()
+    assert llm._client_for(llm.model_name) is llm.client
+    first = llm._client_for("gemini-alt")
+    assert llm._client_for("gemini-alt") is first
+    assert built == ["gemini-alt"]
+
+
+def test_blake3_keys_fall_back_to_sha256_entries(tmp_path, monkeypatch):
+    import hashlib
+
+    import backend.services.llm_service as llm_module
+
+    llm = make_llm(tmp_path)
+    legacy_key = llm._hash("prompt", llm.model_name, llm.params)
+    llm._cache_set(legacy_key, "old reply")
+
+    # Stand-in hasher so the test does not need the blake3 package
+    monkeypatch.setattr(llm_module, "BLAKE3_AVAILABLE", True)
+    monkeypatch.setattr(llm_module, "blake3", hashlib.blake2b, raising=False)
+    new_key = llm._hash("prompt", llm.model_name, llm.params)
+    assert new_key.startswith("blake3:") and new_key != legacy_key
+
+    assert llm._run("prompt") == "old reply"
+    assert llm._cache_get(new_key) == "old reply"
+
+
+def test_strip_code_fences_variants(tmp_path):
+    llm = make_llm(tmp_path)
+    assert llm._strip_code_fences("```json\n[1]\n```") == "[1]"
+    assert llm._strip_code_fences("  ```\n[1]```  \n") == "[1]"
+    assert llm._strip_code_fences("```json\n[1, 2") == "[1, 2"
+    assert llm._strip_code_fences("  [1]  ") == "[1]"
+    assert llm._strip_code_fences("") == ""
+
+
+def test_cache_miss_does_not_probe_legacy_files(tmp_path, monkeypatch):
+    from pathlib import Path
+
+    llm = make_llm(tmp_path)
+    (llm.cache_dir / "late.json").write_text('{"text": "x"}', encoding="utf-8")
+
+    def no_disk(self):
+        raise AssertionError("legacy file probed")
+
+    monkeypatch.setattr(Path, "read_bytes", no_disk)
+    monkeypatch.setattr(Path, "exists", no_disk)
+    assert llm._cache_get("missing") is None
+    assert llm._cache_get("late") is None  # written after startup: not a legacy entry
+
+
+def test_normalize_actors_dedups_by_canonical_name_in_any_order(tmp_path):
+    llm = make_llm(tmp_path)
+    for items in (
+        [{"name": "United States"}, {"name": "US"}],
+        [{"name": "US"}, {"name": "united states"}],
+        [{"name": "USA"}, {"name": "u.s."}],
+    ):
+        assert len(llm._normalize_actors(items)) == 1
+
+
+def test_hash_many_matches_hash(tmp_path, monkeypatch):
+    import hashlib
+
+    import backend.services.llm_service as llm_module
+
+    llm = make_llm(tmp_path)
+    prompts = ["plain", "Київ \"quoted\"\n", ""]
+    params = {"temperature": 0.2, "response_schema": {"type": "array"}}
+    assert llm._hash_many(prompts, "m", params) == [llm._hash(p, "m", params) for p in prompts]
+
+    monkeypatch.setattr(llm_module, "BLAKE3_AVAILABLE", True)
+    monkeypatch.setattr(llm_module, "blake3", hashlib.blake2b, raising=False)
+    assert llm._hash_many(prompts, "m", params) == [llm._hash(p, "m", params) for p in prompts]
+
+
+def test_bullet_parsing_helpers(tmp_path):
+    llm = make_llm(tmp_path)
+    text = "- first -\n\n• second\n---\n\t- third\r\n- fourth"
+    assert list(llm._bullet_lines(text)) == ["first", "second", "- third", "fourth"]
+    assert llm._split_lines(text, 2) == ["first", "second"]
+    assert llm._split_lines("---", 3) == ["---"]
+
+
+def test_last_raw_formats_errors_lazily(tmp_path, monkeypatch):
+    import traceback
+
+    llm = make_llm(tmp_path)
+    llm.use_mock = False
+
+    class FailingModel:
+        def generate_content(self, *args, **kwargs):
+            raise RuntimeError("quota exceeded")
+
+    llm.client = FailingModel()
+    formatted = []
+    real_format = traceback.format_exception
+    monkeypatch.setattr(traceback, "format_exception", lambda *a: formatted.append(1) or real_format(*a))
+
+    try:
+        llm._run("will fail")
+    except RuntimeError:
+        pass
+    assert formatted == []
+    assert llm.last_raw.startswith("LLM error: quota exceeded\n")
+    assert "RuntimeError" in llm.last_raw and formatted == [1]
+
+    llm.last_raw = "ok"
+    assert llm.last_raw == "ok"
+
+
+def test_name_helpers_are_memoized():
+    LLMService._normalize_actor_name.cache_clear()
+    assert LLMService._normalize_actor_name(" usa ") == "United States"
+    assert LLMService._normalize_actor_name(" usa ") == "United States"
+    info = LLMService._normalize_actor_name.cache_info()
+    assert info.hits == 1 and info.misses == 1
+
+
+def test_cache_key_ignores_whitespace_and_float_noise(tmp_path):
+    llm = make_llm(tmp_path)
+    a = llm._cache_key("Summarize:\n  Title  X\n", "m", {"temperature": 0.30000001, "top_k": 40})
+    b = llm._cache_key("Summarize: Title X", "m", {"temperature": 0.3, "top_k": 40, "seed": None})
+    assert a == b
+    assert a != llm._cache_key("summarize: title x", "m", {"temperature": 0.3, "top_k": 40})
+    assert llm._cache_keys(["Summarize:\n  Title  X\n"], "m", {"temperature": 0.3, "top_k": 40}) == [a]
+
+
+def test_verbatim_keys_from_earlier_versions_still_hit(tmp_path):
+    llm = make_llm(tmp_path)
+    prompt = "Title:\n  spaced   prompt\n"
+    llm._cache_set(llm._hash(prompt, llm.model_name, llm.params), "old reply")
+
+    assert llm._run(prompt) == "old reply"
+    assert llm._cache_get(llm._cache_key(prompt, llm.model_name, llm.params)) == "old reply"
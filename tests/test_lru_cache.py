@@ -0,0 +1,44 @@
+"""
+Tests for the LRU cache used by GraphManager
+"""
+from backend.utils.lru_cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # "b" is now least recently used
+    cache["c"] = 3
+
+    assert "b" not in cache
+    assert list(cache) == ["a", "c"]
+    assert cache.get("b") is None
+
+
+def test_dict_operations_keep_working():
+    cache = LRUCache(maxsize=3)
+    cache.update({"a": 1, "b": 2, "c": 3, "d": 4})
+
+    assert len(cache) == 3
+    del cache["b"]
+    assert dict(cache.items()) == {"c": 3, "d": 4}
+    assert list(cache.values()) == [3, 4]
+
+
+def test_copy_and_pickle_keep_maxsize_and_order():
+    import copy
+    import pickle
+
+    cache = LRUCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache.get("a")
+
+    for clone in (cache.copy(), copy.copy(cache), copy.deepcopy(cache),
+                  pickle.loads(pickle.dumps(cache))):
+        assert type(clone) is LRUCache and clone.maxsize == 2
+        assert list(clone.items()) == [("b", 2), ("a", 1)]
+        clone["c"] = 3
+        assert list(clone) == ["a", "c"]
+    assert list(cache) == ["b", "a"]
@@ -0,0 +1,179 @@
+"""
+Unit tests for the pattern-based NERService
+"""
+from backend.models.entities import Actor, ActorType, RelationType
+from backend.services.ner_service import NERService
+
+
+def make_actor(actor_id, name, actor_type=ActorType.PERSON, aliases=None):
+    return Actor(
+        id=actor_id,
+        canonical_name=name,
+        actor_type=actor_type,
+        aliases=[{"name": a, "type": "alias"} for a in (aliases or [])],
+    )
+
+
+def make_ner():
+    ner = NERService()
+    ner.load_gazetteer([
+        make_actor("a_biden", "Biden", aliases=["Joe Biden"]),
+        make_actor("a_nato", "NATO", ActorType.INT_ORG),
+        make_actor("a_putin", "Putin"),
+    ])
+    return ner
+
+
+def test_capitalized_phrases_respect_max_words_and_stop_words():
+    ner = NERService()
+    text = "The report. Supreme Court Of Justice met. Angela Merkel spoke."
+    assert set(ner._extract_capitalized_phrases(text, max_words=2)) == {
+        "Supreme Court", "Of Justice", "Angela Merkel"
+    }
+    assert set(ner._extract_capitalized_phrases(text)) == {
+        "Supreme Court Of", "Justice", "Angela Merkel"
+    }
+
+
+def test_relations_extracted_with_compiled_patterns():
+    ner = make_ner()
+    text = "Putin criticized NATO while Biden SUPPORTS NATO."
+    relations = ner.extract_relations_from_text(text, ["a_biden", "a_nato", "a_putin"])
+    found = {(r.source_actor_id, r.relation_type, r.target_actor_id) for r in relations}
+    assert found == {
+        ("a_putin", RelationType.CRITICIZED, "a_nato"),
+        ("a_biden", RelationType.SUPPORTS, "a_nato"),
+    }
+
+
+def test_known_actors_matched_once():
+    ner = make_ner()
+    known, _ = ner.extract_actors_from_text("Putin met Joe Biden; Biden and Putin discussed NATO.")
+    assert known == ["a_putin", "a_biden", "a_nato"]
+
+
+def test_known_actors_match_whole_words_longest_first():
+    ner = make_ner()
+    ner.load_gazetteer([
+        make_actor("a_in", "IN"),
+        make_actor("a_ny", "New York", ActorType.COUNTRY),
+        make_actor("a_nyt", "New York Times", ActorType.COMPANY),
+    ])
+    known, _ = ner.extract_actors_from_text("The ministry of Putinism quoted the New York Times.")
+    assert known == ["a_nyt"]
+
+    known, _ = ner.extract_actors_from_text("In New York, Putin met NATO-backed envoys.")
+    assert known == ["a_in", "a_ny", "a_putin", "a_nato"]
+
+
+def test_known_actor_index_follows_alias_changes():
+    ner = make_ner()
+    assert ner.extract_actors_from_text("Sleepy Joe spoke")[0] == []
+
+    ner.add_actor_alias("a_biden", "Sleepy Joe")
+    assert ner.extract_actors_from_text("Sleepy Joe spoke")[0] == ["a_biden"]
+
+    ner.merge_actors("a_biden", "a_putin")
+    assert ner.extract_actors_from_text("Putin spoke")[0] == ["a_biden"]
+
+    ner.canonical_map["alliance"] = "a_nato"  # direct edits are picked up too
+    assert ner.extract_actors_from_text("The Alliance grew")[0] == ["a_nato"]
+
+
+def test_relation_matches_may_overlap_across_patterns():
+    ner = make_ner()
+    ner.load_gazetteer([make_actor("a_mi6", "Agency")])
+    text = "Biden from Agency criticized Putin"
+    relations = ner.extract_relations_from_text(text, ["a_biden", "a_mi6", "a_putin"])
+    found = {(r.source_actor_id, r.relation_type, r.target_actor_id) for r in relations}
+    assert found == {
+        ("a_biden", RelationType.MEMBER_OF, "a_mi6"),
+        ("a_mi6", RelationType.CRITICIZED, "a_putin"),
+    }
+
+
+def test_relation_matches_do_not_overlap_within_a_pattern():
+    ner = make_ner()
+    ner.load_gazetteer([make_actor("a_xi", "Xi")])
+    text = "Biden criticized Putin criticized Xi"
+    relations = ner.extract_relations_from_text(text, ["a_biden", "a_putin", "a_xi"])
+    found = [(r.source_actor_id, r.relation_type, r.target_actor_id) for r in relations]
+    assert found == [("a_biden", RelationType.CRITICIZED, "a_putin")]
+
+
+def test_relation_entities_resolved_by_partial_name_after_alias_change():
+    ner = make_ner()
+    mentioned = ["a_biden", "a_putin"]
+    assert ner.extract_relations_from_text("Vladimir criticized Joe", mentioned) == []
+
+    ner.add_actor_alias("a_putin", "Vladimir Putin")
+    relations = ner.extract_relations_from_text("Vladimir criticized Joe", mentioned)
+    assert [(r.source_actor_id, r.target_actor_id) for r in relations] == [("a_putin", "a_biden")]
+
+
+def test_new_actor_types_inferred_from_entity_and_context():
+    ner = NERService()
+    _, actors = ner.extract_actors_from_text("Acme Corp and Germany answered Boris.")
+    assert {a.canonical_name: a.actor_type for a in actors} == {
+        "Acme Corp": ActorType.COMPANY, "Germany": ActorType.COUNTRY, "Boris": ActorType.PERSON
+    }
+
+    _, actors = ner.extract_actors_from_text("Boris heads the agency.")
+    assert [a.actor_type for a in actors] == [ActorType.ORGANIZATION]
+    assert ner._infer_actor_type("Boris", "the Ministry said") == ActorType.ORGANIZATION
+
+
+def test_capitalized_phrases_cover_accented_and_ukrainian_letters():
+    ner = NERService()
+    text = "Володимир Зеленський met Jürgen Müller and Élodie Durand in Київ."
+    assert set(ner._extract_capitalized_phrases(text)) == {
+        "Володимир Зеленський", "Jürgen Müller", "Élodie Durand", "Київ"
+    }
+
+
+def test_extract_actors_batch_matches_single_calls():
+    ner = make_ner()
+    texts = ["Putin met Joe Biden.", "", "NATO and Acme Corp responded."]
+    batch = ner.extract_actors_batch(texts)
+    assert [known for known, _ in batch] == [ner.extract_actors_from_text(t)[0] for t in texts]
+    assert [[a.canonical_name for a in new] for _, new in batch] == [[], [], ["Acme Corp"]]
+
+
+def test_new_actors_skip_phrases_containing_known_names():
+    ner = make_ner()
+    _, actors = ner.extract_actors_from_text("President Biden met Angela Merkel. Angela Merkel smiled.")
+    assert [a.canonical_name for a in actors] == ["Angela Merkel"]
+
+
+def test_bulk_update_keeps_indexes_in_sync_without_rebuild():
+    ner = make_ner()
+    ner.extract_actors_from_text("warm up")
+    trie = ner._alias_trie()
+
+    ner.bulk_update(aliases=[("a_nato", "North Atlantic Alliance", "alias")],
+                    merges=[("a_biden", "a_putin")])
+    assert ner._alias_trie() is trie
+    assert ner.extract_actors_from_text("The North Atlantic Alliance and Putin")[0] == ["a_nato", "a_biden"]
+    assert ner._find_actor_by_name("puti", ["a_biden"]) == "a_biden"
+
+
+def test_partial_names_prefer_whole_word_hits_in_candidate_order():
+    ner = make_ner()
+    ner.load_gazetteer([
+        make_actor("a_joey", "Joey Tribbiani"),
+        make_actor("a_joe", "Joe Smith"),
+    ])
+    assert ner._find_actor_by_name("Joe", ["a_joey", "a_joe"]) == "a_joe"
+    assert ner._find_actor_by_name("Joe", ["a_joey", "a_biden", "a_joe"]) == "a_biden"
+    assert ner._find_actor_by_name("Trib", ["a_joe", "a_joey"]) == "a_joey"
+
+    ner.merge_actors("a_joe", "a_joey")
+    assert ner._find_actor_by_name("tribbiani", ["a_joe"]) == "a_joe"
+    assert ner._name_tokens["tribbiani"] == {"a_joe"}
+
+
+def test_emit_new_false_returns_known_actors_only():
+    ner = make_ner()
+    text = "Putin met Angela Merkel."
+    assert ner.extract_actors_from_text(text, emit_new=False) == (["a_putin"], [])
+    assert ner.extract_actors_batch([text], emit_new=False) == [(["a_putin"], [])]
@@ -0,0 +1,133 @@
+"""
+Тесты канонизации через gazetteer в NERSpacyService (spaCy не требуется)
+"""
+from backend.models.entities import Actor, ActorType
+from backend.services.ner_spacy_service import NERSpacyService
+
+
+def make_service():
+    service = NERSpacyService()
+    service.load_gazetteer([
+        Actor(id="a_putin", canonical_name="Vladimir Putin", actor_type=ActorType.PERSON,
+              aliases=[{"name": "Путин", "type": "alias"}]),
+        Actor(id="a_us", canonical_name="United States of America", actor_type=ActorType.COUNTRY,
+              aliases=[{"name": "United States", "type": "alias"}]),
+        Actor(id="a_states", canonical_name="States Union", actor_type=ActorType.ORGANIZATION,
+              aliases=[{"name": "States United", "type": "alias"}]),
+    ])
+    return service
+
+
+def test_find_in_gazetteer_exact_and_partial_matches():
+    service = make_service()
+    assert service.canonicalize_actor("  путин ") == "a_putin"
+    assert service.canonicalize_actor("President Vladimir Putin") == "a_putin"
+    assert service.canonicalize_actor("the United States") == "a_us"
+    assert service.canonicalize_actor("United States Today") == "a_us"  # tie: first in gazetteer order
+    assert service.canonicalize_actor("States") is None  # 1 of 2 words is below the 0.6 score
+    assert service.canonicalize_actor("Putin") is None  # single word vs two-word canonical name
+    assert service.canonicalize_actor("Kremlin") is None
+
+
+
+def test_new_actor_ids_do_not_depend_on_hash_seed():
+    from backend.services.ner_spacy_service import _actor_id_for
+
+    assert _actor_id_for("elon musk") == "actor_249664004426"
+    assert _actor_id_for("tesla") != _actor_id_for("elon musk")
+
+
+def test_gazetteer_lookups_are_cached_until_reload():
+    service = make_service()
+    assert service.canonicalize_actor("President Vladimir Putin") == "a_putin"
+    assert service._gazetteer_cache["president vladimir putin"] == "a_putin"
+
+    service.load_gazetteer([])
+    assert service.canonicalize_actor("President Vladimir Putin") is None
+
+
+def test_gazetteer_cache_shared_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    from backend.utils.lru_cache import LRUCache
+
+    service = make_service()
+    service._gazetteer_cache = LRUCache(2)  # constant eviction
+    names = ["путин", "united states", "kremlin", "president vladimir putin"] * 500
+    expected = [service._match_gazetteer(n) for n in names]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(service.canonicalize_actor, names)) == expected
+
+
+def test_canonical_dicts_for_known_and_new_actors():
+    service = make_service()
+    new_actor = Actor(id="actor_1", canonical_name="Elon Musk", actor_type=ActorType.PERSON,
+                      metadata={"confidence": 0.8})
+    assert service._canonical_dicts(["a_us", "a_missing"], [new_actor]) == [
+        {"name": "United States of America", "type": "country", "confidence": 0.9,
+         "original_text": "United States of America", "actor_id": "a_us"},
+        {"name": "Elon Musk", "type": "person", "confidence": 0.8,
+         "original_text": "Elon Musk", "actor_id": "actor_1"},
+    ]
+
+
+class FakeSpan:
+    label_ = "PERSON"
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeNLP:
+    """Каждое слово с заглавной буквы — сущность; запоминает длины документов"""
+
+    def __init__(self):
+        self.doc_lengths = []
+
+    def _doc(self, text):
+        self.doc_lengths.append(len(text))
+        return type("FakeDoc", (), {"ents": [FakeSpan(w.strip(".")) for w in text.split() if w[0].isupper()]})
+
+    def __call__(self, text):
+        return self._doc(text)
+
+    def pipe(self, texts, batch_size=64, n_process=1):
+        return (self._doc(text) for text in texts)
+
+
+def test_long_texts_are_processed_in_sentence_chunks():
+    service = make_service()
+    service.nlp = FakeNLP()
+    service.type_mapping = {}
+    service.max_chunk_chars = 40
+    long_text = "Elon Musk met Vladimir Putin today. " * 3 + "x" * 90 + ". Angela Merkel spoke."
+
+    assert all(len(chunk) <= 40 for chunk in service._split_text(long_text))
+    known, new = service.extract_actors_from_text(long_text)
+    assert max(service.nlp.doc_lengths) <= 40
+    assert [a.canonical_name for a in new] == ["Elon", "Musk", "Vladimir", "Putin", "Angela", "Merkel"]
+
+    batch = service.extract_actors_from_texts(["Short Text.", long_text, "Tesla"])
+    assert [[a.canonical_name for a in n] for _, n in batch] == [
+        ["Short", "Text"], ["Elon", "Musk", "Vladimir", "Putin", "Angela", "Merkel"], ["Tesla"]
+    ]
+
+
+def test_normalized_names_follow_actor_edits():
+    actor = Actor(id="a_x", canonical_name=" Elon Musk ", actor_type=ActorType.PERSON,
+                  aliases=[{"name": " Musk ", "type": "alias"}])
+    first = actor.normalized_names
+    assert first == ("elon musk", ["musk"])
+    assert actor.normalized_names is first
+
+    actor.add_alias({"name": "Илон Маск", "type": "alias"})
+    assert actor.normalized_names == ("elon musk", ["musk", "илон маск"])
+    actor.canonical_name = "E. Musk"
+    assert actor.normalized_names[0] == "e. musk"
+    actor.aliases = [{"name": " Маск", "type": "alias"}, actor.aliases[1]]
+    assert actor.normalized_names[1] == ["маск", "илон маск"]
+
+    service = NERSpacyService()
+    service.load_gazetteer([actor])
+    assert service.canonicalize_actor("ИЛОН МАСК") == "a_x"
+    assert "elon musk" not in service.canonical_map
@@ -0,0 +1,55 @@
+"""
+Tests for in-memory pairwise cosine similarity
+"""
+import numpy as np
+import pytest
+
+from backend.utils import similarity
+
+
+def brute_force_pairs(embeddings, threshold):
+    matrix = similarity.normalize_rows(embeddings)
+    sims = matrix @ matrix.T
+    n = len(matrix)
+    return {(i, j) for i in range(n) for j in range(i + 1, n) if sims[i, j] >= threshold}
+
+
+@pytest.mark.parametrize("n", [2, 5, 37])
+def test_similar_pairs_matches_brute_force(n, monkeypatch):
+    monkeypatch.setattr(similarity, "BLOCK_SIZE", 8)
+    rng = np.random.default_rng(42)
+    embeddings = rng.normal(size=(n, 16)).astype(np.float32)
+
+    rows_i, rows_j, sims = similarity.similar_pairs(embeddings, 0.1, use_numba=False)
+
+    assert set(zip(rows_i.tolist(), rows_j.tolist())) == brute_force_pairs(embeddings, 0.1)
+    assert np.all(rows_i < rows_j)
+    assert np.all(sims <= 1.0)
+
+
+def test_similar_pairs_handles_zero_vectors_and_small_input():
+    embeddings = np.array([[1.0, 0.0], [0.0, 0.0], [1.0, 0.001]])
+
+    rows_i, rows_j, sims = similarity.similar_pairs(embeddings, 0.5, use_numba=False)
+
+    assert list(zip(rows_i.tolist(), rows_j.tolist())) == [(0, 2)]
+    assert len(similarity.similar_pairs(embeddings[:1], 0.5)[0]) == 0
+
+
+@pytest.mark.skipif(not similarity.NUMBA_AVAILABLE, reason="numba not installed")
+def test_numba_path_matches_numpy_path():
+    embeddings = np.random.default_rng(0).normal(size=(64, 8))
+
+    a = similarity.similar_pairs(embeddings, 0.2, use_numba=False)
+    b = similarity.similar_pairs(embeddings, 0.2, use_numba=True)
+
+    assert set(zip(a[0].tolist(), a[1].tolist())) == set(zip(b[0].tolist(), b[1].tolist()))
+
+
+def test_use_numba_without_numba_falls_back(monkeypatch):
+    monkeypatch.setattr(similarity, "NUMBA_AVAILABLE", False)
+    embeddings = np.random.default_rng(3).normal(size=(20, 8))
+    a = similarity.similar_pairs(embeddings, 0.2, use_numba=False)
+    b = similarity.similar_pairs(embeddings, 0.2, use_numba=True)
+    for x, y in zip(a, b):
+        assert np.array_equal(x, y)
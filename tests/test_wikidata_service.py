@@ -1,6 +1,8 @@
 """
 Тесты для WikidataService
 """
+import time
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from backend.services.wikidata_service import WikidataService
@@ -26,7 +28,7 @@ class TestWikidataService:
         }
         mock_response.raise_for_status = Mock()
         
-        with patch('backend.services.wikidata_service.requests.get', return_value=mock_response):
+        with patch.object(service._session, 'get', return_value=mock_response):
             # Мокаем get_entity_info
             with patch.object(service, 'get_entity_info', return_value={
                 "qid": "Q7747",
@@ -49,7 +51,7 @@ class TestWikidataService:
         mock_response.json.return_value = {"search": []}
         mock_response.raise_for_status = Mock()
         
-        with patch('backend.services.wikidata_service.requests.get', return_value=mock_response):
+        with patch.object(service._session, 'get', return_value=mock_response):
             result = service.search_entity("НесуществующаяСущность12345", "ru")
             assert result is None
     
@@ -87,7 +89,7 @@ class TestWikidataService:
         }
         mock_response.raise_for_status = Mock()
         
-        with patch('backend.services.wikidata_service.requests.get', return_value=mock_response):
+        with patch.object(service._session, 'get', return_value=mock_response):
             # Мокаем _get_label_for_qid
             with patch.object(service, '_get_label_for_qid', return_value="Президент России"):
                 result = service.get_entity_info("Q7747", "ru")
@@ -108,7 +110,7 @@ class TestWikidataService:
         }
         mock_response.raise_for_status = Mock()
         
-        with patch('backend.services.wikidata_service.requests.get', return_value=mock_response):
+        with patch.object(service._session, 'get', return_value=mock_response):
             with patch.object(service, 'get_entity_info', return_value={
                 "qid": "Q7747",
                 "canonical_name": "Владимир Путин",
@@ -147,7 +149,7 @@ class TestWikidataService:
         }
         mock_response.raise_for_status = Mock()
         
-        with patch('backend.services.wikidata_service.requests.get', return_value=mock_response):
+        with patch.object(service._session, 'get', return_value=mock_response):
             result = service.get_entity_info("Q159", "ru")
             
             assert result is not None
@@ -190,16 +192,9 @@ class TestWikidataService:
         }
         mock_response.raise_for_status = Mock()
         
-        with patch('backend.services.wikidata_service.requests.get', return_value=mock_response):
-            with patch.object(service, '_get_label_for_qid') as mock_get_label:
-                def label_side_effect(qid, lang):
-                    if qid == "Q11696":
-                        return "Президент России"
-                    elif qid == "Q159":
-                        return "Россия"
-                    return None
-                
-                mock_get_label.side_effect = label_side_effect
+        with patch.object(service._session, 'get', return_value=mock_response):
+            with patch.object(service, '_batch_get_labels') as mock_get_labels:
+                mock_get_labels.return_value = {"Q11696": "Президент России", "Q159": "Россия"}
                 
                 result = service.get_entity_info("Q7747", "ru")
                 
@@ -207,4 +202,149 @@ class TestWikidataService:
                 metadata = result["metadata"]
                 assert "positions" in metadata
                 assert "country" in metadata or "countries" in metadata
+                mock_get_labels.assert_called_once_with(["Q11696", "Q159"], "ru")
+
+    def test_batch_get_labels_single_request(self):
+        """Метки нескольких QID запрашиваются одним wbgetentities и кэшируются"""
+        service = WikidataService(cache_ttl=3600)
+
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "entities": {
+                "Q11696": {"labels": {"ru": {"value": "Президент России"}}},
+                "Q159": {"labels": {"en": {"value": "Russia"}}},
+                "Q1": {"labels": {}},
+            }
+        }
+        mock_response.raise_for_status = Mock()
+
+        with patch.object(service._session, 'get', return_value=mock_response) as mock_get:
+            labels = service._batch_get_labels(["Q11696", "Q159", "Q11696", "Q1"], "ru")
+            assert labels == {"Q11696": "Президент России", "Q159": "Russia"}
+            assert mock_get.call_count == 1
+            assert mock_get.call_args.kwargs["params"]["ids"] == "Q11696|Q159|Q1"
+
+            # Повторно из сети запрашивается только QID без метки
+            with patch.object(service, '_get_label_for_qid', return_value=None) as mock_single:
+                assert service._batch_get_labels(["Q159", "Q1"], "ru") == {"Q159": "Russia"}
+                mock_single.assert_called_once_with("Q1", "ru")
+            assert mock_get.call_count == 1
+
+
+    def test_cache_is_bounded_and_expires(self):
+        """Кэш вытесняет давно не используемые записи и удаляет просроченные"""
+        service = WikidataService(cache_ttl=3600, cache_size=2)
+        service._set_cached("a", {"qid": "Q1"})
+        service._set_cached("b", {"qid": "Q2"})
+        assert service._get_cached("a") == {"qid": "Q1"}
+        service._set_cached("c", {"qid": "Q3"})
+        assert service._get_cached("b") is None
+        assert list(service._cache) == ["a", "c"]
+
+        with patch('backend.services.wikidata_service.time.monotonic', return_value=time.monotonic() + 3600):
+            assert service._get_cached("a") is None
+        assert "a" not in service._cache
+
+
+def _fake_wikidata(params):
+    """Ответы Wikidata API для теста sync/async поиска"""
+    if params["action"] == "wbsearchentities":
+        return {"search": [
+            {"id": "Q1", "description": "family name"},
+            {"id": "Q2", "description": "village"},
+            {"id": "Q3", "description": "politician"},
+        ]}
+    claims = {
+        "Q1": {"P31": ["Q101352"]},
+        "Q2": {"P31": ["Q532"]},
+        "Q3": {"P31": ["Q5"], "P106": ["Q82955"], "P39": ["Q10", "Q11"], "P27": ["Q12"]},
+    }
+    entities = {}
+    for qid in params["ids"].split("|"):
+        entity = {"labels": {"en": {"value": f"Label {qid}"}}, "aliases": {}, "descriptions": {}}
+        if "claims" in params["props"]:
+            entity["claims"] = {
+                prop: [{"mainsnak": {"datavalue": {"type": "wikibase-entityid", "value": {"id": v}}}}
+                       for v in values]
+                for prop, values in claims.get(qid, {}).items()
+            }
+        entities[qid] = entity
+    return {"entities": entities}
+
+
+def test_asearch_entity_matches_sync_and_probes_in_parallel():
+    httpx = pytest.importorskip("httpx")
+    import asyncio
+
+    sync_service = WikidataService()
+
+    def fake_get(url, params=None, timeout=None):
+        response = Mock()
+        response.json.return_value = _fake_wikidata(params)
+        return response
+
+    with patch.object(sync_service._session, 'get', side_effect=fake_get):
+        expected = sync_service.search_entity("Someone", "ru", expected_type="person")
+    assert expected["qid"] == "Q3"
+    assert expected["metadata"]["positions"] == ["Label Q10", "Label Q11"]
+
+    in_flight = []
+    peak = []
+
+    async def handler(request):
+        params = dict(request.url.params)
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+        return httpx.Response(200, json=_fake_wikidata(params))
+
+    async def run():
+        service = WikidataService()
+        service._aclient = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service._aclient_loop = asyncio.get_running_loop()
+        try:
+            return await service.asearch_entity("Someone", "ru", expected_type="person")
+        finally:
+            await service.aclose()
+
+    assert asyncio.run(run()) == expected
+    assert max(peak) == 3  # top-3 candidates were fetched concurrently
+
+
+def test_determine_actor_type_prefers_specific_instance_types():
+    service = WikidataService()
+    assert service._determine_actor_type({"occupation_qids": ["Q82955"], "instance_of_qids": ["Q6256"]}) == "politician"
+    assert service._determine_actor_type({"instance_of_qids": ["Q5", "Q1", "Q43845"]}) == "person"
+    assert service._determine_actor_type({"instance_of_qids": ["Q43229", "Q5", "Q7188"]}) == "government"
+    assert service._determine_actor_type({"instance_of_qids": ["Q43229", "Q5"]}) == "organization"
+    assert service._determine_actor_type({"instance_of_qids": ["Q1"]}) is None
+
+
+def test_disk_http_cache_is_used_when_available(tmp_path, monkeypatch):
+    import requests
+
+    import backend.services.wikidata_service as wikidata_module
+
+    created = []
+
+    class FakeCachedSession(requests.Session):
+        """Stand-in so the test does not need the requests-cache package"""
+
+        def __init__(self, cache_name, **kwargs):
+            super().__init__()
+            self.cache = Mock()
+            created.append((cache_name, kwargs))
+
+    monkeypatch.setattr(wikidata_module, "REQUESTS_CACHE_AVAILABLE", True)
+    monkeypatch.setattr(wikidata_module, "CachedSession", FakeCachedSession, raising=False)
+
+    service = WikidataService(cache_ttl=60, cache_dir=str(tmp_path / "wd"))
+    assert isinstance(service._session, FakeCachedSession)
+    assert service._session.headers["User-Agent"] == WikidataService.USER_AGENT
+    cache_name, kwargs = created[0]
+    assert cache_name == str(tmp_path / "wd" / "http_cache")
+    assert kwargs["expire_after"] == 60 and kwargs["allowable_methods"] == ("GET",)
+    service._session.cache.delete.assert_called_once_with(expired=True)
 
+    assert type(WikidataService(cache_dir=None)._session) is requests.Session